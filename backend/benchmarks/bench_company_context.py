@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Benchmark for CompanyContextMiddleware per-request overhead.
+
+Compares the previous BaseHTTPMiddleware implementation (regexes compiled
+from string literals on every call) with the pure ASGI middleware, by
+driving a trivial endpoint directly through the ASGI interface.
+
+Usage:
+    python benchmarks/bench_company_context.py [--requests N]
+
+The tenant cache is pre-warmed, so no database is touched.
+"""
+
+import asyncio
+import os
+import re
+import statistics
+import sys
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi import Request
+from starlette.applications import Starlette
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.responses import PlainTextResponse
+from starlette.routing import Route
+
+from middleware.company_context import CompanyContextMiddleware
+from services.tenant_cache import CompanySnapshot, tenant_cache
+
+PATHS = [
+    "/api/companies/acme/projects",
+    "/api/projects/",
+    "/health",
+]
+
+
+class LegacyCompanyContextMiddleware(BaseHTTPMiddleware):
+    """The BaseHTTPMiddleware implementation this benchmark measures against."""
+
+    async def dispatch(self, request: Request, call_next):
+        path = request.url.path
+
+        pattern1 = r'^/api/companies/([a-z0-9-]+)(?:/|$)'
+        match = re.search(pattern1, path)
+
+        request.state.company = None
+
+        if match:
+            request.state.company_slug = match.group(1)
+            request.state.company = tenant_cache.resolve(match.group(1))
+        else:
+            pattern2 = r'^/(?!api/)([a-z0-9-]+)(?:/|$)'
+            match = re.search(pattern2, path)
+            if match:
+                request.state.company_slug = match.group(1)
+            else:
+                request.state.company_slug = None
+
+        response = await call_next(request)
+        return response
+
+
+async def endpoint(request):
+    return PlainTextResponse("ok")
+
+
+def build_app(middleware_class=None):
+    app = Starlette(routes=[Route("/{path:path}", endpoint)])
+    return middleware_class(app) if middleware_class else app
+
+
+async def call(app, path: str) -> None:
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "root_path": "",
+        "headers": [],
+        "client": ("127.0.0.1", 50000),
+        "server": ("127.0.0.1", 8000),
+    }
+
+    received = False
+
+    async def receive():
+        nonlocal received
+        if received:
+            # Client stays connected until the response task is cancelled
+            await asyncio.Event().wait()
+        received = True
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        pass
+
+    await app(scope, receive, send)
+
+
+async def measure(app, requests: int) -> float:
+    """Return the time per request in microseconds (median of five runs)."""
+    for path in PATHS:
+        await call(app, path)
+
+    runs = []
+    for _ in range(5):
+        start = time.perf_counter()
+        for i in range(requests):
+            await call(app, PATHS[i % len(PATHS)])
+        runs.append((time.perf_counter() - start) / requests * 1_000_000)
+    return statistics.median(runs)
+
+
+async def run(requests: int):
+    tenant_cache.put(CompanySnapshot(
+        id=1, name="Acme Tiling", slug="acme", email="info@acme.example",
+        logo_url=None, primary_color="#3B82F6", secondary_color="#10B981",
+        status=None, subscription_plan=None, updated_at=datetime.utcnow()
+    ))
+
+    baseline = await measure(build_app(), requests)
+    legacy = await measure(build_app(LegacyCompanyContextMiddleware), requests)
+    asgi = await measure(build_app(CompanyContextMiddleware), requests)
+
+    print(f"{'variant':<20} | {'us/request':>10} | {'overhead us':>11}")
+    print("-" * 48)
+    for label, value in (("no middleware", baseline), ("BaseHTTPMiddleware", legacy), ("pure ASGI", asgi)):
+        print(f"{label:<20} | {value:>10.1f} | {value - baseline:>11.1f}")
+
+
+def main():
+    requests = 5000
+    if len(sys.argv) > 2 and sys.argv[1] == "--requests":
+        requests = int(sys.argv[2])
+    elif len(sys.argv) > 1 and sys.argv[1] in ["-h", "--help"]:
+        print(__doc__)
+        return
+
+    asyncio.run(run(requests))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Benchmark for project list serialization.
+
+Compares the original list path (full ORM objects -> Pydantic from_attributes
+validation -> standard JSON encoder) with the column-projected fast path
+(plain rows -> orjson) for 50/500/5000-row pages.
+
+Usage:
+    python benchmarks/bench_list_serialization.py [--repeat N]
+
+Runs against a private in-memory SQLite database, so it does not touch the
+configured DATABASE_URL.
+"""
+
+import json
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from typing import List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pydantic import TypeAdapter
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from database import Base
+from models import Company, Project
+from routes.projects import ProjectResponse, PROJECT_RESPONSE_FIELDS
+from services.serialization import FastJSONResponse, response_columns, rows_to_dicts
+
+PAGE_SIZES = [50, 500, 5000]
+
+project_list_adapter = TypeAdapter(List[ProjectResponse])
+
+
+def seed(session, count: int) -> int:
+    """Insert one company and `count` projects, returning the company id."""
+    company = Company(name="Benchmark Tiling", slug="benchmark", email="bench@example.com")
+    session.add(company)
+    session.flush()
+
+    now = datetime.utcnow()
+    session.bulk_insert_mappings(Project, [
+        {
+            "company_id": company.id,
+            "name": f"Bathroom renovation {i}",
+            "description": "Full strip-out and retile of floor and walls. " * 8,
+            "client_name": f"Client {i}",
+            "client_email": f"client{i}@example.com",
+            "client_phone": "+44 20 7946 0000",
+            "client_address": f"{i} High Street, Springfield, SP1 2AB",
+            "room_length": 4.5,
+            "room_width": 3.2,
+            "room_area": 14.4,
+            "tile_length": 0.6,
+            "tile_width": 0.3,
+            "tile_price_per_unit": 2.75,
+            "wastage_percentage": 10.0,
+            "budget": 2500.0,
+            "created_at": now - timedelta(minutes=i),
+            "updated_at": now - timedelta(minutes=i),
+        }
+        for i in range(count)
+    ])
+    session.commit()
+    return company.id
+
+
+def orm_path(session, company_id: int, limit: int) -> bytes:
+    """Original path: ORM entities, from_attributes validation, json.dumps."""
+    projects = session.query(Project).filter(
+        Project.company_id == company_id
+    ).order_by(Project.created_at.desc()).limit(limit).all()
+    validated = project_list_adapter.validate_python(projects)
+    payload = project_list_adapter.dump_python(validated, mode="json")
+    body = json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    session.expunge_all()
+    return body
+
+
+def projected_path(session, company_id: int, limit: int) -> bytes:
+    """Fast path: column rows rendered directly by orjson."""
+    rows = session.query(*response_columns(Project, PROJECT_RESPONSE_FIELDS)).filter(
+        Project.company_id == company_id
+    ).order_by(Project.created_at.desc()).limit(limit).all()
+    return FastJSONResponse(rows_to_dicts(rows, PROJECT_RESPONSE_FIELDS)).body
+
+
+def measure(func, session, company_id: int, limit: int, repeat: int) -> dict:
+    """Return median latency (ms) and peak allocation (KiB) for one path."""
+    func(session, company_id, limit)  # warm up statement cache
+
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(session, company_id, limit)
+        timings.append((time.perf_counter() - start) * 1000)
+
+    tracemalloc.start()
+    body = func(session, company_id, limit)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "median_ms": statistics.median(timings),
+        "peak_kib": peak / 1024,
+        "bytes": len(body),
+    }
+
+
+def main():
+    repeat = 20
+    if len(sys.argv) > 2 and sys.argv[1] == "--repeat":
+        repeat = int(sys.argv[2])
+    elif len(sys.argv) > 1 and sys.argv[1] in ["-h", "--help"]:
+        print(__doc__)
+        return
+
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+    company_id = seed(session, max(PAGE_SIZES))
+
+    print(f"{'rows':>6} | {'path':<10} | {'median ms':>10} | {'peak KiB':>10} | {'bytes':>9}")
+    print("-" * 58)
+    for limit in PAGE_SIZES:
+        before = measure(orm_path, session, company_id, limit, repeat)
+        after = measure(projected_path, session, company_id, limit, repeat)
+        for label, result in (("orm", before), ("projected", after)):
+            print(
+                f"{limit:>6} | {label:<10} | {result['median_ms']:>10.2f} | "
+                f"{result['peak_kib']:>10.1f} | {result['bytes']:>9}"
+            )
+        speedup = before["median_ms"] / after["median_ms"] if after["median_ms"] else float("inf")
+        print(f"{'':>6} | {'speedup':<10} | {speedup:>9.1f}x |")
+
+    session.close()
+
+
+if __name__ == "__main__":
+    main()
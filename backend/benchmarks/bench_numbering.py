@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the quote/invoice number allocator.
+
+Runs several worker processes, each with a few threads, allocating invoice
+numbers for the same company from a shared SQLite database, for a range of
+block sizes. Reports allocations per second and checks that no number was
+handed out twice.
+
+Usage:
+    python benchmarks/bench_numbering.py [--processes N] [--per-process N]
+
+Uses a private temporary database, so it does not touch the configured
+DATABASE_URL.
+"""
+
+import argparse
+import multiprocessing
+import os
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine
+
+from database import Base
+from models import Company
+from services.numbering import NumberAllocator
+
+BLOCK_SIZES = [1, 10, 100, 1000]
+THREADS_PER_PROCESS = 4
+
+
+def worker(url: str, company_id: int, block_size: int, count: int, results) -> None:
+    """Allocate `count` numbers from several threads and send them back."""
+    engine = create_engine(url, connect_args={"timeout": 30})
+    allocator = NumberAllocator(block_size=block_size, engine=engine)
+    numbers = []
+
+    def run(share: int) -> None:
+        for _ in range(share):
+            numbers.append(allocator.next_number(company_id, "invoice"))
+
+    threads = [
+        threading.Thread(target=run, args=(count // THREADS_PER_PROCESS,))
+        for _ in range(THREADS_PER_PROCESS)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    results.put(numbers)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the document number allocator.")
+    parser.add_argument("--processes", type=int, default=4, help="Worker processes")
+    parser.add_argument("--per-process", type=int, default=2000, help="Numbers allocated by each process")
+    args = parser.parse_args()
+
+    print(f"{'block':>6} | {'numbers':>8} | {'seconds':>8} | {'per second':>11} | duplicates")
+    print("-" * 56)
+    for block_size in BLOCK_SIZES:
+        path = tempfile.mktemp(suffix=".db")
+        url = f"sqlite:///{path}"
+        engine = create_engine(url)
+        Base.metadata.create_all(bind=engine)
+        with engine.begin() as conn:
+            company_id = conn.execute(
+                Company.__table__.insert().values(name="Benchmark", slug="benchmark", email="bench@example.com")
+            ).inserted_primary_key[0]
+        engine.dispose()
+
+        results = multiprocessing.Queue()
+        processes = [
+            multiprocessing.Process(target=worker, args=(url, company_id, block_size, args.per_process, results))
+            for _ in range(args.processes)
+        ]
+        started = time.perf_counter()
+        for process in processes:
+            process.start()
+        numbers = [number for _ in processes for number in results.get()]
+        for process in processes:
+            process.join()
+        elapsed = time.perf_counter() - started
+
+        duplicates = len(numbers) - len(set(numbers))
+        print(
+            f"{block_size:>6} | {len(numbers):>8} | {elapsed:>8.2f} | "
+            f"{len(numbers) / elapsed:>11.0f} | {duplicates}"
+        )
+        os.unlink(path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Benchmark for worker cold start (time to first response).
+
+Starts uvicorn in a subprocess against a private SQLite database and polls
+/health until it answers, with and without FAST_START. The database is
+bootstrapped once beforehand, so both variants start against an existing,
+stamped schema, which is the usual case when a worker restarts or scales out.
+
+Usage:
+    python benchmarks/bench_startup.py [--runs N]
+"""
+
+import http.client
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def wait_for_response(port: int, timeout: float = 30.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=1)
+            conn.request("GET", "/health")
+            if conn.getresponse().status == 200:
+                return True
+        except OSError:
+            time.sleep(0.005)
+    return False
+
+
+def time_to_first_response(env: dict) -> float:
+    """Return the seconds from process spawn to the first /health response."""
+    port = free_port()
+    start = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=BACKEND_DIR,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        if not wait_for_response(port):
+            raise RuntimeError("server did not start")
+        return time.perf_counter() - start
+    finally:
+        process.terminate()
+        process.wait()
+
+
+def run(runs: int):
+    database = os.path.join(tempfile.mkdtemp(), "bench_startup.db")
+    env = {
+        **os.environ,
+        "DATABASE_URL": f"sqlite:///{database}",
+        "DEBUG": "False",
+    }
+
+    # Create and stamp the schema once
+    time_to_first_response(env)
+
+    print(f"{'variant':<12} | {'median ms':>9} | {'min ms':>7}")
+    print("-" * 36)
+    for label, fast_start in (("create_all", "False"), ("FAST_START", "True")):
+        timings = [time_to_first_response({**env, "FAST_START": fast_start}) * 1000 for _ in range(runs)]
+        print(f"{label:<12} | {statistics.median(timings):>9.0f} | {min(timings):>7.0f}")
+
+
+def main():
+    runs = 5
+    if len(sys.argv) > 2 and sys.argv[1] == "--runs":
+        runs = int(sys.argv[2])
+    elif len(sys.argv) > 1 and sys.argv[1] in ["-h", "--help"]:
+        print(__doc__)
+        return
+
+    run(runs)
+
+
+if __name__ == "__main__":
+    main()
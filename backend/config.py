@@ -10,6 +10,48 @@ class Settings(BaseSettings):
     SECRET_KEY: str = "your-secret-key-change-in-production-please-use-strong-key"
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 10080  # 7 days
+    IMPORT_CHUNK_SIZE: int = 1000  # rows per bulk-import transaction
+    EXPORT_BATCH_SIZE: int = 1000  # rows fetched per server-side cursor batch
+    TENANT_CACHE_TTL_SECONDS: int = 300  # slug -> company snapshot cache lifetime
+    TENANT_MISS_TTL_SECONDS: float = 10.0  # how long unknown slugs are remembered (0 disables)
+    THEME_CACHE_MAX_AGE: int = 86400  # Cache-Control max-age for company branding
+    DASHBOARD_CACHE_SECONDS: float = 0.0  # dashboard micro-cache lifetime (0 disables)
+    METRICS_ENABLED: bool = True  # request/DB instrumentation and the /metrics endpoint
+    N_PLUS_ONE_THRESHOLD: int = 5  # identical SELECTs per request reported as a possible N+1
+    SLOW_QUERY_THRESHOLD_MS: float = 200.0  # statements slower than this are logged (0 disables)
+    SLOW_QUERY_LOG_SIZE: int = 1000  # slow statements kept in the ring buffer
+    PROFILING_ENABLED: bool = False  # allow admins to profile a request with the X-Profile header
+    PROFILE_SAMPLE_RATE: float = 0.0  # fraction of requests profiled automatically
+    PROFILE_DIR: str = "./profiles"  # where request profiles are saved
+    PROFILE_MAX_FILES: int = 200  # newest profiles kept on disk
+    INVALIDATION_BUS_ENABLED: bool = True  # broadcast cache invalidations to other workers
+    INVALIDATION_SOCKET_DIR: str = ""  # Unix socket directory for non-Postgres databases (default: temp dir)
+    EVENT_BUFFER_SIZE: int = 500  # change events kept per company for Last-Event-ID resume
+    EVENT_QUEUE_SIZE: int = 100  # undelivered events per SSE client before it is disconnected
+    EVENT_KEEPALIVE_SECONDS: float = 15.0  # SSE keepalive comment interval
+    EVENT_RETRY_MS: int = 3000  # reconnect delay suggested to SSE clients
+    EVENT_CHUNK_SIZE: int = 100  # ids or items per event when a change touches many rows
+    JOB_FILES_DIR: str = "./job_files"  # job uploads and results (shared by API and workers)
+    JOB_MAX_ATTEMPTS: int = 3  # default attempts before a job fails
+    JOB_RETRY_BASE_SECONDS: float = 10.0  # first retry delay, doubled per attempt
+    JOB_RETRY_MAX_SECONDS: float = 600.0  # retry delay cap
+    JOB_LOCK_TIMEOUT_SECONDS: int = 900  # running jobs without progress this long are requeued
+    JOB_TENANT_CONCURRENCY: int = 2  # running jobs per company
+    COMPANY_PURGE_THRESHOLD: int = 5000  # companies with more rows than this are purged in the background
+    COMPANY_PURGE_BATCH_SIZE: int = 1000  # rows deleted per purge transaction
+    ARCHIVE_AFTER_DAYS: int = 365  # completed/cancelled projects untouched this long are archived
+    ARCHIVE_BATCH_SIZE: int = 500  # projects archived per transaction
+    QUOTE_NUMBER_FORMAT: str = "Q-{company_id}-{year}-{seq:06d}"  # fields: company_id, year, seq (company_id and seq required)
+    INVOICE_NUMBER_FORMAT: str = "INV-{company_id}-{year}-{seq:06d}"  # numbers restart yearly when {year} is used
+    NUMBER_BLOCK_SIZE: int = 100  # document numbers reserved per database round trip
+    INVOICE_BATCH_CHUNK_SIZE: int = 500  # rows per INSERT when generating invoices in bulk
+    RENDER_PROCESSES: int = 2  # processes rendering quote/invoice documents (0 renders in threads)
+    LIFECYCLE_SWEEP_ENABLED: bool = True  # mark overdue invoices and expired quotes in the background
+    LIFECYCLE_SWEEP_INTERVAL_SECONDS: float = 60.0  # time between sweeps
+    LIFECYCLE_SWEEP_BATCH_SIZE: int = 1000  # rows updated per sweep transaction
+    LIFECYCLE_LEASE_SECONDS: int = 180  # a dead leader's sweeps are taken over after this long
+    FAST_START: bool = False  # skip create_all when the schema stamp matches; pre-warm in background
+    PREWARM_CONNECTIONS: int = 5  # pooled connections opened by the fast-start pre-warm
     ALLOWED_ORIGINS: List[str] = [
         "http://localhost:3000",
         "http://localhost:5173",
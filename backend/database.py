@@ -1,7 +1,15 @@
-from sqlalchemy import create_engine
+import hashlib
+import time
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import Column, DateTime, String, Table, create_engine, event, select
+from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, Session
 from config import settings
+from services.metrics import current_request_stats, db_statement_duration_seconds, db_statements_total
+from services.slow_queries import RECORD_OPTION as SLOW_QUERY_RECORD_OPTION, slow_query_log
 
 # Create SQLAlchemy engine
 engine = create_engine(
@@ -10,6 +18,54 @@ engine = create_engine(
     echo=settings.DEBUG
 )
 
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    # Kept on the statement's execution context, so a statement that raises
+    # leaves nothing behind on the pooled connection
+    context._query_start_time = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    duration = time.perf_counter() - context._query_start_time
+    db_statements_total.inc()
+    db_statement_duration_seconds.observe(value=duration)
+    stats = current_request_stats.get()
+    if stats is not None:
+        stats.record(statement, duration)
+    if (
+        duration >= slow_query_log.threshold
+        and slow_query_log.threshold > 0
+        and conn.get_execution_options().get(SLOW_QUERY_RECORD_OPTION, True)
+    ):
+        slow_query_log.record(conn.engine, statement, parameters, duration, executemany)
+
+
+def install_query_instrumentation(target_engine) -> None:
+    """
+    Time every SQL statement, attribute it to the current request and
+    log it if it is slower than SLOW_QUERY_THRESHOLD_MS.
+
+    Args:
+        target_engine: Engine to instrument
+    """
+    event.listen(target_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(target_engine, "after_cursor_execute", _after_cursor_execute)
+
+
+if settings.METRICS_ENABLED or settings.SLOW_QUERY_THRESHOLD_MS > 0:
+    install_query_instrumentation(engine)
+
+
+def _enable_sqlite_foreign_keys(dbapi_connection, connection_record):
+    # SQLite ignores foreign keys (and so ON DELETE CASCADE) unless enabled per connection
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA foreign_keys=ON")
+    cursor.close()
+
+
+if engine.dialect.name == "sqlite":
+    event.listen(engine, "connect", _enable_sqlite_foreign_keys)
+
 # Create SessionLocal class
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
@@ -29,11 +85,78 @@ def get_db() -> Session:
         db.close()
 
 
-def init_db():
+# Single-row stamp of the schema init_db last created
+schema_version_table = Table(
+    "schema_version",
+    Base.metadata,
+    Column("version", String(64), primary_key=True),
+    Column("applied_at", DateTime, nullable=False),
+)
+
+
+def schema_version() -> str:
+    """
+    Compute a version string for the current models and search index DDL.
+    It changes whenever a table, column, column type or index changes.
+
+    Returns:
+        str: Short hash of the schema definition
+    """
+    from services.search import POSTGRES_INDEX_DDL, SQLITE_INDEX_DDL
+
+    parts = []
+    for table in sorted(Base.metadata.tables.values(), key=lambda table: table.name):
+        parts.append(table.name)
+        parts.extend(f"{column.name}:{column.type!r}:{column.nullable}" for column in table.columns)
+        parts.extend(sorted(f"index:{index.name}" for index in table.indexes))
+    parts.extend(SQLITE_INDEX_DDL)
+    parts.extend(POSTGRES_INDEX_DDL)
+    return hashlib.sha256("|".join(parts).encode("utf-8")).hexdigest()[:16]
+
+
+def stamped_schema_version() -> Optional[str]:
+    """
+    Read the schema version stamped by the last full bootstrap.
+
+    Returns:
+        The stamped version, or None if the database has never been stamped
+    """
+    try:
+        with engine.connect() as conn:
+            return conn.execute(select(schema_version_table.c.version)).scalar()
+    except SQLAlchemyError:
+        return None
+
+
+def init_db(fast_start: Optional[bool] = None):
     """
     Initialize the database by creating all tables.
     This should be called on application startup.
+
+    In fast-start mode the schema version stamp is checked first, and
+    create_all (which inspects every table) is skipped if it matches.
+    An empty revenue rollup is backfilled from paid invoices.
+
+    Args:
+        fast_start: Override settings.FAST_START
     """
-    from models import Company, User, Project, Quote, Invoice
+    from models import Company, User, Project, Quote, Invoice, Job, RevenueDaily, NumberSequence, SchedulerLease, EventSequence, projects_archive
+    from services.revenue import backfill_revenue
+    from services.search import ensure_search_index
+
+    version = schema_version()
+    if fast_start is None:
+        fast_start = settings.FAST_START
+    if fast_start and stamped_schema_version() == version:
+        print(f"Database schema {version} is up to date, skipping table creation")
+        return
+
     Base.metadata.create_all(bind=engine)
+    ensure_search_index(engine)
+    backfilled = backfill_revenue()
+    if backfilled:
+        print(f"Backfilled {backfilled} daily revenue rows")
+    with engine.begin() as conn:
+        conn.execute(schema_version_table.delete())
+        conn.execute(schema_version_table.insert().values(version=version, applied_at=datetime.utcnow()))
     print("Database tables created successfully!")
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Bulk import historic projects for a company from a CSV or NDJSON file.
+
+Usage:
+    python import_projects.py --company SLUG FILE [--format csv|ndjson] [--chunk-size N]
+
+The file is streamed and inserted in chunked transactions. Rows that fail
+validation are listed at the end; valid rows are imported regardless.
+"""
+
+import argparse
+import sys
+import time
+
+from database import SessionLocal, init_db
+from models.company import Company
+from services.project_import import ProjectImporter, SUPPORTED_FORMATS, detect_format, iter_records
+
+
+def main():
+    """
+    Parse arguments and run the import.
+    """
+    parser = argparse.ArgumentParser(description="Bulk import projects from CSV or NDJSON.")
+    parser.add_argument("file", help="Path to the CSV or NDJSON file")
+    parser.add_argument("--company", required=True, help="Slug of the company to import into")
+    parser.add_argument("--format", choices=SUPPORTED_FORMATS, help="File format (detected from extension if omitted)")
+    parser.add_argument("--chunk-size", type=int, default=None, help="Rows per transaction")
+    args = parser.parse_args()
+
+    import_format = args.format or detect_format(args.file)
+    if import_format is None:
+        print("✗ Could not detect file format; use --format csv or --format ndjson")
+        sys.exit(1)
+
+    init_db()
+    db = SessionLocal()
+    try:
+        company = db.query(Company).filter(Company.slug == args.company).first()
+        if not company:
+            print(f"✗ Company not found: {args.company}")
+            sys.exit(1)
+
+        print(f"Importing {args.file} ({import_format}) into {company.name}...")
+        started = time.perf_counter()
+        with open(args.file, "rb") as stream:
+            importer = ProjectImporter(db, company.id, chunk_size=args.chunk_size)
+            report = importer.run(iter_records(stream, import_format))
+        elapsed = time.perf_counter() - started
+    finally:
+        db.close()
+
+    print(f"✓ Imported {report['imported']} of {report['total']} rows in {elapsed:.2f}s")
+    if report["failed"]:
+        print(f"✗ {report['failed']} rows failed:")
+        for error in report["errors"]:
+            print(f"  row {error['row']}: {'; '.join(error['errors'])}")
+        if report["errors_truncated"]:
+            print("  (further errors omitted)")
+        sys.exit(2)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,21 @@
 from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 
 from config import settings
 from database import init_db
 from middleware.company_context import CompanyContextMiddleware
+from middleware.metrics import MetricsMiddleware
+from middleware.profiler import ProfilerMiddleware
+from services.documents import render_pool
+from services.invalidation import invalidation_bus
+from services.lifecycle import lifecycle_scheduler
+from services.metrics import registry as metrics_registry
+from services.warmup import start_prewarm
 
 # Import routers
-from routes import auth, admin, companies, calculations, projects
+from routes import auth, admin, companies, calculations, invoices, jobs, projects, quotes
 
 
 @asynccontextmanager
@@ -16,9 +24,17 @@ async def lifespan(app: FastAPI):
     # Startup: Initialize database
     print("Initializing database...")
     init_db()
+    invalidation_bus.start()
+    lifecycle_scheduler.start()
+    prewarm_task = start_prewarm() if settings.FAST_START else None
     print(f"Starting {settings.APP_NAME} v{settings.VERSION}")
     yield
     # Shutdown
+    if prewarm_task is not None:
+        prewarm_task.cancel()
+    lifecycle_scheduler.stop()
+    invalidation_bus.stop()
+    render_pool.shutdown()
     print("Shutting down application...")
 
 
@@ -42,12 +58,22 @@ app.add_middleware(
 # Add custom middleware
 app.add_middleware(CompanyContextMiddleware)
 
+if settings.PROFILING_ENABLED or settings.PROFILE_SAMPLE_RATE > 0:
+    app.add_middleware(ProfilerMiddleware)
+
+# Outermost, so latency includes the other middleware
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+
 # Include routers
 app.include_router(auth.router, prefix="/api")
 app.include_router(admin.router, prefix="/api")
 app.include_router(companies.router, prefix="/api")
 app.include_router(projects.router, prefix="/api")
 app.include_router(calculations.router, prefix="/api")
+app.include_router(jobs.router, prefix="/api")
+app.include_router(quotes.router, prefix="/api")
+app.include_router(invoices.router, prefix="/api")
 
 
 @app.get("/")
@@ -71,6 +97,16 @@ async def health_check():
     }
 
 
+if settings.METRICS_ENABLED:
+    @app.get("/metrics", include_in_schema=False)
+    async def metrics():
+        """Prometheus metrics endpoint."""
+        return PlainTextResponse(
+            metrics_registry.render(),
+            media_type="text/plain; version=0.0.4; charset=utf-8"
+        )
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(
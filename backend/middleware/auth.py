@@ -1,4 +1,4 @@
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.orm import Session
 from typing import Optional
@@ -6,8 +6,8 @@ from datetime import datetime
 
 from database import get_db
 from models.user import User, UserRole
-from models.company import Company
 from services.auth_service import AuthService
+from services.tenant_cache import CompanySnapshot, tenant_cache
 
 # Security scheme for Bearer token
 security = HTTPBearer()
@@ -87,26 +87,32 @@ async def require_admin(current_user: User = Depends(get_current_user)) -> User:
 
 async def require_company_access(
     company_slug: str,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
-) -> tuple[User, Company]:
+    request: Request,
+    current_user: User = Depends(get_current_user)
+) -> tuple[User, CompanySnapshot]:
     """
     Dependency to verify user has access to a specific company.
     
+    The company is taken from request.state, where CompanyContextMiddleware
+    stores the snapshot resolved through the tenant cache.
+    
     Args:
         company_slug: Company slug from URL path
+        request: The incoming request
         current_user: The current authenticated user
-        db: Database session
         
     Returns:
-        tuple: (User, Company) if access is granted
+        tuple: (User, CompanySnapshot) if access is granted
         
     Raises:
         HTTPException: If company not found or user doesn't have access
     """
+    company = getattr(request.state, "company", None)
+    if company is None or company.slug != company_slug:
+        company = tenant_cache.resolve(company_slug)
+    
     # Admin users have access to all companies
     if current_user.role == UserRole.ADMIN:
-        company = db.query(Company).filter(Company.slug == company_slug).first()
         if not company:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -115,16 +121,16 @@ async def require_company_access(
         return current_user, company
     
     # Regular users can only access their own company
-    if current_user.company is None:
+    if current_user.company_id is None:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="User is not associated with any company"
         )
     
-    if current_user.company.slug != company_slug:
+    if company is None or company.id != current_user.company_id:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Access denied to this company"
         )
     
-    return current_user, current_user.company
+    return current_user, company
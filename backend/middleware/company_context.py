@@ -1,44 +1,69 @@
-from fastapi import Request
-from starlette.middleware.base import BaseHTTPMiddleware
 import re
 
+from starlette.concurrency import run_in_threadpool
+from starlette.types import ASGIApp, Receive, Scope, Send
 
-class CompanyContextMiddleware(BaseHTTPMiddleware):
+from services.tenant_cache import tenant_cache
+
+API_COMPANY_PREFIX = "/api/companies/"
+
+# Pattern 1: /api/companies/{slug}/...
+API_COMPANY_PATTERN = re.compile(r'^/api/companies/([a-z0-9-]+)(?:/|$)')
+
+# Pattern 2: /{slug}/... (but not /api/...)
+SLUG_PATTERN = re.compile(r'^/(?!api/)([a-z0-9-]+)(?:/|$)')
+
+
+class CompanyContextMiddleware:
     """
     Middleware to extract company slug from URL path and add it to request state.
     This allows easy access to the current company context throughout the request lifecycle.
+
+    For /api/companies/{slug}/... requests the slug is also resolved once,
+    through the tenant cache, into request.state.company (None if unknown).
+
+    Implemented as a pure ASGI middleware: the tenant context is written into
+    scope["state"] (which backs request.state) and the receive/send channels
+    are passed through untouched, so streaming bodies are not buffered.
     """
 
-    async def dispatch(self, request: Request, call_next):
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         """
         Extract company slug from URL path patterns like:
         - /api/companies/{company_slug}/...
         - /{company_slug}/...
-        
+
         Args:
-            request: The incoming request
-            call_next: The next middleware or route handler
-            
-        Returns:
-            Response from the next handler
+            scope: ASGI connection scope
+            receive: ASGI receive channel
+            send: ASGI send channel
         """
-        # Try to extract company slug from URL path
-        path = request.url.path
-        
-        # Pattern 1: /api/companies/{slug}/...
-        pattern1 = r'^/api/companies/([a-z0-9-]+)(?:/|$)'
-        match = re.search(pattern1, path)
-        
-        if match:
-            request.state.company_slug = match.group(1)
+        if scope["type"] not in ("http", "websocket"):
+            await self.app(scope, receive, send)
+            return
+
+        path = scope["path"]
+        state = scope.setdefault("state", {})
+        company_slug = None
+        company = None
+
+        if path.startswith(API_COMPANY_PREFIX):
+            match = API_COMPANY_PATTERN.match(path)
+            if match:
+                company_slug = match.group(1)
+                company = tenant_cache.get(company_slug)
+                if company is None and not tenant_cache.is_unknown(company_slug):
+                    # Cache miss: load from the database off the event loop
+                    company = await run_in_threadpool(tenant_cache.resolve, company_slug)
         else:
-            # Pattern 2: /{slug}/... (but not /api/...)
-            pattern2 = r'^/(?!api/)([a-z0-9-]+)(?:/|$)'
-            match = re.search(pattern2, path)
+            match = SLUG_PATTERN.match(path)
             if match:
-                request.state.company_slug = match.group(1)
-            else:
-                request.state.company_slug = None
-        
-        response = await call_next(request)
-        return response
+                company_slug = match.group(1)
+
+        state["company_slug"] = company_slug
+        state["company"] = company
+
+        await self.app(scope, receive, send)
@@ -0,0 +1,98 @@
+import logging
+import re
+import time
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from config import settings
+from services.metrics import (
+    RequestStats,
+    current_request_stats,
+    db_statements_per_request,
+    db_time_per_request_seconds,
+    http_request_duration_seconds,
+    http_requests_in_flight,
+    http_requests_total,
+    n_plus_one_suspected_total,
+    route_template,
+)
+
+logger = logging.getLogger(__name__)
+
+# Table a SELECT reads from, used to label suspected N+1 patterns
+SELECT_FROM_PATTERN = re.compile(r'^\s*SELECT\b.*?\bFROM\s+"?([A-Za-z_][A-Za-z0-9_]*)', re.IGNORECASE | re.DOTALL)
+
+
+class MetricsMiddleware:
+    """
+    Middleware recording per-route latency, in-flight requests and the SQL
+    statements each request executes.
+
+    Requests are labelled by route template (e.g. /api/projects/{project_id})
+    rather than raw path, so label cardinality stays bounded. A request that
+    runs the same SELECT at least N_PLUS_ONE_THRESHOLD times (typically a
+    lazy relationship such as User.company loaded inside a loop) is counted
+    and logged as a suspected N+1 pattern.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """
+        Time the request and record its metrics once it has completed.
+
+        Args:
+            scope: ASGI connection scope
+            receive: ASGI receive channel
+            send: ASGI send channel
+        """
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats(scope)
+        token = current_request_stats.set(stats)
+        status_code = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        http_requests_in_flight.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            duration = time.perf_counter() - start
+            http_requests_in_flight.dec()
+            current_request_stats.reset(token)
+            self._record(scope, stats, status_code, duration)
+
+    def _record(self, scope: Scope, stats: RequestStats, status_code: int, duration: float) -> None:
+        method = scope["method"]
+        route = route_template(scope)
+        stats.route = route
+
+        http_requests_total.inc(method, route, str(status_code))
+        http_request_duration_seconds.observe(method, route, value=duration)
+        db_statements_per_request.observe(route, value=stats.statements)
+        db_time_per_request_seconds.observe(route, value=stats.db_time)
+
+        threshold = settings.N_PLUS_ONE_THRESHOLD
+        if stats.statements < threshold:
+            return
+        for statement, count in stats.statement_counts.items():
+            if count < threshold:
+                continue
+            match = SELECT_FROM_PATTERN.match(statement)
+            if match is None:
+                continue
+            table = match.group(1)
+            n_plus_one_suspected_total.inc(route, table)
+            logger.warning(
+                "Possible N+1 query on %s %s: %d identical SELECTs from %s",
+                method, route, count, table
+            )
@@ -0,0 +1,135 @@
+import cProfile
+import random
+import time
+from datetime import datetime
+from typing import Optional
+
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from config import settings
+from database import SessionLocal
+from models.user import User, UserRole
+from services.auth_service import AuthService
+from services.metrics import route_template
+from services.profiler import profile_store
+
+PROFILE_HEADER = b"x-profile"
+PROFILE_ID_HEADER = "X-Profile-Id"
+
+
+def is_admin_token(authorization: Optional[bytes]) -> bool:
+    """
+    Check whether an Authorization header belongs to an active admin.
+
+    Args:
+        authorization: Raw Authorization header value
+
+    Returns:
+        bool: True if the bearer token identifies an active admin user
+    """
+    if not authorization:
+        return False
+    scheme, _, token = authorization.decode("latin-1").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return False
+
+    payload = AuthService.verify_token(token)
+    if payload is None or payload.get("sub") is None:
+        return False
+
+    db = SessionLocal()
+    try:
+        row = db.query(User.role, User.is_active).filter(User.id == int(payload["sub"])).first()
+    finally:
+        db.close()
+    return row is not None and row.is_active and row.role == UserRole.ADMIN
+
+
+class ProfilerMiddleware:
+    """
+    Middleware that profiles individual requests with cProfile.
+
+    A request is profiled when an admin sends the X-Profile header, or when
+    it is picked by PROFILE_SAMPLE_RATE. The profile is saved through the
+    profile store and its id returned in the X-Profile-Id response header.
+
+    cProfile hooks the event loop thread and stays enabled across await
+    points, so the profile is not strictly per request: whatever other
+    requests run on the event loop meanwhile is recorded in it too, while
+    work handed off to the threadpool (including sync handlers) is not.
+    Profile on a quiet worker for a clean picture. Only one request is
+    profiled at a time; others are served unprofiled.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        self._active = False
+
+    async def _should_profile(self, scope: Scope) -> Optional[str]:
+        profile_header = None
+        authorization = None
+        for name, value in scope["headers"]:
+            if name == PROFILE_HEADER:
+                profile_header = value
+            elif name == b"authorization":
+                authorization = value
+
+        if profile_header and settings.PROFILING_ENABLED and await run_in_threadpool(is_admin_token, authorization):
+            return "header"
+        if settings.PROFILE_SAMPLE_RATE > 0 and random.random() < settings.PROFILE_SAMPLE_RATE:
+            return "sample"
+        return None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """
+        Profile the request if requested or sampled.
+
+        Args:
+            scope: ASGI connection scope
+            receive: ASGI receive channel
+            send: ASGI send channel
+        """
+        if scope["type"] != "http" or self._active:
+            await self.app(scope, receive, send)
+            return
+
+        trigger = await self._should_profile(scope)
+        if trigger is None or self._active:
+            await self.app(scope, receive, send)
+            return
+
+        profile_id = profile_store.new_id()
+        status_code = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                MutableHeaders(scope=message)[PROFILE_ID_HEADER] = profile_id
+            await send(message)
+
+        self._active = True
+        profiler = cProfile.Profile()
+        started_at = datetime.utcnow()
+        start = time.perf_counter()
+        profiler.enable()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            profiler.disable()
+            duration = time.perf_counter() - start
+            self._active = False
+
+        metadata = {
+            "method": scope["method"],
+            "path": scope["path"],
+            "route": route_template(scope),
+            "company_slug": scope.get("state", {}).get("company_slug"),
+            "status_code": status_code,
+            "duration_ms": round(duration * 1000, 3),
+            "trigger": trigger,
+            "created_at": started_at.isoformat(),
+        }
+        await run_in_threadpool(profile_store.save, profile_id, profiler, metadata)
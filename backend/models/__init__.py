@@ -3,6 +3,12 @@ from models.user import User
 from models.project import Project, ProjectStatus
 from models.quote import Quote
 from models.invoice import Invoice
+from models.job import Job, JobStatus
+from models.archive import projects_archive, quotes_archive, invoices_archive
+from models.revenue import RevenueDaily
+from models.number_sequence import NumberSequence
+from models.scheduler_lease import SchedulerLease
+from models.event_sequence import EventSequence
 
 __all__ = [
     "Company",
@@ -11,4 +17,13 @@ __all__ = [
     "ProjectStatus",
     "Quote",
     "Invoice",
+    "Job",
+    "JobStatus",
+    "projects_archive",
+    "quotes_archive",
+    "invoices_archive",
+    "RevenueDaily",
+    "NumberSequence",
+    "SchedulerLease",
+    "EventSequence",
 ]
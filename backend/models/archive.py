@@ -0,0 +1,47 @@
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Table
+from database import Base
+from models.invoice import Invoice
+from models.project import Project
+from models.quote import Quote
+
+
+def archive_table(model, name: str, *indexes: Index) -> Table:
+    """
+    Build an archive table with the same columns as a model's table.
+    Only the company foreign key is kept, so archived quotes and invoices
+    can outlive the live rows they referenced.
+    
+    Args:
+        model: Mapped class whose rows are archived
+        name: Archive table name
+        indexes: Extra indexes on the archive table
+        
+    Returns:
+        Table: The archive table
+    """
+    columns = []
+    for column in model.__table__.columns:
+        if column.name == "company_id":
+            columns.append(Column(
+                "company_id", column.type, ForeignKey("companies.id", ondelete="CASCADE"), nullable=False
+            ))
+        else:
+            columns.append(Column(column.name, column.type, primary_key=column.primary_key, nullable=column.nullable))
+    return Table(name, Base.metadata, *columns, Column("archived_at", DateTime, nullable=False), *indexes)
+
+
+# Closed projects (and their quotes and invoices) moved out of the live tables
+projects_archive = archive_table(
+    Project, "projects_archive",
+    Index("ix_projects_archive_company_created", "company_id", "created_at"),
+)
+quotes_archive = archive_table(
+    Quote, "quotes_archive",
+    Index("ix_quotes_archive_company", "company_id"),
+    Index("ix_quotes_archive_project", "project_id"),
+)
+invoices_archive = archive_table(
+    Invoice, "invoices_archive",
+    Index("ix_invoices_archive_company", "company_id"),
+    Index("ix_invoices_archive_project", "project_id"),
+)
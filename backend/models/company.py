@@ -34,12 +34,13 @@ class Company(Base):
     subscription_plan = Column(SQLEnum(SubscriptionPlan), default=SubscriptionPlan.FREE)
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    deleted_at = Column(DateTime, nullable=True)  # Set while a large company is purged in the background
 
-    # Relationships
-    users = relationship("User", back_populates="company", cascade="all, delete-orphan")
-    projects = relationship("Project", back_populates="company", cascade="all, delete-orphan")
-    quotes = relationship("Quote", back_populates="company", cascade="all, delete-orphan")
-    invoices = relationship("Invoice", back_populates="company", cascade="all, delete-orphan")
+    # Relationships (children are removed by ON DELETE CASCADE, not loaded and deleted one by one)
+    users = relationship("User", back_populates="company", cascade="all, delete-orphan", passive_deletes=True)
+    projects = relationship("Project", back_populates="company", cascade="all, delete-orphan", passive_deletes=True)
+    quotes = relationship("Quote", back_populates="company", cascade="all, delete-orphan", passive_deletes=True)
+    invoices = relationship("Invoice", back_populates="company", cascade="all, delete-orphan", passive_deletes=True)
 
     def __repr__(self):
         return f"<Company(id={self.id}, name='{self.name}', slug='{self.slug}')>"
@@ -0,0 +1,20 @@
+from sqlalchemy import Column, Integer, BigInteger, Sequence
+from database import Base
+
+# Native sequence for event ids on PostgreSQL
+event_id_sequence = Sequence("company_event_id_seq", metadata=Base.metadata)
+
+
+class EventSequence(Base):
+    """
+    Single-row counter handing out change event ids on databases without
+    native sequences, so ids increase across all workers.
+    See services.events.
+    """
+    __tablename__ = "event_sequence"
+
+    id = Column(Integer, primary_key=True, default=1)
+    last_value = Column(BigInteger, nullable=False, default=0)
+
+    def __repr__(self):
+        return f"<EventSequence(last_value={self.last_value})>"
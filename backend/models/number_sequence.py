@@ -0,0 +1,19 @@
+from sqlalchemy import Column, Integer, BigInteger, String, ForeignKey
+from database import Base
+
+
+class NumberSequence(Base):
+    """
+    Next unreserved document number per company, document kind and scope
+    (the year, when numbers restart every year). Workers reserve blocks of
+    numbers from it; see services.numbering.
+    """
+    __tablename__ = "number_sequences"
+
+    company_id = Column(Integer, ForeignKey("companies.id", ondelete="CASCADE"), primary_key=True)
+    kind = Column(String(20), primary_key=True)  # "quote" or "invoice"
+    scope = Column(String(20), primary_key=True, default="")
+    next_value = Column(BigInteger, nullable=False, default=1)
+
+    def __repr__(self):
+        return f"<NumberSequence(company_id={self.company_id}, kind='{self.kind}', next_value={self.next_value})>"
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, Numeric, DateTime, ForeignKey, Enum as SQLEnum
+from sqlalchemy import Column, Integer, String, Text, Numeric, DateTime, ForeignKey, Index, Enum as SQLEnum
 from sqlalchemy.orm import relationship
 from datetime import datetime
 import enum
@@ -16,6 +16,14 @@ class ProjectStatus(str, enum.Enum):
 
 class Project(Base):
     __tablename__ = "projects"
+    __table_args__ = (
+        # Serves tenant list ordering and the per-tenant list version (count, max updated_at)
+        Index("ix_projects_company_updated", "company_id", "updated_at"),
+        # Serves the archival scan for long-closed projects
+        Index("ix_projects_status_updated", "status", "updated_at"),
+        # Never reuse ids, which archived projects keep
+        {"sqlite_autoincrement": True},
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     company_id = Column(Integer, ForeignKey("companies.id", ondelete="CASCADE"), nullable=False)
@@ -51,12 +59,18 @@ class Project(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     completed_at = Column(DateTime)
+    
+    # Optimistic concurrency: incremented on every update
+    version = Column(Integer, nullable=False, default=1, server_default="1")
+
+    # ORM updates check and bump the version (raising StaleDataError on conflict)
+    __mapper_args__ = {"version_id_col": version}
 
     # Relationships
     company = relationship("Company", back_populates="projects")
     creator = relationship("User", back_populates="created_projects", foreign_keys=[created_by])
-    quotes = relationship("Quote", back_populates="project", cascade="all, delete-orphan")
-    invoices = relationship("Invoice", back_populates="project", cascade="all, delete-orphan")
+    quotes = relationship("Quote", back_populates="project", cascade="all, delete-orphan", passive_deletes=True)
+    invoices = relationship("Invoice", back_populates="project", cascade="all, delete-orphan", passive_deletes=True)
 
     def __repr__(self):
         return f"<Project(id={self.id}, name='{self.name}', status='{self.status}')>"
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, Numeric, DateTime, ForeignKey, Enum as SQLEnum
+from sqlalchemy import Column, Integer, String, Text, Numeric, DateTime, ForeignKey, Index, Enum as SQLEnum
 from sqlalchemy.orm import relationship
 from datetime import datetime, timedelta
 import enum
@@ -15,6 +15,11 @@ class QuoteStatus(str, enum.Enum):
 
 class Quote(Base):
     __tablename__ = "quotes"
+    __table_args__ = (
+        # Serves the lifecycle sweep for sent quotes past their validity
+        Index("ix_quotes_status_valid_until", "status", "valid_until"),
+        {"sqlite_autoincrement": True},  # ids are kept when archived
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     company_id = Column(Integer, ForeignKey("companies.id", ondelete="CASCADE"), nullable=False)
@@ -0,0 +1,18 @@
+from sqlalchemy import Column, Integer, Date, Numeric, ForeignKey
+from database import Base
+
+
+class RevenueDaily(Base):
+    """
+    Paid invoice totals per company and day, kept up to date as invoices
+    are paid or un-paid (see services.revenue).
+    """
+    __tablename__ = "revenue_daily"
+
+    company_id = Column(Integer, ForeignKey("companies.id", ondelete="CASCADE"), primary_key=True)
+    day = Column(Date, primary_key=True)
+    amount = Column(Numeric(14, 2), nullable=False, default=0)
+    invoice_count = Column(Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f"<RevenueDaily(company_id={self.company_id}, day={self.day}, amount={self.amount})>"
@@ -0,0 +1,18 @@
+from sqlalchemy import Column, String, DateTime
+from database import Base
+
+
+class SchedulerLease(Base):
+    """
+    Lock row electing the worker that runs a periodic task. The holder
+    renews the lease on every run; another worker takes over once it has
+    expired. See services.lifecycle.
+    """
+    __tablename__ = "scheduler_leases"
+
+    name = Column(String(50), primary_key=True)
+    holder = Column(String(100), nullable=True)
+    expires_at = Column(DateTime, nullable=True)
+
+    def __repr__(self):
+        return f"<SchedulerLease(name='{self.name}', holder='{self.holder}', expires_at={self.expires_at})>"
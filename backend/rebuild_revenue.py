@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+Rebuild the daily revenue rollup from paid invoices.
+
+Usage:
+    python rebuild_revenue.py [--company SLUG]
+
+Startup backfills the rollup while it is empty; run this after changing
+invoices outside the application or with Core statements.
+"""
+
+import argparse
+import sys
+import time
+
+from database import SessionLocal, init_db
+from models.company import Company
+from services.revenue import rebuild_revenue
+
+
+def main():
+    """
+    Parse arguments and rebuild the rollup.
+    """
+    parser = argparse.ArgumentParser(description="Rebuild the daily revenue rollup.")
+    parser.add_argument("--company", help="Slug of a single company to rebuild (default: all)")
+    args = parser.parse_args()
+
+    init_db()
+    company_id = None
+    if args.company:
+        db = SessionLocal()
+        try:
+            company = db.query(Company).filter(Company.slug == args.company).first()
+        finally:
+            db.close()
+        if not company:
+            print(f"✗ Company not found: {args.company}")
+            sys.exit(1)
+        company_id = company.id
+
+    started = time.perf_counter()
+    rows = rebuild_revenue(company_id)
+    elapsed = time.perf_counter() - started
+    print(f"✓ Wrote {rows} daily revenue rows in {elapsed:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,16 +1,27 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from fastapi.responses import FileResponse, PlainTextResponse
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 from sqlalchemy import func
 from pydantic import BaseModel, EmailStr
 from typing import List, Optional
 from datetime import datetime
 
-from database import get_db
+from config import settings
+from database import SessionLocal, get_db
 from models.company import Company, CompanyStatus, SubscriptionPlan
 from models.user import User, UserRole
 from models.project import Project, ProjectStatus
 from services.auth_service import AuthService
+from services.company_purge import company_row_count, soft_delete_company
+from services.jobs import JobQueue
+from services import job_handlers  # noqa: F401 - registers the purge and archival jobs
 from middleware.auth import require_admin
+from services.invalidation import invalidation_bus
+from services.profiler import profile_store
+from services.serialization import FastJSONResponse, parse_fields, response_columns, rows_to_dicts
+from services.single_flight import dashboard_flight
+from services.slow_queries import slow_query_log
 
 router = APIRouter(prefix="/admin", tags=["Admin"], dependencies=[Depends(require_admin)])
 
@@ -64,13 +75,22 @@ class UserResponse(BaseModel):
         from_attributes = True
 
 
+COMPANY_RESPONSE_FIELDS = tuple(CompanyResponse.model_fields)
+USER_RESPONSE_FIELDS = tuple(UserResponse.model_fields)
+
+
 @router.get("/companies", response_model=List[CompanyResponse])
-async def list_companies(db: Session = Depends(get_db)):
+async def list_companies(
+    db: Session = Depends(get_db),
+    fields: Optional[str] = Query(None, description="Comma-separated response fields")
+):
     """
     List all companies in the system.
+    Use `fields` to return only selected columns.
     """
-    companies = db.query(Company).all()
-    return companies
+    selected = parse_fields(fields, COMPANY_RESPONSE_FIELDS)
+    rows = db.query(*response_columns(Company, selected)).filter(Company.deleted_at.is_(None)).all()
+    return FastJSONResponse(rows_to_dicts(rows, selected))
 
 
 @router.post("/companies", response_model=CompanyResponse, status_code=status.HTTP_201_CREATED)
@@ -97,6 +117,9 @@ async def create_company(
     db.commit()
     db.refresh(company)
     
+    # Workers may remember the slug as unknown
+    invalidation_bus.publish("tenant", company.slug)
+    
     return company
 
 
@@ -105,7 +128,7 @@ async def get_company(company_id: int, db: Session = Depends(get_db)):
     """
     Get a specific company by ID.
     """
-    company = db.query(Company).filter(Company.id == company_id).first()
+    company = db.query(Company).filter(Company.id == company_id, Company.deleted_at.is_(None)).first()
     
     if not company:
         raise HTTPException(
@@ -125,7 +148,7 @@ async def update_company(
     """
     Update a company.
     """
-    company = db.query(Company).filter(Company.id == company_id).first()
+    company = db.query(Company).filter(Company.id == company_id, Company.deleted_at.is_(None)).first()
     
     if not company:
         raise HTTPException(
@@ -133,6 +156,8 @@ async def update_company(
             detail="Company not found"
         )
     
+    previous_slug = company.slug
+    
     for key, value in company_data.model_dump().items():
         setattr(company, key, value)
     
@@ -140,15 +165,27 @@ async def update_company(
     db.commit()
     db.refresh(company)
     
+    invalidation_bus.publish("tenant", previous_slug, company.slug)
+    
     return company
 
 
 @router.delete("/companies/{company_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_company(company_id: int, db: Session = Depends(get_db)):
+async def delete_company(
+    company_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_admin)
+):
     """
     Delete a company and all associated data.
+    
+    Children are removed by the database (ON DELETE CASCADE). Companies
+    with more than COMPANY_PURGE_THRESHOLD rows are soft-deleted instead:
+    they disappear and their users are deactivated at once, and a
+    background job purges the data in batches. That case returns 202 with
+    the purge job in Location.
     """
-    company = db.query(Company).filter(Company.id == company_id).first()
+    company = db.query(Company).filter(Company.id == company_id, Company.deleted_at.is_(None)).first()
     
     if not company:
         raise HTTPException(
@@ -156,19 +193,34 @@ async def delete_company(company_id: int, db: Session = Depends(get_db)):
             detail="Company not found"
         )
     
-    db.delete(company)
-    db.commit()
+    slug = company.slug
+    if company_row_count(db, company_id) <= settings.COMPANY_PURGE_THRESHOLD:
+        db.delete(company)
+        db.commit()
+        invalidation_bus.publish("tenant", slug)
+        return None
     
-    return None
+    soft_delete_company(db, company)
+    invalidation_bus.publish("tenant", slug)
+    job = JobQueue.enqueue(db, "purge_company", {"company_id": company_id}, created_by=current_user.id)
+    return Response(
+        status_code=status.HTTP_202_ACCEPTED,
+        headers={"Location": f"/api/jobs/{job.id}"}
+    )
 
 
 @router.get("/users", response_model=List[UserResponse])
-async def list_users(db: Session = Depends(get_db)):
+async def list_users(
+    db: Session = Depends(get_db),
+    fields: Optional[str] = Query(None, description="Comma-separated response fields")
+):
     """
     List all users in the system.
+    Use `fields` to return only selected columns.
     """
-    users = db.query(User).all()
-    return users
+    selected = parse_fields(fields, USER_RESPONSE_FIELDS)
+    rows = db.query(*response_columns(User, selected)).all()
+    return FastJSONResponse(rows_to_dicts(rows, selected))
 
 
 @router.post("/users", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
@@ -207,23 +259,32 @@ async def create_user(
     return user
 
 
-@router.get("/dashboard")
-async def get_dashboard_stats(db: Session = Depends(get_db)):
-    """
-    Get admin dashboard statistics.
+def compute_dashboard_stats() -> dict:
     """
-    total_companies = db.query(func.count(Company.id)).scalar()
-    active_companies = db.query(func.count(Company.id)).filter(
-        Company.status == CompanyStatus.ACTIVE
-    ).scalar()
-    
-    total_users = db.query(func.count(User.id)).scalar()
-    active_users = db.query(func.count(User.id)).filter(User.is_active == True).scalar()
+    Compute system-wide dashboard statistics.
+    Opens its own session because the computation is shared between
+    coalesced requests and may outlive the request that started it.
     
-    total_projects = db.query(func.count(Project.id)).scalar()
-    active_projects = db.query(func.count(Project.id)).filter(
-        Project.status.in_([ProjectStatus.APPROVED, ProjectStatus.IN_PROGRESS])
-    ).scalar()
+    Returns:
+        Company, user and project statistics
+    """
+    db = SessionLocal()
+    try:
+        total_companies = db.query(func.count(Company.id)).filter(Company.deleted_at.is_(None)).scalar()
+        active_companies = db.query(func.count(Company.id)).filter(
+            Company.status == CompanyStatus.ACTIVE,
+            Company.deleted_at.is_(None)
+        ).scalar()
+        
+        total_users = db.query(func.count(User.id)).scalar()
+        active_users = db.query(func.count(User.id)).filter(User.is_active == True).scalar()
+        
+        total_projects = db.query(func.count(Project.id)).scalar()
+        active_projects = db.query(func.count(Project.id)).filter(
+            Project.status.in_([ProjectStatus.APPROVED, ProjectStatus.IN_PROGRESS])
+        ).scalar()
+    finally:
+        db.close()
     
     return {
         "companies": {
@@ -239,3 +300,101 @@ async def get_dashboard_stats(db: Session = Depends(get_db)):
             "active": active_projects
         }
     }
+
+
+@router.get("/dashboard")
+async def get_dashboard_stats(db: Session = Depends(get_db)):
+    """
+    Get admin dashboard statistics.
+    Concurrent requests share one computation.
+    """
+    # Return the request's connection to the pool while waiting on the shared computation
+    db.close()
+    
+    return await dashboard_flight.do(("admin_dashboard",), compute_dashboard_stats)
+
+
+@router.get("/single-flight")
+async def get_single_flight_stats():
+    """
+    Get request coalescing counters for the dashboard endpoints.
+    """
+    return dashboard_flight.stats()
+
+
+@router.post("/archive", status_code=status.HTTP_202_ACCEPTED)
+async def start_project_archival(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_admin),
+    older_than_days: Optional[int] = Query(None, ge=0, description="Default ARCHIVE_AFTER_DAYS")
+):
+    """
+    Queue a run that moves completed and cancelled projects untouched for
+    `older_than_days`, with their quotes and invoices, into the archive
+    tables. Returns the job in Location.
+    """
+    job = JobQueue.enqueue(
+        db, "archive_projects", {"older_than_days": older_than_days}, created_by=current_user.id
+    )
+    return Response(
+        status_code=status.HTTP_202_ACCEPTED,
+        headers={"Location": f"/api/jobs/{job.id}"}
+    )
+
+
+@router.get("/slow-queries")
+async def get_slow_queries(limit: int = Query(50, ge=1, le=500)):
+    """
+    Get logged slow statements aggregated by statement fingerprint,
+    slowest total time first, with the captured query plan.
+
+    Args:
+        limit: Maximum number of fingerprints to return
+    """
+    return slow_query_log.aggregate(limit)
+
+
+@router.delete("/slow-queries", status_code=status.HTTP_204_NO_CONTENT)
+async def clear_slow_queries():
+    """
+    Clear the slow-query log.
+    """
+    slow_query_log.clear()
+
+
+@router.get("/profiles")
+async def list_profiles(limit: int = Query(50, ge=1, le=500)):
+    """
+    List the most recent saved request profiles.
+
+    Args:
+        limit: Maximum number of profiles to return
+    """
+    return await run_in_threadpool(profile_store.list, limit)
+
+
+@router.get("/profiles/{profile_id}")
+async def download_profile(
+    profile_id: str,
+    format: str = Query("pstats", pattern="^(pstats|text)$")
+):
+    """
+    Download a saved request profile.
+
+    Args:
+        profile_id: Profile id from the X-Profile-Id header or the profile list
+        format: "pstats" for the raw cProfile dump, "text" for a report by cumulative time
+    """
+    if format == "text":
+        report = await run_in_threadpool(profile_store.render_text, profile_id)
+        if report is not None:
+            return PlainTextResponse(report)
+    else:
+        path = profile_store.stats_path(profile_id)
+        if path is not None:
+            return FileResponse(path, media_type="application/octet-stream", filename=f"{profile_id}.pstats")
+
+    raise HTTPException(
+        status_code=status.HTTP_404_NOT_FOUND,
+        detail="Profile not found"
+    )
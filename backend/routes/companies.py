@@ -1,17 +1,30 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy import case, func
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
-from typing import List
-from datetime import datetime
+from typing import List, Optional
+from datetime import date, datetime, timedelta
 
-from database import get_db
-from models.company import Company
-from models.user import User
+from config import settings
+from database import SessionLocal, get_db
+from models.user import User, UserRole
 from models.project import Project, ProjectStatus
 from models.quote import Quote, QuoteStatus
 from models.invoice import Invoice, InvoiceStatus
+from models.archive import invoices_archive, projects_archive, quotes_archive
+from models.revenue import RevenueDaily
 from middleware.auth import require_company_access
+from routes.projects import PROJECT_FIELD_PERMISSIONS
+from services.archive import select_project_list
+from services.events import stream_events
+from services.etag import cache_headers, etag_matches, make_etag, not_modified
+from services.export import EXPORT_COLUMNS, ExportKind, stream_export
+from services.revenue import BUCKETS, MAX_RANGE_DAYS, revenue_series
+from services.search import ProjectSearch
+from services.serialization import FastJSONResponse, parse_fields, readable_fields, rows_to_dicts
+from services.single_flight import dashboard_flight
+from services.tenant_cache import CompanySnapshot
 
 router = APIRouter(prefix="/companies", tags=["Companies"])
 
@@ -35,57 +48,117 @@ class ThemeResponse(BaseModel):
     company_name: str
 
 
+PROJECT_RESPONSE_FIELDS = tuple(ProjectResponse.model_fields)
+
+
+def compute_company_dashboard(company_id: int) -> dict:
+    """
+    Compute dashboard statistics for a company.
+    Opens its own session because the computation is shared between
+    coalesced requests and may outlive the request that started it.
+    
+    Args:
+        company_id: Company ID
+        
+    Returns:
+        Project, quote, invoice and revenue statistics
+    """
+    db = SessionLocal()
+    try:
+        # Project statistics
+        total_projects = db.query(func.count(Project.id)).filter(
+            Project.company_id == company_id
+        ).scalar()
+        
+        active_projects = db.query(func.count(Project.id)).filter(
+            Project.company_id == company_id,
+            Project.status.in_([ProjectStatus.APPROVED, ProjectStatus.IN_PROGRESS])
+        ).scalar()
+        
+        completed_projects = db.query(func.count(Project.id)).filter(
+            Project.company_id == company_id,
+            Project.status == ProjectStatus.COMPLETED
+        ).scalar()
+        
+        # Quote statistics
+        total_quotes = db.query(func.count(Quote.id)).filter(
+            Quote.company_id == company_id
+        ).scalar()
+        
+        pending_quotes = db.query(func.count(Quote.id)).filter(
+            Quote.company_id == company_id,
+            Quote.status == QuoteStatus.SENT
+        ).scalar()
+        
+        # Invoice statistics
+        total_invoices = db.query(func.count(Invoice.id)).filter(
+            Invoice.company_id == company_id
+        ).scalar()
+        
+        outstanding_invoices = db.query(func.count(Invoice.id)).filter(
+            Invoice.company_id == company_id,
+            Invoice.status.in_([InvoiceStatus.SENT, InvoiceStatus.OVERDUE])
+        ).scalar()
+        
+        # Revenue from the daily rollup
+        total_revenue = db.query(func.sum(RevenueDaily.amount)).filter(
+            RevenueDaily.company_id == company_id
+        ).scalar() or 0
+        
+        # Archived projects, quotes and invoices still count
+        archived_projects, archived_completed = db.query(
+            func.count(projects_archive.c.id),
+            func.count(case((projects_archive.c.status == ProjectStatus.COMPLETED, 1)))
+        ).filter(projects_archive.c.company_id == company_id).one()
+        
+        archived_quotes, archived_pending = db.query(
+            func.count(quotes_archive.c.id),
+            func.count(case((quotes_archive.c.status == QuoteStatus.SENT, 1)))
+        ).filter(quotes_archive.c.company_id == company_id).one()
+        
+        archived_invoices, archived_outstanding = db.query(
+            func.count(invoices_archive.c.id),
+            func.count(case((invoices_archive.c.status.in_([InvoiceStatus.SENT, InvoiceStatus.OVERDUE]), 1)))
+        ).filter(invoices_archive.c.company_id == company_id).one()
+    finally:
+        db.close()
+    
+    return {
+        "projects": {
+            "total": total_projects + archived_projects,
+            "active": active_projects,
+            "completed": completed_projects + archived_completed
+        },
+        "quotes": {
+            "total": total_quotes + archived_quotes,
+            "pending": pending_quotes + archived_pending
+        },
+        "invoices": {
+            "total": total_invoices + archived_invoices,
+            "outstanding": outstanding_invoices + archived_outstanding
+        },
+        "revenue": {
+            "total": float(total_revenue)
+        }
+    }
+
+
 @router.get("/{company_slug}/dashboard")
 async def get_company_dashboard(
     company_slug: str,
-    user_company: tuple[User, Company] = Depends(require_company_access),
+    user_company: tuple[User, CompanySnapshot] = Depends(require_company_access),
     db: Session = Depends(get_db)
 ):
     """
     Get dashboard statistics for a specific company.
+    Concurrent requests for the same company share one computation.
     """
     current_user, company = user_company
     
-    # Project statistics
-    total_projects = db.query(func.count(Project.id)).filter(
-        Project.company_id == company.id
-    ).scalar()
-    
-    active_projects = db.query(func.count(Project.id)).filter(
-        Project.company_id == company.id,
-        Project.status.in_([ProjectStatus.APPROVED, ProjectStatus.IN_PROGRESS])
-    ).scalar()
-    
-    completed_projects = db.query(func.count(Project.id)).filter(
-        Project.company_id == company.id,
-        Project.status == ProjectStatus.COMPLETED
-    ).scalar()
-    
-    # Quote statistics
-    total_quotes = db.query(func.count(Quote.id)).filter(
-        Quote.company_id == company.id
-    ).scalar()
-    
-    pending_quotes = db.query(func.count(Quote.id)).filter(
-        Quote.company_id == company.id,
-        Quote.status == QuoteStatus.SENT
-    ).scalar()
-    
-    # Invoice statistics
-    total_invoices = db.query(func.count(Invoice.id)).filter(
-        Invoice.company_id == company.id
-    ).scalar()
-    
-    outstanding_invoices = db.query(func.count(Invoice.id)).filter(
-        Invoice.company_id == company.id,
-        Invoice.status.in_([InvoiceStatus.SENT, InvoiceStatus.OVERDUE])
-    ).scalar()
-    
-    # Revenue calculation
-    total_revenue = db.query(func.sum(Invoice.total_amount)).filter(
-        Invoice.company_id == company.id,
-        Invoice.status == InvoiceStatus.PAID
-    ).scalar() or 0
+    # Return the request's connection to the pool while waiting on the shared computation
+    db.close()
+    
+    stats = await dashboard_flight.do(("company_dashboard", company.id), compute_company_dashboard, company.id)
     
     return {
         "company": {
@@ -94,60 +167,213 @@ async def get_company_dashboard(
             "slug": company.slug,
             "subscription_plan": company.subscription_plan
         },
-        "projects": {
-            "total": total_projects,
-            "active": active_projects,
-            "completed": completed_projects
-        },
-        "quotes": {
-            "total": total_quotes,
-            "pending": pending_quotes
-        },
-        "invoices": {
-            "total": total_invoices,
-            "outstanding": outstanding_invoices
-        },
-        "revenue": {
-            "total": float(total_revenue)
-        }
+        **stats
     }
 
 
+@router.get("/{company_slug}/revenue")
+async def get_company_revenue(
+    company_slug: str,
+    user_company: tuple[User, CompanySnapshot] = Depends(require_company_access),
+    db: Session = Depends(get_db),
+    start: Optional[date] = Query(None, description="First day (default: one year before end)"),
+    end: Optional[date] = Query(None, description="Last day (default: today)"),
+    bucket: str = Query("month", description="day, week or month")
+):
+    """
+    Get a company's paid revenue over time, grouped by day, week or month.
+    Served from the daily revenue rollup; empty buckets are included.
+    """
+    current_user, company = user_company
+    
+    if bucket not in BUCKETS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"bucket must be one of: {', '.join(BUCKETS)}"
+        )
+    
+    end = end or datetime.utcnow().date()
+    start = start or end - timedelta(days=365)
+    if start > end or (end - start).days > MAX_RANGE_DAYS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"start must be before end and at most {MAX_RANGE_DAYS} days earlier"
+        )
+    
+    return FastJSONResponse(revenue_series(db, company.id, start, end, bucket))
+
+
+def company_projects_version(db: Session, company_id: int) -> tuple:
+    """
+    Get the change version of a company's project list.
+    Any insert, update or delete changes the project count or the latest
+    updated_at, so the pair identifies the list state without loading rows.
+    
+    Args:
+        db: Database session
+        company_id: Company ID
+        
+    Returns:
+        tuple: (project count, latest updated_at)
+    """
+    return tuple(db.query(func.count(Project.id), func.max(Project.updated_at)).filter(
+        Project.company_id == company_id
+    ).one())
+
+
 @router.get("/{company_slug}/projects", response_model=List[ProjectResponse])
 async def list_company_projects(
     company_slug: str,
-    user_company: tuple[User, Company] = Depends(require_company_access),
+    request: Request,
+    user_company: tuple[User, CompanySnapshot] = Depends(require_company_access),
     db: Session = Depends(get_db),
     limit: int = 50,
-    offset: int = 0
+    offset: int = 0,
+    fields: Optional[str] = Query(None, description="Comma-separated response fields"),
+    include_archived: bool = Query(False, description="Also list archived projects")
 ):
     """
     List all projects for a specific company.
+    Use `fields` to return only selected columns.
+    Archived projects are only listed with `include_archived`.
+    
+    Responses carry an ETag derived from the company's project list version;
+    a matching If-None-Match returns 304 without loading any project rows.
     """
     current_user, company = user_company
+    selected = parse_fields(fields, PROJECT_RESPONSE_FIELDS, current_user.role, PROJECT_FIELD_PERMISSIONS)
     
-    projects = db.query(Project).filter(
-        Project.company_id == company.id
-    ).order_by(
-        Project.created_at.desc()
-    ).limit(limit).offset(offset).all()
+    etag = make_etag(
+        "company-projects", company.id, *company_projects_version(db, company.id),
+        limit, offset, ",".join(selected), include_archived
+    )
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    
+    rows = db.execute(
+        select_project_list(selected, {"company_id": company.id}, include_archived).limit(limit).offset(offset)
+    ).all()
     
-    return projects
+    return FastJSONResponse(rows_to_dicts(rows, selected), headers=cache_headers(etag))
+
+
+@router.get("/{company_slug}/projects/search", response_model=List[ProjectResponse])
+async def search_company_projects(
+    company_slug: str,
+    q: str = Query(..., min_length=1, max_length=200, description="Search text"),
+    user_company: tuple[User, CompanySnapshot] = Depends(require_company_access),
+    db: Session = Depends(get_db),
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+    fields: Optional[str] = Query(None, description="Comma-separated response fields")
+):
+    """
+    Search a company's projects by name, client name, address or description.
+    Results are ranked by relevance and paginated.
+    """
+    current_user, company = user_company
+    selected = parse_fields(fields, PROJECT_RESPONSE_FIELDS, current_user.role, PROJECT_FIELD_PERMISSIONS)
+    
+    rows = ProjectSearch.search(db, company.id, q, selected, limit=limit, offset=offset)
+    
+    return FastJSONResponse(rows_to_dicts(rows, selected))
 
 
 @router.get("/{company_slug}/theme", response_model=ThemeResponse)
 async def get_company_theme(
     company_slug: str,
-    user_company: tuple[User, Company] = Depends(require_company_access)
+    request: Request,
+    response: Response,
+    user_company: tuple[User, CompanySnapshot] = Depends(require_company_access)
 ):
     """
     Get company branding/theme information.
+    Branding rarely changes, so it is cached by clients for THEME_CACHE_MAX_AGE
+    and revalidated with its ETag afterwards.
     """
     current_user, company = user_company
     
+    etag = make_etag("theme", company.id, company.updated_at)
+    cache_control = f"private, max-age={settings.THEME_CACHE_MAX_AGE}"
+    if etag_matches(request, etag):
+        return not_modified(etag, cache_control)
+    
+    response.headers.update(cache_headers(etag, cache_control))
+    
     return ThemeResponse(
         primary_color=company.primary_color,
         secondary_color=company.secondary_color,
         logo_url=company.logo_url,
         company_name=company.name
     )
+
+
+@router.get("/{company_slug}/export/{kind}")
+async def export_company_data(
+    company_slug: str,
+    kind: ExportKind,
+    user_company: tuple[User, CompanySnapshot] = Depends(require_company_access),
+    format: str = Query("csv", pattern="^(csv|ndjson)$", description="csv or ndjson"),
+    gzip: bool = Query(False, description="Gzip-compress the export"),
+    since: Optional[datetime] = Query(None, description="Only rows created at or after this time"),
+    until: Optional[datetime] = Query(None, description="Only rows created before this time"),
+    include_archived: bool = Query(True, description="Include rows of archived projects")
+):
+    """
+    Stream all projects, quotes or invoices of a company as CSV or NDJSON.
+    Rows of archived projects are included unless include_archived is false.
+    Rows are streamed from a server-side cursor, so exports of any size
+    start immediately and use constant memory.
+    Columns the user's role may not read are left out.
+    """
+    current_user, company = user_company
+    fields = readable_fields(EXPORT_COLUMNS[kind.value][1], current_user.role, PROJECT_FIELD_PERMISSIONS)
+    
+    filename = f"{company.slug}-{kind.value}.{format}"
+    media_type = "text/csv" if format == "csv" else "application/x-ndjson"
+    if gzip:
+        filename += ".gz"
+        media_type = "application/gzip"
+    
+    return StreamingResponse(
+        stream_export(
+            kind.value, company.id, fields=fields, format=format, compress=gzip,
+            since=since, until=until, include_archived=include_archived
+        ),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
+
+@router.get("/{company_slug}/events")
+async def company_events(
+    company_slug: str,
+    request: Request,
+    user_company: tuple[User, CompanySnapshot] = Depends(require_company_access),
+    last_event_id: Optional[int] = Query(None, description="Resume after this event (alternative to the Last-Event-ID header)")
+):
+    """
+    Server-sent event feed of project changes in a company.
+    
+    Emits project.created, project.updated, project.status_changed,
+    project.deleted and projects.imported events as they are committed.
+    Reconnecting clients send Last-Event-ID to receive what they missed;
+    a reset event means the gap is too old and the list must be reloaded.
+    """
+    current_user, company = user_company
+    
+    header = request.headers.get("last-event-id")
+    if header is not None:
+        try:
+            last_event_id = int(header)
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid Last-Event-ID"
+            )
+    
+    return StreamingResponse(
+        stream_events(company.id, last_event_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
@@ -0,0 +1,389 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import HTMLResponse
+from sqlalchemy.orm import Session
+from pydantic import BaseModel, Field
+from typing import List, Optional
+from datetime import datetime, timedelta
+
+from database import get_db
+from models.company import Company
+from models.invoice import Invoice, InvoiceStatus
+from models.project import Project
+from models.user import User, UserRole
+from middleware.auth import get_current_user
+from routes.projects import resolve_company_id, verify_project_access
+from services.billing import document_totals, generate_invoices, money, price_project, revised_totals
+from services.documents import document_context, render_pool
+from services.events import event_bus
+from services.numbering import number_allocator
+from services.serialization import FastJSONResponse, parse_fields, reject_nulls, response_columns, rows_to_dicts
+
+router = APIRouter(prefix="/invoices", tags=["Invoices"])
+
+# Maximum number of projects invoiced by one batch request
+INVOICE_BATCH_MAX_PROJECTS = 1000
+
+# Status -> statuses an update may move an invoice to; paid and cancelled
+# invoices are final
+INVOICE_STATUS_TRANSITIONS = {
+    InvoiceStatus.DRAFT: {InvoiceStatus.SENT, InvoiceStatus.PAID, InvoiceStatus.CANCELLED},
+    InvoiceStatus.SENT: {InvoiceStatus.PAID, InvoiceStatus.OVERDUE, InvoiceStatus.CANCELLED},
+    InvoiceStatus.OVERDUE: {InvoiceStatus.SENT, InvoiceStatus.PAID, InvoiceStatus.CANCELLED},
+    InvoiceStatus.PAID: set(),
+    InvoiceStatus.CANCELLED: set(),
+}
+
+
+# Pydantic models for request/response
+class InvoiceCreate(BaseModel):
+    project_id: Optional[int] = Field(None, description="Project to invoice; client details and price default from it")
+    client_name: Optional[str] = Field(None, min_length=1, max_length=255)
+    client_email: Optional[str] = None
+    client_phone: Optional[str] = None
+    client_address: Optional[str] = None
+    amount: Optional[float] = Field(None, ge=0, description="Net amount (priced from the project if omitted)")
+    tax_rate: float = Field(0.0, ge=0, le=100, description="Tax percentage")
+    discount_amount: float = Field(0.0, ge=0)
+    due_date: Optional[datetime] = None
+    notes: Optional[str] = None
+    company_id: Optional[int] = Field(None, description="Company ID (required for admin users without a project)")
+
+
+class InvoiceUpdate(BaseModel):
+    client_name: Optional[str] = Field(None, min_length=1, max_length=255)
+    client_email: Optional[str] = None
+    client_phone: Optional[str] = None
+    client_address: Optional[str] = None
+    amount: Optional[float] = Field(None, ge=0)
+    tax_rate: Optional[float] = Field(None, ge=0, le=100, description="Tax percentage (default: the invoice's current rate)")
+    discount_amount: Optional[float] = Field(None, ge=0)
+    status: Optional[InvoiceStatus] = None
+    due_date: Optional[datetime] = None
+    paid_date: Optional[datetime] = None
+    payment_method: Optional[str] = Field(None, max_length=50)
+    notes: Optional[str] = None
+
+
+class InvoiceBatchRequest(BaseModel):
+    project_ids: List[int] = Field(..., min_length=1, max_length=INVOICE_BATCH_MAX_PROJECTS)
+    tax_rate: float = Field(0.0, ge=0, le=100, description="Tax percentage")
+    due_in_days: int = Field(30, ge=0, le=365)
+
+
+class InvoiceResponse(BaseModel):
+    id: int
+    company_id: int
+    project_id: Optional[int]
+    invoice_number: str
+    client_name: str
+    client_email: str
+    client_phone: Optional[str]
+    client_address: Optional[str]
+    amount: float
+    tax_amount: Optional[float]
+    discount_amount: Optional[float]
+    total_amount: float
+    status: InvoiceStatus
+    due_date: Optional[datetime]
+    paid_date: Optional[datetime]
+    payment_method: Optional[str]
+    notes: Optional[str]
+    created_at: datetime
+    sent_at: Optional[datetime]
+
+    class Config:
+        from_attributes = True
+
+
+INVOICE_RESPONSE_FIELDS = tuple(InvoiceResponse.model_fields)
+
+
+def get_accessible_invoice(db: Session, invoice_id: int, current_user: User) -> Invoice:
+    """
+    Load an invoice the current user may access.
+
+    Args:
+        db: Database session
+        invoice_id: Invoice ID
+        current_user: The current authenticated user
+
+    Returns:
+        Invoice: The invoice
+
+    Raises:
+        HTTPException: If the invoice doesn't exist or belongs to another company
+    """
+    invoice = db.query(Invoice).filter(Invoice.id == invoice_id).first()
+
+    if not invoice:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Invoice not found"
+        )
+
+    verify_project_access(invoice, current_user)
+    return invoice
+
+
+def publish_invoice_event(event_type: str, invoice: Invoice) -> None:
+    """
+    Publish an invoice change to the company's event feed.
+
+    Args:
+        event_type: Event type, e.g. "invoice.created"
+        invoice: The committed invoice
+    """
+    event_bus.publish(invoice.company_id, event_type, {
+        "id": invoice.id,
+        "invoice_number": invoice.invoice_number,
+        "project_id": invoice.project_id,
+        "status": invoice.status,
+        "total_amount": invoice.total_amount,
+    })
+
+
+@router.get("/", response_model=List[InvoiceResponse])
+async def list_invoices(
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+    skip: int = 0,
+    limit: int = Query(50, ge=1, le=500),
+    invoice_status: Optional[InvoiceStatus] = Query(None, alias="status"),
+    project_id: Optional[int] = None,
+    fields: Optional[str] = Query(None, description="Comma-separated response fields")
+):
+    """
+    List invoices, newest first.
+    Admins see all invoices, company users only see their company's invoices.
+    """
+    selected = parse_fields(fields, INVOICE_RESPONSE_FIELDS)
+    query = db.query(*response_columns(Invoice, selected))
+
+    if current_user.role != UserRole.ADMIN:
+        if current_user.company_id is None:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="User is not associated with any company"
+            )
+        query = query.filter(Invoice.company_id == current_user.company_id)
+
+    if invoice_status:
+        query = query.filter(Invoice.status == invoice_status)
+    if project_id is not None:
+        query = query.filter(Invoice.project_id == project_id)
+
+    rows = query.order_by(Invoice.created_at.desc()).offset(skip).limit(limit).all()
+    return FastJSONResponse(rows_to_dicts(rows, selected))
+
+
+@router.post("/batch")
+async def generate_invoice_batch(
+    request: InvoiceBatchRequest,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Create draft invoices for many projects at once, e.g. at month end.
+
+    Each project is priced with TilingCalculator and gets the next invoice
+    number of its company; all invoices are inserted in one transaction.
+    Projects that already have an invoice (other than a cancelled one)
+    are skipped, so the batch can be retried.
+
+    Every listed project gets an outcome of "created", "already_invoiced",
+    "unpriced" (missing dimensions or tile price), "missing_client_email",
+    "not_found" or "forbidden".
+    """
+    if current_user.role != UserRole.ADMIN and current_user.company_id is None:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="User is not associated with any company"
+        )
+
+    results = generate_invoices(db, request.project_ids, current_user, request.tax_rate, request.due_in_days)
+
+    # A project listed twice is reported twice but invoiced once
+    created = list({
+        result["invoice_id"]: result for result in results if result["outcome"] == "created"
+    }.values())
+    if created:
+        companies = dict(
+            db.query(Project.id, Project.company_id)
+            .filter(Project.id.in_([result["project_id"] for result in created])).all()
+        )
+        by_company = {}
+        for result in created:
+            by_company.setdefault(companies[result["project_id"]], []).append(result["invoice_id"])
+        for company_id, invoice_ids in by_company.items():
+            event_bus.publish_chunked(company_id, "invoices.generated", {"ids": invoice_ids}, "ids")
+
+    return {"created": len(created), "results": results}
+
+
+@router.post("/", response_model=InvoiceResponse, status_code=status.HTTP_201_CREATED)
+async def create_invoice(
+    invoice_data: InvoiceCreate,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Create an invoice with the next invoice number of the company.
+    With a project_id, client details default to the project's and the
+    amount is priced from its dimensions with TilingCalculator.
+    """
+    values = invoice_data.model_dump(exclude={"project_id", "amount", "tax_rate", "discount_amount", "company_id"})
+    amount = money(invoice_data.amount) if invoice_data.amount is not None else None
+
+    if invoice_data.project_id is not None:
+        project = db.query(Project).filter(Project.id == invoice_data.project_id).first()
+        if not project:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Project not found"
+            )
+        verify_project_access(project, current_user)
+        company_id = project.company_id
+
+        for field in ("client_name", "client_email", "client_phone", "client_address"):
+            if values[field] is None:
+                values[field] = getattr(project, field)
+        if amount is None:
+            price = price_project(project)
+            if price is None:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Project lacks the dimensions or tile price needed to price it; give an amount"
+                )
+            amount = price["amount"]
+            values["notes"] = values["notes"] or price["description"]
+    else:
+        company_id = resolve_company_id(invoice_data.company_id, current_user, db)
+
+    if not values["client_name"] or not values["client_email"] or amount is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="client_name, client_email and amount are required"
+        )
+
+    tax_amount, discount_amount, total_amount = document_totals(
+        amount, invoice_data.tax_rate, invoice_data.discount_amount
+    )
+    if values["due_date"] is None:
+        values["due_date"] = datetime.utcnow() + timedelta(days=30)
+
+    invoice = Invoice(
+        company_id=company_id,
+        project_id=invoice_data.project_id,
+        invoice_number=number_allocator.next_number(company_id, "invoice"),
+        amount=amount,
+        tax_amount=tax_amount,
+        discount_amount=discount_amount,
+        total_amount=total_amount,
+        **values
+    )
+    db.add(invoice)
+    db.commit()
+    db.refresh(invoice)
+
+    publish_invoice_event("invoice.created", invoice)
+
+    return invoice
+
+
+@router.get("/{invoice_id}", response_model=InvoiceResponse)
+async def get_invoice(
+    invoice_id: int,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Get a specific invoice by ID.
+    """
+    return get_accessible_invoice(db, invoice_id, current_user)
+
+
+@router.put("/{invoice_id}", response_model=InvoiceResponse)
+async def update_invoice(
+    invoice_id: int,
+    invoice_data: InvoiceUpdate,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Update an invoice.
+    Tax and the total are recomputed when the amount, tax rate or discount
+    changes. The status may only move along INVOICE_STATUS_TRANSITIONS.
+    Moving it to SENT records when it was sent; marking it PAID without a
+    paid_date books the payment today. Revenue statistics follow the change.
+    """
+    reject_nulls(invoice_data, ("client_name", "client_email", "amount", "discount_amount", "status"))
+    invoice = get_accessible_invoice(db, invoice_id, current_user)
+    changes = invoice_data.model_dump(exclude_unset=True, exclude={"amount", "tax_rate", "discount_amount"})
+
+    # Rows stored before statuses were checked may lack one; treat them as drafts
+    current_status = invoice.status or InvoiceStatus.DRAFT
+    new_status = changes.get("status")
+    if new_status is not None and new_status != current_status \
+            and new_status not in INVOICE_STATUS_TRANSITIONS[current_status]:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Cannot move a {current_status.value} invoice to {new_status.value}"
+        )
+
+    if invoice_data.model_fields_set & {"amount", "tax_rate", "discount_amount"}:
+        invoice.amount, invoice.tax_amount, invoice.discount_amount, invoice.total_amount = revised_totals(
+            invoice.amount, invoice.tax_amount, invoice.discount_amount,
+            invoice_data.amount, invoice_data.tax_rate, invoice_data.discount_amount
+        )
+
+    for field, value in changes.items():
+        setattr(invoice, field, value)
+
+    if invoice.status == InvoiceStatus.SENT and invoice.sent_at is None:
+        invoice.sent_at = datetime.utcnow()
+
+    db.commit()
+    db.refresh(invoice)
+
+    publish_invoice_event("invoice.updated", invoice)
+
+    return invoice
+
+
+@router.delete("/{invoice_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_invoice(
+    invoice_id: int,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Delete an invoice.
+    """
+    invoice = get_accessible_invoice(db, invoice_id, current_user)
+
+    company_id = invoice.company_id
+    db.delete(invoice)
+    db.commit()
+
+    event_bus.publish(company_id, "invoice.deleted", {"id": invoice_id})
+
+    return None
+
+
+@router.get("/{invoice_id}/document", response_class=HTMLResponse)
+async def get_invoice_document(
+    invoice_id: int,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Render an invoice as an HTML document with the company's branding.
+    """
+    invoice = get_accessible_invoice(db, invoice_id, current_user)
+    company = db.query(Company).filter(Company.id == invoice.company_id).first()
+    context = document_context(invoice, company)
+
+    # Return the connection to the pool while the document renders
+    db.close()
+
+    return HTMLResponse(await render_pool.render("invoice", context))
@@ -0,0 +1,272 @@
+import shutil
+from datetime import datetime
+from typing import Any, List, Optional
+
+from fastapi import APIRouter, Depends, File, HTTPException, Query, Response, UploadFile, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import FileResponse
+from pydantic import BaseModel, Field
+from sqlalchemy.orm import Session
+
+from database import get_db
+from middleware.auth import get_current_user
+from models.company import Company
+from models.job import Job, JobStatus
+from models.user import User, UserRole
+from routes.projects import PROJECT_FIELD_PERMISSIONS
+from services.export import EXPORT_COLUMNS, ExportKind
+from services.job_handlers import job_file_path, upload_path
+from services.jobs import JobQueue
+from services.project_import import SUPPORTED_FORMATS, detect_format
+from services.serialization import readable_fields
+
+router = APIRouter(prefix="/jobs", tags=["Jobs"])
+
+
+class ExportJobRequest(BaseModel):
+    kind: ExportKind
+    format: str = Field("csv", pattern="^(csv|ndjson)$")
+    gzip: bool = False
+    since: Optional[datetime] = None
+    until: Optional[datetime] = None
+    include_archived: bool = True  # Include rows of archived projects
+    company_id: Optional[int] = None  # Required for admin users
+    priority: int = Field(0, ge=-10, le=10)
+
+
+class JobResponse(BaseModel):
+    id: int
+    kind: str
+    status: JobStatus
+    company_id: Optional[int]
+    priority: int
+    progress: int
+    progress_total: Optional[int]
+    attempts: int
+    max_attempts: int
+    result: Optional[Any]
+    error: Optional[str]
+    run_after: datetime
+    created_at: datetime
+    started_at: Optional[datetime]
+    finished_at: Optional[datetime]
+    
+    class Config:
+        from_attributes = True
+
+
+def resolve_job_company_id(requested_company_id: Optional[int], current_user: User, db: Session) -> int:
+    """
+    Determine which company a new job runs for.
+    Company users always use their own company; admin users must name one.
+    
+    Args:
+        requested_company_id: Company ID supplied in the request (admin only)
+        current_user: The current authenticated user
+        db: Database session
+        
+    Returns:
+        The company ID
+        
+    Raises:
+        HTTPException: If no company can be determined or it doesn't exist
+    """
+    if current_user.role == UserRole.ADMIN:
+        if not requested_company_id:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Admin users must specify a company_id"
+            )
+        if not db.query(Company.id).filter(Company.id == requested_company_id).first():
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Company not found"
+            )
+        return requested_company_id
+    
+    if current_user.company_id is None:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="User is not associated with any company"
+        )
+    return current_user.company_id
+
+
+def get_accessible_job(job_id: int, current_user: User, db: Session) -> Job:
+    """
+    Load a job the current user may see.
+    
+    Args:
+        job_id: Job ID
+        current_user: The current authenticated user
+        db: Database session
+        
+    Returns:
+        Job: The job
+        
+    Raises:
+        HTTPException: If the job doesn't exist or belongs to another company
+    """
+    job = db.query(Job).filter(Job.id == job_id).first()
+    
+    if not job or (current_user.role != UserRole.ADMIN and job.company_id != current_user.company_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Job not found"
+        )
+    return job
+
+
+def accepted(job: Job, response: Response) -> Job:
+    """Point the client at the job's status URL."""
+    response.headers["Location"] = f"/api/jobs/{job.id}"
+    return job
+
+
+@router.post("/exports", response_model=JobResponse, status_code=status.HTTP_202_ACCEPTED)
+async def create_export_job(
+    job_request: ExportJobRequest,
+    response: Response,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Queue an export of a company's projects, quotes or invoices.
+    Poll the job and download the file once it has succeeded.
+    Columns the user's role may not read are left out.
+    """
+    company_id = resolve_job_company_id(job_request.company_id, current_user, db)
+    
+    job = JobQueue.enqueue(
+        db, "export",
+        {
+            "kind": job_request.kind.value,
+            "format": job_request.format,
+            "gzip": job_request.gzip,
+            "since": job_request.since.isoformat() if job_request.since else None,
+            "until": job_request.until.isoformat() if job_request.until else None,
+            "include_archived": job_request.include_archived,
+            "fields": list(readable_fields(
+                EXPORT_COLUMNS[job_request.kind.value][1], current_user.role, PROJECT_FIELD_PERMISSIONS
+            )),
+        },
+        company_id=company_id,
+        created_by=current_user.id,
+        priority=job_request.priority
+    )
+    return accepted(job, response)
+
+
+@router.post("/imports", response_model=JobResponse, status_code=status.HTTP_202_ACCEPTED)
+async def create_import_job(
+    response: Response,
+    file: UploadFile = File(..., description="CSV or NDJSON file with one project per row"),
+    format: Optional[str] = Query(None, description="csv or ndjson (detected from the file name if omitted)"),
+    company_id: Optional[int] = Query(None, description="Company ID (required for admin users)"),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Queue a bulk project import. The job result is the same per-row report
+    as POST /projects/import. Imports are not retried, since a failed
+    attempt may already have committed some chunks.
+    """
+    target_company_id = resolve_job_company_id(company_id, current_user, db)
+    
+    import_format = format or detect_format(file.filename, file.content_type)
+    if import_format not in SUPPORTED_FORMATS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Import format must be csv or ndjson"
+        )
+    
+    path = upload_path(file.filename)
+    with open(path, "wb") as destination:
+        await run_in_threadpool(shutil.copyfileobj, file.file, destination)
+    
+    job = JobQueue.enqueue(
+        db, "import_projects",
+        {"path": path, "format": import_format, "created_by": current_user.id},
+        company_id=target_company_id,
+        created_by=current_user.id,
+        max_attempts=1
+    )
+    return accepted(job, response)
+
+
+@router.get("/", response_model=List[JobResponse])
+async def list_jobs(
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+    status_filter: Optional[JobStatus] = Query(None, alias="status"),
+    company_id: Optional[int] = Query(None, description="Filter by company (admin only)"),
+    limit: int = Query(50, ge=1, le=500)
+):
+    """
+    List recent jobs of the user's company (all companies for admins).
+    """
+    query = db.query(Job)
+    
+    if current_user.role != UserRole.ADMIN:
+        query = query.filter(Job.company_id == current_user.company_id)
+    elif company_id:
+        query = query.filter(Job.company_id == company_id)
+    
+    if status_filter:
+        query = query.filter(Job.status == status_filter)
+    
+    return query.order_by(Job.id.desc()).limit(limit).all()
+
+
+@router.get("/{job_id}", response_model=JobResponse)
+async def get_job(
+    job_id: int,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Get a job's status, progress and result.
+    """
+    return get_accessible_job(job_id, current_user, db)
+
+
+@router.get("/{job_id}/download")
+async def download_job_file(
+    job_id: int,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Download the file produced by a succeeded job (e.g. an export).
+    """
+    job = get_accessible_job(job_id, current_user, db)
+    
+    if job.status != JobStatus.SUCCEEDED or not (job.result or {}).get("file"):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Job has no file to download"
+        )
+    
+    filename = job.result["file"]
+    return FileResponse(job_file_path(job.id, filename), filename=filename)
+
+
+@router.post("/{job_id}/cancel", response_model=JobResponse)
+async def cancel_job(
+    job_id: int,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Cancel a queued or running job.
+    """
+    job = get_accessible_job(job_id, current_user, db)
+    
+    if not JobQueue.cancel(db, job):
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Job already {job.status.value}"
+        )
+    
+    db.refresh(job)
+    return job
@@ -1,18 +1,35 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, File, HTTPException, Query, Request, UploadFile, status
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import and_, case, update
 from sqlalchemy.orm import Session
+from sqlalchemy.orm.exc import StaleDataError
 from pydantic import BaseModel, Field
 from typing import List, Optional
 from datetime import datetime
 from decimal import Decimal
+import re
 
 from database import get_db
 from models.project import Project, ProjectStatus
 from models.company import Company
 from models.user import User, UserRole
 from middleware.auth import get_current_user
+from services.archive import get_project_row, select_project_list
+from services.events import event_bus
+from services.etag import cache_headers, etag_matches, make_etag, not_modified
+from services.project_import import ProjectImporter, SUPPORTED_FORMATS, detect_format, iter_records
+from services.serialization import (
+    FastJSONResponse, parse_fields, readable_fields, reject_nulls, response_columns, rows_to_dicts
+)
 
 router = APIRouter(prefix="/projects", tags=["Projects"])
 
+# Maximum number of IDs accepted by a single multi-get request
+MULTI_GET_MAX_IDS = 500
+
+# Project ETags start with the version, e.g. "v3-<digest>"
+PROJECT_ETAG_VERSION = re.compile(r'^"v(\d+)-[0-9a-f]+"$')
+
 
 # Helper function for access control
 def verify_project_access(project: Project, current_user: User) -> None:
@@ -39,6 +56,104 @@ def verify_project_access(project: Project, current_user: User) -> None:
         )
 
 
+def project_etag(project_id: int, version: int, selected: tuple) -> str:
+    """
+    Build the ETag for a single project representation.
+    The version is kept readable so the ETag can be sent back in If-Match.
+    
+    Args:
+        project_id: Project ID
+        version: Project's version
+        selected: Response fields included in the representation
+        
+    Returns:
+        Quoted strong ETag
+    """
+    digest = make_etag("project", project_id, version, ",".join(selected)).strip('"')
+    return f'"v{version}-{digest}"'
+
+
+def expected_project_version(request: Request, body_version: Optional[int]) -> int:
+    """
+    Get the project version a conditional update expects, from the
+    If-Match header or the request body.
+    
+    Args:
+        request: The incoming request
+        body_version: Version given in the request body, if any
+        
+    Returns:
+        int: The expected version
+        
+    Raises:
+        HTTPException: If no version is given, or If-Match is not a project ETag
+    """
+    header = request.headers.get("if-match")
+    if header is None:
+        if body_version is None:
+            raise HTTPException(
+                status_code=status.HTTP_428_PRECONDITION_REQUIRED,
+                detail="Send the project's ETag in If-Match or its version in the body"
+            )
+        return body_version
+    
+    match = PROJECT_ETAG_VERSION.match(header.strip())
+    if not match:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="If-Match must be a single project ETag"
+        )
+    version = int(match.group(1))
+    if body_version is not None and body_version != version:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="If-Match and version disagree"
+        )
+    return version
+
+
+def resolve_company_id(requested_company_id: Optional[int], current_user: User, db: Session) -> int:
+    """
+    Determine which company new projects belong to.
+    Company users always use their own company; admin users must name one.
+    
+    Args:
+        requested_company_id: Company ID supplied in the request (admin only)
+        current_user: The current authenticated user
+        db: Database session
+        
+    Returns:
+        The company ID to create projects for
+        
+    Raises:
+        HTTPException: If no company can be determined or it doesn't exist
+    """
+    if current_user.role == UserRole.ADMIN:
+        # Admin users must provide company_id
+        if not requested_company_id:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Admin users must specify a company_id when creating projects"
+            )
+        
+        # Verify the company exists
+        company = db.query(Company.id).filter(Company.id == requested_company_id).first()
+        if not company:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Company not found"
+            )
+        return requested_company_id
+    
+    # Non-admin users use their own company
+    if current_user.company_id is None:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="User is not associated with any company"
+        )
+    return current_user.company_id
+
+
 def calculate_room_area(room_length: Optional[float], room_width: Optional[float]) -> Optional[float]:
     """
     Calculate room area from length and width.
@@ -55,6 +170,96 @@ def calculate_room_area(room_length: Optional[float], room_width: Optional[float
     return None
 
 
+def publish_project_event(event_type: str, project: Project, **extra) -> None:
+    """
+    Publish a project change to the company's event feed.
+    
+    Args:
+        event_type: Event type, e.g. "project.updated"
+        project: The committed project
+        extra: Additional payload fields
+    """
+    event_bus.publish(project.company_id, event_type, {
+        "id": project.id,
+        "name": project.name,
+        "client_name": project.client_name,
+        "status": project.status,
+        "updated_at": project.updated_at,
+        **extra,
+    })
+
+
+def parse_id_list(ids: str) -> List[int]:
+    """
+    Parse a comma-separated list of project IDs from the query string.
+    
+    Args:
+        ids: Comma-separated IDs, e.g. "3,1,2"
+        
+    Returns:
+        List of IDs in request order
+        
+    Raises:
+        HTTPException: If an ID is not an integer or too many IDs are given
+    """
+    try:
+        project_ids = [int(value) for value in ids.split(",") if value.strip()]
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="ids must be a comma-separated list of integers"
+        )
+    
+    if not project_ids or len(project_ids) > MULTI_GET_MAX_IDS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"ids must contain between 1 and {MULTI_GET_MAX_IDS} project IDs"
+        )
+    
+    return project_ids
+
+
+def fetch_projects_by_ids(
+    db: Session,
+    project_ids: List[int],
+    current_user: User,
+    selected: tuple
+) -> List[dict]:
+    """
+    Fetch several projects in one IN query and check access in bulk.
+    
+    Args:
+        db: Database session
+        project_ids: Requested project IDs, in request order
+        current_user: The current authenticated user
+        selected: Response fields to return for each project
+        
+    Returns:
+        One entry per requested ID, in request order. Each entry has either
+        a "project" payload or an "error" of "not_found" or "forbidden".
+    """
+    # company_id is always loaded for the access check
+    columns = response_columns(Project, selected)
+    if "company_id" not in selected:
+        columns.append(Project.company_id)
+    
+    rows = db.query(*columns).filter(Project.id.in_(set(project_ids))).all()
+    found = {row.id: row for row in rows}
+    
+    is_admin = current_user.role == UserRole.ADMIN
+    results = []
+    for project_id in project_ids:
+        row = found.get(project_id)
+        if row is None:
+            results.append({"id": project_id, "error": "not_found"})
+        elif not is_admin and row.company_id != current_user.company_id:
+            results.append({"id": project_id, "error": "forbidden"})
+        else:
+            results.append({"id": project_id, "project": dict(zip(selected, row))})
+    
+    return results
+
+
 # Pydantic models for request/response
 class ProjectCreate(BaseModel):
     name: str = Field(..., min_length=1, max_length=255)
@@ -91,6 +296,10 @@ class ProjectUpdate(BaseModel):
     actual_cost: Optional[float] = Field(None, ge=0)
 
 
+class ProjectPatch(ProjectUpdate):
+    version: Optional[int] = Field(None, ge=1, description="Expected version (alternative to If-Match)")
+
+
 class ProjectResponse(BaseModel):
     id: int
     company_id: int
@@ -114,24 +323,91 @@ class ProjectResponse(BaseModel):
     created_at: datetime
     updated_at: datetime
     completed_at: Optional[datetime]
+    version: int
     
     class Config:
         from_attributes = True
 
 
+class ProjectMultiGetRequest(BaseModel):
+    ids: List[int] = Field(..., min_length=1, max_length=MULTI_GET_MAX_IDS)
+    fields: Optional[str] = None
+
+
+class ProjectBulkFilter(BaseModel):
+    status: Optional[ProjectStatus] = None
+
+
+class ProjectBulkChanges(BaseModel):
+    status: Optional[ProjectStatus] = None
+    tile_price_per_unit: Optional[float] = Field(None, ge=0)
+    wastage_percentage: Optional[float] = Field(None, ge=0, le=100)
+    budget: Optional[float] = Field(None, ge=0)
+    actual_cost: Optional[float] = Field(None, ge=0)
+
+
+class ProjectBulkUpdateRequest(BaseModel):
+    ids: Optional[List[int]] = Field(None, min_length=1, max_length=MULTI_GET_MAX_IDS)
+    filter: Optional[ProjectBulkFilter] = None
+    changes: ProjectBulkChanges
+    company_id: Optional[int] = Field(None, description="Limit an admin's update to one company")
+
+
+PROJECT_RESPONSE_FIELDS = tuple(ProjectResponse.model_fields)
+
+# Roles allowed to read financial fields; other roles never receive them
+# and get 403 when requesting them explicitly via ?fields=
+PROJECT_FIELD_PERMISSIONS = {
+    "budget": {UserRole.ADMIN, UserRole.OWNER, UserRole.MANAGER},
+    "actual_cost": {UserRole.ADMIN, UserRole.OWNER, UserRole.MANAGER},
+}
+
+
+def project_response(project: Project, current_user: User, status_code: int = status.HTTP_200_OK) -> FastJSONResponse:
+    """
+    Serialize a loaded project, leaving out fields the user's role may not read.
+
+    Args:
+        project: The project
+        current_user: The current authenticated user
+        status_code: Response status code
+
+    Returns:
+        FastJSONResponse: The project payload
+    """
+    selected = readable_fields(PROJECT_RESPONSE_FIELDS, current_user.role, PROJECT_FIELD_PERMISSIONS)
+    return FastJSONResponse({name: getattr(project, name) for name in selected}, status_code=status_code)
+
+
 @router.get("/", response_model=List[ProjectResponse])
 async def list_projects(
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
     skip: int = 0,
     limit: int = 50,
-    status: Optional[ProjectStatus] = None
+    status: Optional[ProjectStatus] = None,
+    fields: Optional[str] = Query(None, description="Comma-separated response fields"),
+    ids: Optional[str] = Query(None, description="Comma-separated project IDs to fetch in one request"),
+    include_archived: bool = Query(False, description="Also list archived projects")
 ):
     """
     List all projects accessible to the current user.
     Admins see all projects, company users only see their company's projects.
+    Use `fields` to return only selected columns.
+    Archived projects are only listed with `include_archived`.
+    
+    When `ids` is given, the listed projects are fetched in request order
+    instead, each with a "project" payload or a "not_found"/"forbidden" error.
     """
-    query = db.query(Project)
+    selected = parse_fields(fields, PROJECT_RESPONSE_FIELDS, current_user.role, PROJECT_FIELD_PERMISSIONS)
+    
+    if ids is not None:
+        return FastJSONResponse(
+            fetch_projects_by_ids(db, parse_id_list(ids), current_user, selected)
+        )
+    
+    # Select only the response columns as plain rows (no ORM identity map)
+    filters = {}
     
     # Filter by company for non-admin users
     if current_user.role != UserRole.ADMIN:
@@ -140,17 +416,172 @@ async def list_projects(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="User is not associated with any company"
             )
-        query = query.filter(Project.company_id == current_user.company_id)
+        filters["company_id"] = current_user.company_id
     
     # Optional status filter
     if status:
-        query = query.filter(Project.status == status)
+        filters["status"] = status
     
-    projects = query.order_by(
-        Project.created_at.desc()
-    ).offset(skip).limit(limit).all()
+    rows = db.execute(
+        select_project_list(selected, filters, include_archived).offset(skip).limit(limit)
+    ).all()
     
-    return projects
+    return FastJSONResponse(rows_to_dicts(rows, selected))
+
+
+@router.post("/multi-get")
+async def multi_get_projects(
+    request: ProjectMultiGetRequest,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Fetch several projects by ID in one request.
+    POST variant of `GET /projects?ids=...` for long ID lists.
+    """
+    selected = parse_fields(request.fields, PROJECT_RESPONSE_FIELDS, current_user.role, PROJECT_FIELD_PERMISSIONS)
+    
+    return FastJSONResponse(
+        fetch_projects_by_ids(db, request.ids, current_user, selected)
+    )
+
+
+@router.post("/bulk-update")
+async def bulk_update_projects(
+    request: ProjectBulkUpdateRequest,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Apply one change to many projects in a single UPDATE statement.
+    
+    Target projects by `ids`, by `filter` (e.g. every APPROVED project), or
+    both. Company users only ever touch their own company's projects; the
+    scoping is part of the UPDATE itself. Projects already in the requested
+    status are left alone. completed_at is set for projects that move to
+    COMPLETED, and updated_at for every updated project.
+    
+    Listed ids get an outcome of "updated", "unchanged" (filtered out or
+    already in that state), "not_found" or "forbidden".
+    """
+    values = request.changes.model_dump(exclude_unset=True)
+    if not values:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="No changes given"
+        )
+    
+    bulk_filter = request.filter.model_dump(exclude_none=True) if request.filter else {}
+    if not request.ids and not bulk_filter:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Specify ids or a filter"
+        )
+    
+    is_admin = current_user.role == UserRole.ADMIN
+    conditions = []
+    if not is_admin:
+        if current_user.company_id is None:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="User is not associated with any company"
+            )
+        conditions.append(Project.company_id == current_user.company_id)
+    elif request.company_id:
+        conditions.append(Project.company_id == request.company_id)
+    
+    if request.ids:
+        conditions.append(Project.id.in_(set(request.ids)))
+    if "status" in bulk_filter:
+        conditions.append(Project.status == bulk_filter["status"])
+    
+    now = datetime.utcnow()
+    new_status = values.get("status")
+    if new_status is not None:
+        # Rows already in the target status are excluded, so every row
+        # moving to COMPLETED here is newly completed
+        conditions.append(Project.status != new_status)
+        if new_status == ProjectStatus.COMPLETED:
+            values["completed_at"] = now
+    values["updated_at"] = now
+    values["version"] = Project.version + 1
+    
+    # Core UPDATE: no ORM events fire (e.g. invoice revenue tracking), so
+    # it must only ever touch project columns
+    updated = db.execute(
+        update(Project)
+        .where(and_(*conditions))
+        .values(**values)
+        .returning(Project.id, Project.company_id)
+        .execution_options(synchronize_session=False)
+    ).all()
+    db.commit()
+    
+    updated_ids = {row.id for row in updated}
+    
+    changes = request.changes.model_dump(exclude_unset=True)
+    for company_id in {row.company_id for row in updated}:
+        event_bus.publish_chunked(company_id, "projects.bulk_updated", {
+            "ids": sorted(row.id for row in updated if row.company_id == company_id),
+            "changes": changes,
+        }, "ids")
+    
+    if not request.ids:
+        return {"updated": len(updated_ids), "ids": sorted(updated_ids)}
+    
+    # Explain the listed ids that were not updated
+    missing = set(request.ids) - updated_ids
+    existing = {}
+    if missing:
+        existing = {
+            row.id: row.company_id
+            for row in db.query(Project.id, Project.company_id).filter(Project.id.in_(missing)).all()
+        }
+    
+    results = []
+    for project_id in request.ids:
+        if project_id in updated_ids:
+            outcome = "updated"
+        elif project_id not in existing:
+            outcome = "not_found"
+        elif not is_admin and existing[project_id] != current_user.company_id:
+            outcome = "forbidden"
+        else:
+            outcome = "unchanged"
+        results.append({"id": project_id, "outcome": outcome})
+    
+    return {"updated": len(updated_ids), "results": results}
+
+
+@router.post("/import")
+async def import_projects(
+    file: UploadFile = File(..., description="CSV or NDJSON file with one project per row"),
+    format: Optional[str] = Query(None, description="csv or ndjson (detected from the file name if omitted)"),
+    company_id: Optional[int] = Query(None, description="Company ID (required for admin users)"),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Bulk import projects from a streamed CSV or NDJSON upload.
+    Rows are validated and inserted in chunks; the response is a per-row
+    error report alongside imported/failed counts.
+    """
+    target_company_id = resolve_company_id(company_id, current_user, db)
+    
+    import_format = format or detect_format(file.filename, file.content_type)
+    if import_format not in SUPPORTED_FORMATS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Import format must be csv or ndjson"
+        )
+    
+    importer = ProjectImporter(db, target_company_id, created_by=current_user.id)
+    report = await run_in_threadpool(importer.run, iter_records(file.file, import_format))
+    
+    if report["imported"]:
+        event_bus.publish(target_company_id, "projects.imported", {"imported": report["imported"]})
+    
+    return report
 
 
 @router.post("/", response_model=ProjectResponse, status_code=status.HTTP_201_CREATED)
@@ -164,31 +595,7 @@ async def create_project(
     Company users can only create projects for their own company.
     Admin users must specify a company_id in the request.
     """
-    # Determine company_id
-    if current_user.role == UserRole.ADMIN:
-        # Admin users must provide company_id
-        if not project_data.company_id:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Admin users must specify a company_id when creating projects"
-            )
-        company_id = project_data.company_id
-        
-        # Verify the company exists
-        company = db.query(Company).filter(Company.id == company_id).first()
-        if not company:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Company not found"
-            )
-    else:
-        # Non-admin users use their own company
-        if current_user.company_id is None:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="User is not associated with any company"
-            )
-        company_id = current_user.company_id
+    company_id = resolve_company_id(project_data.company_id, current_user, db)
     
     # Calculate room area using helper function
     room_area = calculate_room_area(project_data.room_length, project_data.room_width)
@@ -216,20 +623,50 @@ async def create_project(
     db.commit()
     db.refresh(project)
     
-    return project
+    publish_project_event("project.created", project)
+    
+    return project_response(project, current_user, status.HTTP_201_CREATED)
 
 
 @router.get("/{project_id}", response_model=ProjectResponse)
 async def get_project(
     project_id: int,
+    request: Request,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    fields: Optional[str] = Query(None, description="Comma-separated response fields")
 ):
     """
     Get a specific project by ID.
     Users can only access projects in their company (unless admin).
+    Use `fields` to return only selected columns.
+    
+    Responses carry an ETag derived from the project's version; a matching
+    If-None-Match returns 304 without loading the full row.
+    
+    Archived projects are returned too (read-only).
     """
-    project = db.query(Project).filter(Project.id == project_id).first()
+    selected = parse_fields(fields, PROJECT_RESPONSE_FIELDS, current_user.role, PROJECT_FIELD_PERMISSIONS)
+    
+    if request.headers.get("if-none-match"):
+        # Conditional request: check the ETag before loading the full row
+        header = get_project_row(db, project_id, ("company_id", "version"))
+        
+        if not header:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Project not found"
+            )
+        
+        verify_project_access(header, current_user)
+        
+        etag = project_etag(project_id, header.version, selected)
+        if etag_matches(request, etag):
+            return not_modified(etag)
+    
+    # company_id and version are always loaded for the access check and ETag
+    extra = tuple(name for name in ("company_id", "version") if name not in selected)
+    project = get_project_row(db, project_id, selected + extra)
     
     if not project:
         raise HTTPException(
@@ -240,7 +677,8 @@ async def get_project(
     # Check access rights using helper function
     verify_project_access(project, current_user)
     
-    return project
+    etag = project_etag(project_id, project.version, selected)
+    return FastJSONResponse(dict(zip(selected, project)), headers=cache_headers(etag))
 
 
 @router.put("/{project_id}", response_model=ProjectResponse)
@@ -275,6 +713,8 @@ async def update_project(
         project.status != ProjectStatus.COMPLETED
     )
     
+    previous_status = project.status
+    
     for field, value in update_data.items():
         setattr(project, field, value)
     
@@ -287,10 +727,119 @@ async def update_project(
         project.completed_at = datetime.utcnow()
     
     project.updated_at = datetime.utcnow()
-    db.commit()
+    try:
+        db.commit()
+    except StaleDataError:
+        # The version check failed: someone else updated the project meanwhile
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Project was modified concurrently, please retry"
+        )
     db.refresh(project)
     
-    return project
+    publish_project_event("project.updated", project, changed=sorted(update_data))
+    if project.status != previous_status:
+        publish_project_event("project.status_changed", project, previous_status=previous_status)
+    
+    return project_response(project, current_user)
+
+
+@router.patch("/{project_id}", response_model=ProjectResponse)
+async def patch_project(
+    project_id: int,
+    project_data: ProjectPatch,
+    request: Request,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Partially update a project with optimistic locking.
+    
+    The expected version comes from If-Match (the ETag of a previous GET)
+    or `version` in the body. The change is a single
+    UPDATE ... WHERE id = ? AND version = ? RETURNING that writes only the
+    supplied columns (plus room_area, completed_at, updated_at and version),
+    instead of loading the project, updating it and reloading it.
+    Status changes also read the current status first, for the
+    status_changed event.
+    
+    Returns 422 if name, client_name, status or wastage_percentage is
+    given as null, and 412 with the current ETag if the project changed
+    since the client read it. Like GET, the response leaves out fields the user's
+    role may not read.
+    """
+    reject_nulls(project_data, ("name", "client_name", "status", "wastage_percentage"))
+    expected_version = expected_project_version(request, project_data.version)
+    selected = readable_fields(PROJECT_RESPONSE_FIELDS, current_user.role, PROJECT_FIELD_PERMISSIONS)
+    
+    update_data = project_data.model_dump(exclude_unset=True, exclude={"version"})
+    if not update_data:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="No changes given"
+        )
+    
+    conditions = [Project.id == project_id, Project.version == expected_version]
+    if current_user.role != UserRole.ADMIN:
+        conditions.append(Project.company_id == current_user.company_id)
+    
+    now = datetime.utcnow()
+    values = dict(update_data)
+    
+    # Recalculate room area from the new and stored dimensions
+    if "room_length" in values or "room_width" in values:
+        if "room_length" in values and "room_width" in values:
+            values["room_area"] = calculate_room_area(values["room_length"], values["room_width"])
+        else:
+            supplied, stored = (
+                (values["room_length"], Project.room_width) if "room_length" in values
+                else (values["room_width"], Project.room_length)
+            )
+            values["room_area"] = (
+                case((stored > 0, stored * supplied), else_=None) if supplied else None
+            )
+    
+    previous_status = None
+    if update_data.get("status") is not None:
+        previous_status = db.query(Project.status).filter(*conditions).scalar()
+        if update_data["status"] == ProjectStatus.COMPLETED and previous_status != ProjectStatus.COMPLETED:
+            values["completed_at"] = now
+    
+    values["updated_at"] = now
+    values["version"] = Project.version + 1
+    
+    project = db.execute(
+        update(Project)
+        .where(*conditions)
+        .values(**values)
+        .returning(*response_columns(Project, PROJECT_RESPONSE_FIELDS))
+        .execution_options(synchronize_session=False)
+    ).first()
+    db.commit()
+    
+    if project is None:
+        # Explain why nothing was updated
+        current = db.query(Project.company_id, Project.version).filter(Project.id == project_id).first()
+        if not current:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Project not found"
+            )
+        verify_project_access(current, current_user)
+        raise HTTPException(
+            status_code=status.HTTP_412_PRECONDITION_FAILED,
+            detail=f"Project has been modified (current version {current.version})",
+            headers={"ETag": project_etag(project_id, current.version, selected)}
+        )
+    
+    publish_project_event("project.updated", project, changed=sorted(update_data))
+    if previous_status is not None and project.status != previous_status:
+        publish_project_event("project.status_changed", project, previous_status=previous_status)
+    
+    etag = project_etag(project_id, project.version, selected)
+    row = project._mapping
+    return FastJSONResponse({name: row[name] for name in selected}, headers=cache_headers(etag))
 
 
 @router.delete("/{project_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -314,5 +863,8 @@ async def delete_project(
     # Check access rights using helper function
     verify_project_access(project, current_user)
     
+    company_id = project.company_id
     db.delete(project)
     db.commit()
+    
+    event_bus.publish(company_id, "project.deleted", {"id": project_id})
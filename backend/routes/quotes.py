@@ -0,0 +1,335 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import HTMLResponse
+from sqlalchemy.orm import Session
+from pydantic import BaseModel, Field
+from typing import List, Optional
+from datetime import datetime
+
+from database import get_db
+from models.company import Company
+from models.project import Project
+from models.quote import Quote, QuoteStatus
+from models.user import User, UserRole
+from middleware.auth import get_current_user
+from routes.projects import resolve_company_id, verify_project_access
+from services.billing import document_totals, money, price_project, revised_totals
+from services.documents import document_context, render_pool
+from services.events import event_bus
+from services.numbering import number_allocator
+from services.serialization import FastJSONResponse, parse_fields, reject_nulls, response_columns, rows_to_dicts
+
+router = APIRouter(prefix="/quotes", tags=["Quotes"])
+
+# Status -> statuses an update may move a quote to; accepted, rejected and
+# expired quotes are final
+QUOTE_STATUS_TRANSITIONS = {
+    QuoteStatus.DRAFT: {QuoteStatus.SENT, QuoteStatus.ACCEPTED, QuoteStatus.REJECTED},
+    QuoteStatus.SENT: {QuoteStatus.ACCEPTED, QuoteStatus.REJECTED, QuoteStatus.EXPIRED},
+    QuoteStatus.ACCEPTED: set(),
+    QuoteStatus.REJECTED: set(),
+    QuoteStatus.EXPIRED: set(),
+}
+
+
+# Pydantic models for request/response
+class QuoteCreate(BaseModel):
+    project_id: Optional[int] = Field(None, description="Project to quote; client details and price default from it")
+    client_name: Optional[str] = Field(None, min_length=1, max_length=255)
+    client_email: Optional[str] = None
+    client_phone: Optional[str] = None
+    client_address: Optional[str] = None
+    amount: Optional[float] = Field(None, ge=0, description="Net amount (priced from the project if omitted)")
+    tax_rate: float = Field(0.0, ge=0, le=100, description="Tax percentage")
+    discount_amount: float = Field(0.0, ge=0)
+    valid_until: Optional[datetime] = None
+    notes: Optional[str] = None
+    terms_and_conditions: Optional[str] = None
+    company_id: Optional[int] = Field(None, description="Company ID (required for admin users without a project)")
+
+
+class QuoteUpdate(BaseModel):
+    client_name: Optional[str] = Field(None, min_length=1, max_length=255)
+    client_email: Optional[str] = None
+    client_phone: Optional[str] = None
+    client_address: Optional[str] = None
+    amount: Optional[float] = Field(None, ge=0, description="Net amount")
+    tax_rate: Optional[float] = Field(None, ge=0, le=100, description="Tax percentage (default: the quote's current rate)")
+    discount_amount: Optional[float] = Field(None, ge=0)
+    status: Optional[QuoteStatus] = None
+    valid_until: Optional[datetime] = None
+    notes: Optional[str] = None
+    terms_and_conditions: Optional[str] = None
+
+
+class QuoteResponse(BaseModel):
+    id: int
+    company_id: int
+    project_id: Optional[int]
+    quote_number: str
+    client_name: str
+    client_email: str
+    client_phone: Optional[str]
+    client_address: Optional[str]
+    total_amount: float
+    tax_amount: Optional[float]
+    discount_amount: Optional[float]
+    status: QuoteStatus
+    valid_until: Optional[datetime]
+    notes: Optional[str]
+    terms_and_conditions: Optional[str]
+    created_at: datetime
+    sent_at: Optional[datetime]
+    accepted_at: Optional[datetime]
+
+    class Config:
+        from_attributes = True
+
+
+QUOTE_RESPONSE_FIELDS = tuple(QuoteResponse.model_fields)
+
+
+def get_accessible_quote(db: Session, quote_id: int, current_user: User) -> Quote:
+    """
+    Load a quote the current user may access.
+
+    Args:
+        db: Database session
+        quote_id: Quote ID
+        current_user: The current authenticated user
+
+    Returns:
+        Quote: The quote
+
+    Raises:
+        HTTPException: If the quote doesn't exist or belongs to another company
+    """
+    quote = db.query(Quote).filter(Quote.id == quote_id).first()
+
+    if not quote:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Quote not found"
+        )
+
+    verify_project_access(quote, current_user)
+    return quote
+
+
+def publish_quote_event(event_type: str, quote: Quote) -> None:
+    """
+    Publish a quote change to the company's event feed.
+
+    Args:
+        event_type: Event type, e.g. "quote.created"
+        quote: The committed quote
+    """
+    event_bus.publish(quote.company_id, event_type, {
+        "id": quote.id,
+        "quote_number": quote.quote_number,
+        "project_id": quote.project_id,
+        "status": quote.status,
+        "total_amount": quote.total_amount,
+    })
+
+
+@router.get("/", response_model=List[QuoteResponse])
+async def list_quotes(
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+    skip: int = 0,
+    limit: int = Query(50, ge=1, le=500),
+    quote_status: Optional[QuoteStatus] = Query(None, alias="status"),
+    project_id: Optional[int] = None,
+    fields: Optional[str] = Query(None, description="Comma-separated response fields")
+):
+    """
+    List quotes, newest first.
+    Admins see all quotes, company users only see their company's quotes.
+    """
+    selected = parse_fields(fields, QUOTE_RESPONSE_FIELDS)
+    query = db.query(*response_columns(Quote, selected))
+
+    if current_user.role != UserRole.ADMIN:
+        if current_user.company_id is None:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="User is not associated with any company"
+            )
+        query = query.filter(Quote.company_id == current_user.company_id)
+
+    if quote_status:
+        query = query.filter(Quote.status == quote_status)
+    if project_id is not None:
+        query = query.filter(Quote.project_id == project_id)
+
+    rows = query.order_by(Quote.created_at.desc()).offset(skip).limit(limit).all()
+    return FastJSONResponse(rows_to_dicts(rows, selected))
+
+
+@router.post("/", response_model=QuoteResponse, status_code=status.HTTP_201_CREATED)
+async def create_quote(
+    quote_data: QuoteCreate,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Create a quote with the next quote number of the company.
+    With a project_id, client details default to the project's and the
+    amount is priced from its dimensions with TilingCalculator.
+    """
+    values = quote_data.model_dump(exclude={"project_id", "amount", "tax_rate", "discount_amount", "company_id"})
+    amount = money(quote_data.amount) if quote_data.amount is not None else None
+
+    if quote_data.project_id is not None:
+        project = db.query(Project).filter(Project.id == quote_data.project_id).first()
+        if not project:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Project not found"
+            )
+        verify_project_access(project, current_user)
+        company_id = project.company_id
+
+        for field in ("client_name", "client_email", "client_phone", "client_address"):
+            if values[field] is None:
+                values[field] = getattr(project, field)
+        if amount is None:
+            price = price_project(project)
+            if price is None:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Project lacks the dimensions or tile price needed to price it; give an amount"
+                )
+            amount = price["amount"]
+            values["notes"] = values["notes"] or price["description"]
+    else:
+        company_id = resolve_company_id(quote_data.company_id, current_user, db)
+
+    if not values["client_name"] or not values["client_email"] or amount is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="client_name, client_email and amount are required"
+        )
+
+    tax_amount, discount_amount, total_amount = document_totals(amount, quote_data.tax_rate, quote_data.discount_amount)
+    if values["valid_until"] is None:
+        del values["valid_until"]
+
+    quote = Quote(
+        company_id=company_id,
+        project_id=quote_data.project_id,
+        quote_number=number_allocator.next_number(company_id, "quote"),
+        tax_amount=tax_amount,
+        discount_amount=discount_amount,
+        total_amount=total_amount,
+        **values
+    )
+    db.add(quote)
+    db.commit()
+    db.refresh(quote)
+
+    publish_quote_event("quote.created", quote)
+
+    return quote
+
+
+@router.get("/{quote_id}", response_model=QuoteResponse)
+async def get_quote(
+    quote_id: int,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Get a specific quote by ID.
+    """
+    return get_accessible_quote(db, quote_id, current_user)
+
+
+@router.put("/{quote_id}", response_model=QuoteResponse)
+async def update_quote(
+    quote_id: int,
+    quote_data: QuoteUpdate,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Update a quote.
+    Tax and the total are recomputed when the amount, tax rate or discount
+    changes. The status may only move along QUOTE_STATUS_TRANSITIONS.
+    Moving it to SENT or ACCEPTED records when that happened.
+    """
+    reject_nulls(quote_data, ("client_name", "client_email", "amount", "discount_amount", "status"))
+    quote = get_accessible_quote(db, quote_id, current_user)
+    changes = quote_data.model_dump(exclude_unset=True, exclude={"amount", "tax_rate", "discount_amount"})
+
+    # Rows stored before statuses were checked may lack one; treat them as drafts
+    current_status = quote.status or QuoteStatus.DRAFT
+    new_status = changes.get("status")
+    if new_status is not None and new_status != current_status \
+            and new_status not in QUOTE_STATUS_TRANSITIONS[current_status]:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Cannot move a {current_status.value} quote to {new_status.value}"
+        )
+
+    if quote_data.model_fields_set & {"amount", "tax_rate", "discount_amount"}:
+        # Quotes store no net amount; it is the total before tax and discount
+        net = money(quote.total_amount) - money(quote.tax_amount) + money(quote.discount_amount)
+        _, quote.tax_amount, quote.discount_amount, quote.total_amount = revised_totals(
+            net, quote.tax_amount, quote.discount_amount,
+            quote_data.amount, quote_data.tax_rate, quote_data.discount_amount
+        )
+
+    for field, value in changes.items():
+        setattr(quote, field, value)
+
+    if quote.status == QuoteStatus.SENT and quote.sent_at is None:
+        quote.sent_at = datetime.utcnow()
+    if quote.status == QuoteStatus.ACCEPTED and quote.accepted_at is None:
+        quote.accepted_at = datetime.utcnow()
+
+    db.commit()
+    db.refresh(quote)
+
+    publish_quote_event("quote.updated", quote)
+
+    return quote
+
+
+@router.delete("/{quote_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_quote(
+    quote_id: int,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Delete a quote.
+    """
+    quote = get_accessible_quote(db, quote_id, current_user)
+
+    company_id = quote.company_id
+    db.delete(quote)
+    db.commit()
+
+    event_bus.publish(company_id, "quote.deleted", {"id": quote_id})
+
+    return None
+
+
+@router.get("/{quote_id}/document", response_class=HTMLResponse)
+async def get_quote_document(
+    quote_id: int,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Render a quote as an HTML document with the company's branding.
+    """
+    quote = get_accessible_quote(db, quote_id, current_user)
+    company = db.query(Company).filter(Company.id == quote.company_id).first()
+    context = document_context(quote, company)
+
+    # Return the connection to the pool while the document renders
+    db.close()
+
+    return HTMLResponse(await render_pool.render("quote", context))
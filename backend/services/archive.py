@@ -0,0 +1,157 @@
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Optional, Sequence
+
+from sqlalchemy import delete, insert, literal, select, union_all
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import Select
+
+from config import settings
+from database import engine
+from models.archive import invoices_archive, projects_archive, quotes_archive
+from models.invoice import Invoice, InvoiceStatus
+from models.project import Project, ProjectStatus
+from models.quote import Quote, QuoteStatus
+from services.serialization import response_columns
+
+# Projects in these statuses are archived once untouched for ARCHIVE_AFTER_DAYS
+ARCHIVED_STATUSES = (ProjectStatus.COMPLETED, ProjectStatus.CANCELLED)
+
+# Invoices in these statuses no longer hold a project back from archival
+CLOSED_INVOICE_STATUSES = (InvoiceStatus.PAID, InvoiceStatus.CANCELLED)
+
+
+def archive_batch(cutoff: datetime, batch_size: int) -> int:
+    """
+    Move one batch of closed projects, with their quotes and invoices,
+    into the archive tables in a single transaction. Projects with an
+    invoice that is not paid or cancelled, or with a sent quote, are kept
+    live until those are settled.
+
+    Args:
+        cutoff: Archive projects last updated before this time
+        batch_size: Maximum number of projects to move
+
+    Returns:
+        int: Number of projects archived (0 when nothing is left)
+    """
+    # Open invoices and sent quotes must stay live to be paid, swept and counted
+    open_invoices = select(Invoice.id).where(
+        Invoice.project_id == Project.id, Invoice.status.not_in(CLOSED_INVOICE_STATUSES)
+    )
+    open_quotes = select(Quote.id).where(Quote.project_id == Project.id, Quote.status == QuoteStatus.SENT)
+    candidates = (
+        select(Project.id)
+        .where(
+            Project.status.in_(ARCHIVED_STATUSES),
+            Project.updated_at < cutoff,
+            ~open_invoices.exists(),
+            ~open_quotes.exists(),
+        )
+        .order_by(Project.updated_at)
+        .limit(batch_size)
+    )
+    if engine.dialect.name == "postgresql":
+        # Skip projects being edited; they are picked up by a later run
+        candidates = candidates.with_for_update(skip_locked=True)
+
+    now = datetime.utcnow()
+    with engine.begin() as conn:
+        ids = conn.execute(candidates).scalars().all()
+        if not ids:
+            return 0
+
+        for source, archive, key in (
+            (Project.__table__, projects_archive, Project.id),
+            (Quote.__table__, quotes_archive, Quote.project_id),
+            (Invoice.__table__, invoices_archive, Invoice.project_id),
+        ):
+            conn.execute(insert(archive).from_select(
+                [column.name for column in source.columns] + ["archived_at"],
+                select(*source.columns, literal(now)).where(key.in_(ids))
+            ))
+
+        # Core DELETE bypasses revenue tracking; the rollup keeps counting
+        # archived invoices, so it needs no change
+        conn.execute(delete(Invoice).where(Invoice.project_id.in_(ids)))
+        conn.execute(delete(Quote).where(Quote.project_id.in_(ids)))
+        conn.execute(delete(Project).where(Project.id.in_(ids)))
+    return len(ids)
+
+
+def archive_projects(
+    older_than_days: Optional[int] = None,
+    batch_size: Optional[int] = None,
+    progress: Optional[Callable[[int], None]] = None
+) -> int:
+    """
+    Archive every project closed for longer than the given age, in batches.
+
+    Args:
+        older_than_days: Minimum days since the last update (default ARCHIVE_AFTER_DAYS)
+        batch_size: Projects per transaction (default ARCHIVE_BATCH_SIZE)
+        progress: Called with the number of projects archived after each batch
+
+    Returns:
+        int: Number of projects archived
+    """
+    days = settings.ARCHIVE_AFTER_DAYS if older_than_days is None else older_than_days
+    cutoff = datetime.utcnow() - timedelta(days=days)
+    batch_size = batch_size or settings.ARCHIVE_BATCH_SIZE
+
+    archived = 0
+    while True:
+        count = archive_batch(cutoff, batch_size)
+        if not count:
+            return archived
+        archived += count
+        if progress is not None:
+            progress(archived)
+
+
+def get_project_row(db: Session, project_id: int, fields: Sequence[str]) -> Optional[Any]:
+    """
+    Load selected columns of a project, reading through to the archive
+    if it is no longer live.
+
+    Args:
+        db: Database session
+        project_id: Project ID
+        fields: Column names to load
+
+    Returns:
+        The row, or None if the project does not exist
+    """
+    row = db.query(*response_columns(Project, fields)).filter(Project.id == project_id).first()
+    if row is None:
+        row = db.execute(
+            select(*response_columns(projects_archive.c, fields)).where(projects_archive.c.id == project_id)
+        ).first()
+    return row
+
+
+def select_project_list(fields: Sequence[str], filters: Dict[str, Any], include_archived: bool = False) -> Select:
+    """
+    Build a newest-first project listing, optionally including archived projects.
+
+    Args:
+        fields: Column names to select
+        filters: Column name -> required value
+        include_archived: Also list archived projects
+
+    Returns:
+        Select: Statement to paginate with offset/limit
+    """
+    def build(table):
+        return select(*response_columns(table.c, fields)).where(
+            *[table.c[name] == value for name, value in filters.items()]
+        )
+
+    live = Project.__table__
+    if not include_archived:
+        return build(live).order_by(live.c.created_at.desc())
+
+    listing = union_all(
+        build(live).add_columns(live.c.created_at.label("sort_key")),
+        build(projects_archive).add_columns(projects_archive.c.created_at.label("sort_key")),
+    ).subquery()
+    return select(*response_columns(listing.c, fields)).order_by(listing.c.sort_key.desc())
@@ -1,11 +1,17 @@
-from passlib.context import CryptContext
-from jose import JWTError, jwt
 from datetime import datetime, timedelta
+from functools import lru_cache
 from typing import Optional
 from config import settings
 
-# Password hashing context
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+@lru_cache(maxsize=None)
+def get_pwd_context():
+    """
+    Get the password hashing context.
+    passlib (and the bcrypt backend) is imported on first use, not at startup.
+    """
+    from passlib.context import CryptContext
+    return CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 
 class AuthService:
@@ -26,7 +32,7 @@ class AuthService:
         Returns:
             bool: True if password matches, False otherwise
         """
-        return pwd_context.verify(plain_password, hashed_password)
+        return get_pwd_context().verify(plain_password, hashed_password)
 
     @staticmethod
     def get_password_hash(password: str) -> str:
@@ -39,7 +45,7 @@ class AuthService:
         Returns:
             str: The hashed password
         """
-        return pwd_context.hash(password)
+        return get_pwd_context().hash(password)
 
     @staticmethod
     def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
@@ -53,6 +59,8 @@ class AuthService:
         Returns:
             str: Encoded JWT token
         """
+        from jose import jwt
+
         to_encode = data.copy()
         
         if expires_delta:
@@ -76,6 +84,8 @@ class AuthService:
         Returns:
             dict: Decoded token payload if valid, None otherwise
         """
+        from jose import JWTError, jwt
+
         try:
             payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
             return payload
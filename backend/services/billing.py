@@ -0,0 +1,230 @@
+from collections import defaultdict
+from datetime import datetime, timedelta
+from decimal import ROUND_HALF_UP, Decimal
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from config import settings
+from models.invoice import Invoice, InvoiceStatus
+from models.project import Project
+from models.user import User, UserRole
+from services.calculator import TilingCalculator
+from services.numbering import number_allocator
+
+CENTS = Decimal("0.01")
+
+# Wastage assumed for projects that have none stored (as in TilingCalculator)
+DEFAULT_WASTAGE_PERCENTAGE = Decimal("10")
+
+# Project columns needed to price and invoice a project
+PRICING_COLUMNS = (
+    "id", "company_id", "name", "client_name", "client_email", "client_phone", "client_address",
+    "room_length", "room_width", "tile_length", "tile_width", "tile_price_per_unit", "wastage_percentage",
+)
+
+
+def money(value: Any) -> Decimal:
+    """
+    Round a value to cents.
+
+    Args:
+        value: Number to round
+
+    Returns:
+        Decimal: The rounded amount
+    """
+    return Decimal(str(value or 0)).quantize(CENTS, rounding=ROUND_HALF_UP)
+
+
+def price_project(project: Any) -> Optional[Dict[str, Any]]:
+    """
+    Price a project's tiling work with TilingCalculator.
+
+    Args:
+        project: Project (or row) with room and tile dimensions and tile price
+
+    Returns:
+        Amount and a one-line description, or None if the project lacks
+        the dimensions or tile price needed to price it
+    """
+    required = (project.room_length, project.room_width, project.tile_length, project.tile_width)
+    if not all(required) or project.tile_price_per_unit is None:
+        return None
+
+    wastage = project.wastage_percentage if project.wastage_percentage is not None else DEFAULT_WASTAGE_PERCENTAGE
+    # Numeric columns load as Decimal but unflushed values may be floats;
+    # the calculator needs one type throughout
+    room_length, room_width, tile_length, tile_width, price, wastage = (
+        Decimal(str(value)) for value in (*required, project.tile_price_per_unit, wastage)
+    )
+    calculation = TilingCalculator.calculate_project(
+        room_length=room_length,
+        room_width=room_width,
+        tile_length=tile_length,
+        tile_width=tile_width,
+        price_per_tile=price,
+        wastage_percentage=wastage,
+    )
+    quantities = calculation["quantities"]
+    return {
+        "amount": money(calculation["costs"]["total_cost"]),
+        "description": (
+            f"{project.name}: {quantities['total_tiles_needed']} tiles for "
+            f"{quantities['room_area']} sq. units ({float(wastage):g}% wastage)"
+        ),
+    }
+
+
+def document_totals(amount: Decimal, tax_rate: float = 0.0, discount: Any = 0) -> Tuple[Decimal, Decimal, Decimal]:
+    """
+    Work out tax and the total for a quote or invoice.
+
+    Args:
+        amount: Net amount
+        tax_rate: Tax percentage
+        discount: Discount amount
+
+    Returns:
+        (tax amount, discount amount, total amount)
+    """
+    tax_amount = money(amount * Decimal(str(tax_rate)) / 100)
+    discount_amount = money(discount)
+    return tax_amount, discount_amount, money(amount + tax_amount - discount_amount)
+
+
+def revised_totals(
+    amount: Any,
+    tax_amount: Any,
+    discount_amount: Any,
+    new_amount: Optional[float] = None,
+    tax_rate: Optional[float] = None,
+    new_discount: Optional[float] = None
+) -> Tuple[Decimal, Decimal, Decimal, Decimal]:
+    """
+    Recompute a quote's or invoice's totals after an update.
+
+    Values not given keep their current value. The tax rate isn't stored,
+    so without one the rate implied by the current tax is kept.
+
+    Args:
+        amount: Current net amount
+        tax_amount: Current tax amount
+        discount_amount: Current discount amount
+        new_amount: New net amount
+        tax_rate: New tax percentage
+        new_discount: New discount amount
+
+    Returns:
+        (net amount, tax amount, discount amount, total amount)
+    """
+    current = money(amount)
+    if tax_rate is None:
+        tax_rate = float(money(tax_amount) * 100 / current) if current else 0.0
+    net = money(new_amount) if new_amount is not None else current
+    discount = new_discount if new_discount is not None else discount_amount
+    return (net, *document_totals(net, tax_rate, discount))
+
+
+def generate_invoices(
+    db: Session,
+    project_ids: Sequence[int],
+    current_user: User,
+    tax_rate: float = 0.0,
+    due_in_days: int = 30
+) -> List[Dict[str, Any]]:
+    """
+    Create draft invoices for many projects in one transaction.
+
+    Projects are loaded in one query and priced with TilingCalculator, and
+    invoice numbers are allocated per company in one call each. The
+    invoices are inserted in chunks of INVOICE_BATCH_CHUNK_SIZE rows and
+    committed together. Projects that already have an invoice that is not
+    cancelled are skipped, so a batch can safely be re-run; on PostgreSQL
+    the projects are locked while the batch runs, so concurrent batches
+    (a double submit or a retried request) can't invoice a project twice.
+
+    Args:
+        db: Database session
+        project_ids: Projects to invoice
+        current_user: User generating the invoices
+        tax_rate: Tax percentage added to each invoice
+        due_in_days: Days until the invoices are due
+
+    Returns:
+        One result per requested project, in request order, with an outcome
+        of "created", "already_invoiced", "unpriced", "missing_client_email",
+        "not_found" or "forbidden"
+    """
+    unique_ids = list(dict.fromkeys(project_ids))
+    query = db.query(*[getattr(Project, name) for name in PRICING_COLUMNS]).filter(Project.id.in_(unique_ids))
+    if db.get_bind().dialect.name == "postgresql":
+        # Hold the projects until commit, locked in id order so batches
+        # can't deadlock: a concurrent batch for the same projects waits
+        # here and then finds these invoices below
+        query = query.order_by(Project.id).with_for_update()
+    projects = {row.id: row for row in query.all()}
+    invoiced = {
+        project_id
+        for (project_id,) in db.query(Invoice.project_id).filter(
+            Invoice.project_id.in_(unique_ids),
+            Invoice.status != InvoiceStatus.CANCELLED
+        ).distinct()
+    }
+
+    outcomes: Dict[int, Dict[str, Any]] = {}
+    pending: Dict[int, List[Tuple[Any, Dict[str, Any]]]] = defaultdict(list)
+    for project_id in unique_ids:
+        project = projects.get(project_id)
+        if project is None:
+            outcomes[project_id] = {"outcome": "not_found"}
+        elif current_user.role != UserRole.ADMIN and project.company_id != current_user.company_id:
+            outcomes[project_id] = {"outcome": "forbidden"}
+        elif project_id in invoiced:
+            outcomes[project_id] = {"outcome": "already_invoiced"}
+        elif not project.client_email:
+            outcomes[project_id] = {"outcome": "missing_client_email"}
+        else:
+            price = price_project(project)
+            if price is None:
+                outcomes[project_id] = {"outcome": "unpriced"}
+            else:
+                pending[project.company_id].append((project, price))
+
+    now = datetime.utcnow()
+    rows = []
+    for company_id, items in pending.items():
+        numbers = number_allocator.allocate(company_id, "invoice", count=len(items), when=now)
+        for (project, price), number in zip(items, numbers):
+            tax_amount, discount_amount, total_amount = document_totals(price["amount"], tax_rate)
+            rows.append({
+                "company_id": company_id,
+                "project_id": project.id,
+                "invoice_number": number,
+                "client_name": project.client_name,
+                "client_email": project.client_email,
+                "client_phone": project.client_phone,
+                "client_address": project.client_address,
+                "amount": price["amount"],
+                "tax_amount": tax_amount,
+                "discount_amount": discount_amount,
+                "total_amount": total_amount,
+                "status": InvoiceStatus.DRAFT,
+                "due_date": now + timedelta(days=due_in_days),
+                "notes": price["description"],
+                "created_at": now,
+            })
+
+    chunk_size = settings.INVOICE_BATCH_CHUNK_SIZE
+    for start in range(0, len(rows), chunk_size):
+        chunk = rows[start:start + chunk_size]
+        created = db.execute(
+            insert(Invoice).returning(Invoice.id, Invoice.project_id, Invoice.invoice_number),
+            chunk
+        ).all()
+        for invoice_id, project_id, number in created:
+            outcomes[project_id] = {"outcome": "created", "invoice_id": invoice_id, "invoice_number": number}
+    db.commit()
+
+    return [{"project_id": project_id, **outcomes[project_id]} for project_id in project_ids]
@@ -0,0 +1,100 @@
+from datetime import datetime
+from typing import Callable, Optional, Union
+
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+
+from config import settings
+from database import engine
+from models.archive import invoices_archive, projects_archive, quotes_archive
+from models.company import Company
+from models.invoice import Invoice
+from models.project import Project
+from models.quote import Quote
+from models.user import User
+
+# Children deleted in batches before the company row itself; the order
+# avoids cascading from one batch into another table
+PURGE_ORDER = (
+    invoices_archive, quotes_archive, projects_archive,
+    Invoice.__table__, Quote.__table__, Project.__table__, User.__table__,
+)
+
+
+def company_row_count(db: Union[Session, Connection], company_id: int) -> int:
+    """
+    Count the rows that deleting a company removes, in one query.
+
+    Args:
+        db: Database session or connection
+        company_id: Company ID
+
+    Returns:
+        int: Number of child rows
+    """
+    counts = db.execute(select(*[
+        select(func.count()).select_from(table).where(table.c.company_id == company_id).scalar_subquery()
+        for table in PURGE_ORDER
+    ])).one()
+    return sum(counts)
+
+
+def soft_delete_company(db: Session, company: Company) -> None:
+    """
+    Hide a company and lock its users out until it is purged.
+
+    Args:
+        db: Database session
+        company: Company to delete
+    """
+    company.deleted_at = datetime.utcnow()
+    db.execute(
+        update(User)
+        .where(User.company_id == company.id)
+        .values(is_active=False)
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+
+
+def purge_company(
+    company_id: int,
+    batch_size: Optional[int] = None,
+    progress: Optional[Callable[[int, int], None]] = None
+) -> int:
+    """
+    Delete a company's data in bounded batches, then the company itself.
+
+    Each batch is its own short transaction, so a large tenant never holds
+    locks for long and nothing is loaded into memory. Safe to re-run after
+    an interruption.
+
+    Args:
+        company_id: Company ID
+        batch_size: Rows per transaction (default COMPANY_PURGE_BATCH_SIZE)
+        progress: Called with (rows deleted, total rows) after each batch
+
+    Returns:
+        int: Number of rows deleted, including the company
+    """
+    batch_size = batch_size or settings.COMPANY_PURGE_BATCH_SIZE
+    with engine.connect() as conn:
+        total = company_row_count(conn, company_id)
+
+    deleted = 0
+    for table in PURGE_ORDER:
+        batch = select(table.c.id).where(table.c.company_id == company_id).limit(batch_size)
+        while True:
+            with engine.begin() as conn:
+                count = conn.execute(delete(table).where(table.c.id.in_(batch))).rowcount
+            if not count:
+                break
+            deleted += count
+            if progress is not None:
+                progress(deleted, total)
+
+    # Remaining children (e.g. jobs) go with the company through ON DELETE CASCADE
+    with engine.begin() as conn:
+        deleted += conn.execute(delete(Company).where(Company.id == company_id)).rowcount
+    return deleted
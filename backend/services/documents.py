@@ -0,0 +1,156 @@
+import asyncio
+import html
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from decimal import Decimal
+from enum import Enum
+from functools import lru_cache
+from string import Template
+from typing import Any, Dict, Optional
+
+from fastapi.concurrency import run_in_threadpool
+
+from config import settings
+
+TEMPLATE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "templates")
+
+DOCUMENT_KINDS = ("quote", "invoice")
+
+
+@lru_cache(maxsize=32)
+def _load_template(path: str, modified: int) -> Template:
+    with open(path, encoding="utf-8") as template_file:
+        return Template(template_file.read())
+
+
+def get_template(kind: str) -> Template:
+    """
+    Get the parsed HTML template for a document kind.
+    Templates are cached per process and re-read when the file changes.
+
+    Args:
+        kind: "quote" or "invoice"
+
+    Returns:
+        Template: The parsed template
+    """
+    path = os.path.join(TEMPLATE_DIR, f"{kind}.html")
+    return _load_template(path, os.stat(path).st_mtime_ns)
+
+
+def _display(value: Any) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, datetime):
+        return value.strftime("%Y-%m-%d")
+    if isinstance(value, Decimal):
+        return f"{value:,.2f}"
+    if isinstance(value, Enum):
+        return str(value.value).replace("_", " ").title()
+    return str(value)
+
+
+def document_context(document: Any, company: Any, description: Optional[str] = None) -> Dict[str, str]:
+    """
+    Collect the display values of a quote or invoice for its template.
+    The result only holds strings, so it can be sent to a render process.
+
+    Args:
+        document: Quote or Invoice
+        company: Company (or row) the document belongs to
+        description: Line description (defaults to the document's notes)
+
+    Returns:
+        Template field -> display value
+    """
+    fields = (
+        "status", "created_at", "client_name", "client_email", "client_phone", "client_address",
+        "tax_amount", "discount_amount", "total_amount",
+        "due_date", "valid_until", "terms_and_conditions",
+    )
+    context = {name: _display(getattr(document, name, None)) for name in fields}
+    number = getattr(document, "invoice_number", None) or getattr(document, "quote_number", None)
+    amount = getattr(document, "amount", None)
+    if amount is None:
+        # Quotes only store the total
+        amount = (document.total_amount or 0) - (document.tax_amount or 0) + (document.discount_amount or 0)
+    paid_date = getattr(document, "paid_date", None)
+    context.update({
+        "number": number,
+        "amount": _display(Decimal(amount)),
+        "description": description or document.notes or "Tiling work",
+        "paid": f"Paid: {_display(paid_date)}" if paid_date else "",
+        "company_name": company.name,
+        "company_email": company.email,
+        "company_phone": company.phone or "",
+        "company_address": company.address or "",
+        "primary_color": company.primary_color or "#3B82F6",
+        "secondary_color": company.secondary_color or "#10B981",
+    })
+    return context
+
+
+def render_document(kind: str, context: Dict[str, str]) -> str:
+    """
+    Render a document to HTML. Values are HTML-escaped.
+
+    Args:
+        kind: "quote" or "invoice"
+        context: Values from document_context()
+
+    Returns:
+        str: The HTML document
+    """
+    values = {name: html.escape(str(value)) for name, value in context.items()}
+    return get_template(kind).safe_substitute(values)
+
+
+class RenderPool:
+    """
+    Process pool for rendering documents off the event loop and the GIL.
+    Each process keeps its own template cache. Started on first use;
+    with RENDER_PROCESSES = 0 documents are rendered in the thread pool.
+    """
+
+    def __init__(self, processes: int):
+        self.processes = processes
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                # spawn: the API process runs threads, which fork does not copy safely
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.processes, mp_context=multiprocessing.get_context("spawn")
+                )
+            return self._executor
+
+    async def render(self, kind: str, context: Dict[str, str]) -> str:
+        """
+        Render a document in a worker process.
+
+        Args:
+            kind: "quote" or "invoice"
+            context: Values from document_context()
+
+        Returns:
+            str: The HTML document
+        """
+        if self.processes <= 0:
+            return await run_in_threadpool(render_document, kind, context)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._get_executor(), render_document, kind, context)
+
+    def shutdown(self) -> None:
+        """Stop the worker processes."""
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+
+render_pool = RenderPool(processes=settings.RENDER_PROCESSES)
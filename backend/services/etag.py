@@ -0,0 +1,70 @@
+import hashlib
+from typing import Any, Dict, Optional
+
+from fastapi import Request, Response, status
+
+
+def make_etag(*parts: Any) -> str:
+    """
+    Build a strong ETag from the values that determine a representation.
+
+    Args:
+        parts: Values such as resource id, updated_at and selected fields
+
+    Returns:
+        Quoted ETag value
+    """
+    digest = hashlib.blake2b("|".join(str(part) for part in parts).encode("utf-8"), digest_size=12)
+    return f'"{digest.hexdigest()}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """
+    Check whether the request's If-None-Match header matches an ETag.
+
+    Args:
+        request: The incoming request
+        etag: Current ETag of the resource
+
+    Returns:
+        bool: True if the client already has this representation
+    """
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    # If-None-Match uses weak comparison, so W/ prefixes are ignored
+    candidates = {value.strip().removeprefix("W/") for value in header.split(",")}
+    return etag in candidates
+
+
+def cache_headers(etag: str, cache_control: Optional[str] = None) -> Dict[str, str]:
+    """
+    Build the caching headers sent with a representation.
+
+    Args:
+        etag: ETag of the representation
+        cache_control: Cache-Control value (defaults to private revalidation)
+
+    Returns:
+        Header dictionary
+    """
+    return {
+        "ETag": etag,
+        "Cache-Control": cache_control or "private, no-cache",
+    }
+
+
+def not_modified(etag: str, cache_control: Optional[str] = None) -> Response:
+    """
+    Build a 304 Not Modified response.
+
+    Args:
+        etag: ETag of the unchanged representation
+        cache_control: Cache-Control value (defaults to private revalidation)
+
+    Returns:
+        Empty 304 response carrying the caching headers
+    """
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=cache_headers(etag, cache_control))
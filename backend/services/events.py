@@ -0,0 +1,308 @@
+import asyncio
+import bisect
+import json
+from collections import defaultdict, deque
+from datetime import date, datetime
+from decimal import Decimal
+from enum import Enum
+from typing import Any, AsyncIterator, Deque, Dict, List, Optional, Set
+
+from sqlalchemy import insert, update
+from sqlalchemy.exc import IntegrityError
+
+from config import settings
+from database import engine
+from models.event_sequence import EventSequence, event_id_sequence
+from services.invalidation import invalidation_bus
+
+# Namespace used to forward events to the other workers
+EVENTS_NAMESPACE = "company_events"
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, Enum):
+        return value.value
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+class Event:
+    """
+    A change event for one company, formatted once for all subscribers.
+    """
+    __slots__ = ("id", "company_id", "type", "data", "message")
+
+    def __init__(self, id: int, company_id: int, type: str, data: str):
+        self.id = id
+        self.company_id = company_id
+        self.type = type
+        self.data = data
+        self.message = f"id: {id}\nevent: {type}\ndata: {data}\n\n".encode("utf-8")
+
+
+class Subscription:
+    """
+    One connected client: a bounded queue of events for its company.
+
+    A client that falls more than EVENT_QUEUE_SIZE events behind is
+    disconnected; it reconnects with Last-Event-ID and catches up from the
+    replay buffer instead of growing memory without bound.
+    """
+
+    def __init__(self, company_id: int, max_size: int):
+        self.company_id = company_id
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max_size)
+        self.overflowed = False
+
+    def offer(self, event: Event) -> None:
+        if self.overflowed:
+            return
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.overflowed = True
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(None)
+
+
+class EventBus:
+    """
+    In-process publish/subscribe bus for per-company change events.
+
+    The last EVENT_BUFFER_SIZE events of each company are kept so clients
+    can resume from a Last-Event-ID. Events are also forwarded to the other
+    workers over the invalidation bus. Event ids come from one database
+    sequence shared by all workers, so they are unique and increasing no
+    matter which worker published them; buffers are kept in id order even
+    when forwarded events arrive out of order.
+    """
+
+    def __init__(self, buffer_size: int, queue_size: int):
+        self.buffer_size = buffer_size
+        self.queue_size = queue_size
+        self._buffers: Dict[int, Deque[Event]] = defaultdict(lambda: deque(maxlen=self.buffer_size))
+        self._subscriptions: Dict[int, Set[Subscription]] = defaultdict(set)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _next_id(self) -> int:
+        """Take the next event id from the shared database sequence."""
+        if engine.dialect.name == "postgresql":
+            with engine.begin() as conn:
+                return conn.execute(event_id_sequence.next_value()).scalar()
+
+        for _ in range(2):
+            with engine.begin() as conn:
+                value = conn.execute(
+                    update(EventSequence)
+                    .where(EventSequence.id == 1)
+                    .values(last_value=EventSequence.last_value + 1)
+                    .returning(EventSequence.last_value)
+                ).scalar()
+            if value is not None:
+                return value
+            try:
+                with engine.begin() as conn:
+                    conn.execute(insert(EventSequence).values(id=1, last_value=1))
+                return 1
+            except IntegrityError:
+                # Another worker created the counter first
+                continue
+        raise RuntimeError("Could not allocate an event id")
+
+    def publish(self, company_id: int, type: str, data: Dict[str, Any]) -> None:
+        """
+        Publish an event to the company's subscribers in every worker.
+        Call after the change has been committed; safe to call from any
+        thread.
+
+        Args:
+            company_id: Company the event belongs to
+            type: Event type, e.g. "project.updated"
+            data: JSON-serializable payload
+        """
+        event = Event(self._next_id(), company_id, type, json.dumps(data, default=_json_default))
+        self._dispatch(event)
+        forwarded = invalidation_bus.publish(EVENTS_NAMESPACE, json.dumps(
+            {"id": event.id, "company_id": company_id, "type": type, "data": event.data}
+        ), local=False)
+        if not forwarded:
+            # Too large for the bus: under the same id, other workers send
+            # their clients (live or replaying) a reset so they reload
+            invalidation_bus.publish(EVENTS_NAMESPACE, json.dumps(
+                {"id": event.id, "company_id": company_id, "type": "reset", "data": "{}"}
+            ), local=False)
+
+    def publish_chunked(self, company_id: int, type: str, data: Dict[str, Any], key: str) -> None:
+        """
+        Publish a change to many rows as one event per EVENT_CHUNK_SIZE
+        entries of data[key], so each event stays small enough to be
+        forwarded to the other workers.
+
+        Args:
+            company_id: Company the event belongs to
+            type: Event type, e.g. "projects.bulk_updated"
+            data: JSON-serializable payload
+            key: Name of the list in data to split
+        """
+        entries = list(data[key])
+        size = settings.EVENT_CHUNK_SIZE
+        for start in range(0, len(entries), size):
+            self.publish(company_id, type, {**data, key: entries[start:start + size]})
+
+    def _receive(self, payload: str) -> None:
+        """Deliver an event forwarded by another worker (called from the bus thread)."""
+        message = json.loads(payload)
+        event = Event(message["id"], message["company_id"], message["type"], message["data"])
+        self._dispatch(event)
+
+    def _dispatch(self, event: Event) -> None:
+        """
+        Deliver an event on the subscribers' event loop. Buffers and
+        subscription queues are only touched from that loop, so calls from
+        other threads (job workers, the lifecycle scheduler, the bus
+        listener) are handed over to it.
+        """
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            # Nobody subscribed yet; keep it for replay
+            self._buffer(event)
+            return
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            self._deliver(event)
+            return
+        try:
+            loop.call_soon_threadsafe(self._deliver, event)
+        except RuntimeError:
+            # The loop closed in the meantime
+            self._buffer(event)
+
+    def _buffer(self, event: Event) -> None:
+        buffer = self._buffers[event.company_id]
+        if not buffer or buffer[-1].id < event.id:
+            buffer.append(event)
+            return
+        # Forwarded out of order: insert in id order
+        ids = [buffered.id for buffered in buffer]
+        position = bisect.bisect_left(ids, event.id)
+        if position < len(ids) and ids[position] == event.id:
+            return
+        if len(buffer) == buffer.maxlen:
+            if position == 0:
+                return
+            buffer.popleft()
+            position -= 1
+        buffer.insert(position, event)
+
+    def _deliver(self, event: Event) -> None:
+        self._buffer(event)
+        for subscription in list(self._subscriptions.get(event.company_id, ())):
+            subscription.offer(event)
+
+    def subscribe(self, company_id: int) -> Subscription:
+        """
+        Start receiving a company's events. Must be called on the event loop.
+
+        Args:
+            company_id: Company to follow
+
+        Returns:
+            The subscription; pass it to unsubscribe() when done
+        """
+        self._loop = asyncio.get_running_loop()
+        subscription = Subscription(company_id, self.queue_size)
+        self._subscriptions[company_id].add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        """
+        Stop delivering events to a subscription.
+
+        Args:
+            subscription: Subscription returned by subscribe()
+        """
+        subscriptions = self._subscriptions.get(subscription.company_id)
+        if subscriptions is not None:
+            subscriptions.discard(subscription)
+            if not subscriptions:
+                del self._subscriptions[subscription.company_id]
+
+    def replay(self, company_id: int, last_event_id: int) -> Optional[List[Event]]:
+        """
+        Get the buffered events published after a given event.
+
+        Args:
+            company_id: Company to replay
+            last_event_id: Id of the last event the client received
+
+        Returns:
+            Events newer than last_event_id, or None if some of them are no
+            longer buffered, or the id is unknown here, and the client has
+            to reload its state
+        """
+        buffer = self._buffers.get(company_id)
+        if not buffer:
+            return []
+        if buffer[0].id > last_event_id and len(buffer) == buffer.maxlen:
+            return None
+        if last_event_id > buffer[-1].id:
+            # Not an id this worker has seen (e.g. issued before a restart)
+            return None
+        return [event for event in buffer if event.id > last_event_id]
+
+
+async def stream_events(company_id: int, last_event_id: Optional[int] = None) -> AsyncIterator[bytes]:
+    """
+    Stream a company's events in server-sent events format.
+
+    Events missed since last_event_id are replayed first; if they are no
+    longer buffered a "reset" event tells the client to reload. A comment
+    line is sent every EVENT_KEEPALIVE_SECONDS so proxies keep the
+    connection open. The stream ends if the client falls too far behind.
+
+    Args:
+        company_id: Company to follow
+        last_event_id: Id of the last event the client received
+
+    Yields:
+        Encoded SSE messages
+    """
+    subscription = event_bus.subscribe(company_id)
+    try:
+        yield f"retry: {settings.EVENT_RETRY_MS}\n\n".encode("utf-8")
+
+        replayed: Set[int] = set()
+        if last_event_id is not None:
+            backlog = event_bus.replay(company_id, last_event_id)
+            if backlog is None:
+                yield b"event: reset\ndata: {}\n\n"
+            else:
+                for event in backlog:
+                    replayed.add(event.id)
+                    yield event.message
+
+        while True:
+            try:
+                event = await asyncio.wait_for(subscription.queue.get(), timeout=settings.EVENT_KEEPALIVE_SECONDS)
+            except asyncio.TimeoutError:
+                yield b": keepalive\n\n"
+                continue
+            if event is None:
+                # Overflowed: the client reconnects and resumes from its Last-Event-ID
+                return
+            if event.id in replayed:
+                continue
+            yield event.message
+    finally:
+        event_bus.unsubscribe(subscription)
+
+
+event_bus = EventBus(buffer_size=settings.EVENT_BUFFER_SIZE, queue_size=settings.EVENT_QUEUE_SIZE)
+invalidation_bus.subscribe(EVENTS_NAMESPACE, event_bus._receive)
@@ -0,0 +1,159 @@
+import csv
+import enum
+import io
+import zlib
+from datetime import datetime
+from typing import Any, Iterator, List, Optional, Sequence
+
+from sqlalchemy import select, union_all
+
+from config import settings
+from database import SessionLocal
+from models.archive import invoices_archive, projects_archive, quotes_archive
+from models.project import Project
+from models.quote import Quote
+from models.invoice import Invoice
+from services.serialization import dumps
+
+
+class ExportKind(str, enum.Enum):
+    PROJECTS = "projects"
+    QUOTES = "quotes"
+    INVOICES = "invoices"
+
+
+# Columns included in each export, in output order
+EXPORT_COLUMNS = {
+    "projects": (Project, [
+        "id", "name", "description", "client_name", "client_email", "client_phone",
+        "client_address", "room_length", "room_width", "room_area", "tile_length",
+        "tile_width", "tile_price_per_unit", "wastage_percentage", "status", "budget",
+        "actual_cost", "created_by", "created_at", "updated_at", "completed_at",
+    ]),
+    "quotes": (Quote, [
+        "id", "project_id", "quote_number", "client_name", "client_email", "client_phone",
+        "client_address", "total_amount", "tax_amount", "discount_amount", "status",
+        "valid_until", "notes", "created_at", "sent_at", "accepted_at",
+    ]),
+    "invoices": (Invoice, [
+        "id", "project_id", "invoice_number", "client_name", "client_email", "client_phone",
+        "client_address", "amount", "tax_amount", "discount_amount", "total_amount",
+        "status", "due_date", "paid_date", "payment_method", "notes", "created_at", "sent_at",
+    ]),
+}
+
+
+# Archive tables holding each kind's rows once their project is archived
+EXPORT_ARCHIVES = {
+    "projects": projects_archive,
+    "quotes": quotes_archive,
+    "invoices": invoices_archive,
+}
+
+
+def _csv_value(value: Any) -> Any:
+    """Convert a column value into its CSV text form."""
+    if value is None:
+        return ""
+    if isinstance(value, enum.Enum):
+        return value.value
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+def _encode_csv(rows: Sequence[Sequence[Any]]) -> bytes:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerows([_csv_value(value) for value in row] for row in rows)
+    return buffer.getvalue().encode("utf-8")
+
+
+def _encode_ndjson(rows: Sequence[Sequence[Any]], fields: List[str]) -> bytes:
+    return b"".join(dumps(dict(zip(fields, row))) + b"\n" for row in rows)
+
+
+def stream_export(
+    kind: str,
+    company_id: int,
+    fields: Optional[Sequence[str]] = None,
+    format: str = "csv",
+    compress: bool = False,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    include_archived: bool = True
+) -> Iterator[bytes]:
+    """
+    Stream a tenant's projects, quotes or invoices as CSV or NDJSON.
+
+    Rows are read through a server-side cursor in EXPORT_BATCH_SIZE batches
+    and encoded batch by batch, so memory stays flat regardless of the
+    export size. The generator owns its database session because streaming
+    continues after the request's dependencies have been closed.
+
+    By default archived rows are included, so e.g. a year of invoices is
+    complete even after their projects have been archived; rows come out in
+    id order either way.
+
+    Args:
+        kind: "projects", "quotes" or "invoices"
+        company_id: Company to export
+        fields: Columns to include, in EXPORT_COLUMNS order (default: all of them)
+        format: "csv" or "ndjson"
+        compress: Gzip-compress the stream on the fly
+        since: Only include rows created at or after this time
+        until: Only include rows created before this time
+        include_archived: Also export rows moved to the archive tables
+
+    Yields:
+        Encoded chunks of the export
+    """
+    entity, columns = EXPORT_COLUMNS[kind]
+    fields = [name for name in columns if fields is None or name in fields]
+    compressor = zlib.compressobj(wbits=31) if compress else None
+
+    def emit(data: bytes, flush: bool = False) -> bytes:
+        if compressor is None:
+            return data
+        data = compressor.compress(data)
+        return data + compressor.flush(zlib.Z_SYNC_FLUSH) if flush else data
+
+    # Send the CSV header immediately for a fast time-to-first-byte
+    if format == "csv":
+        yield emit(_encode_csv([fields]), flush=True)
+
+    def build(table):
+        query = select(*[table.c[name] for name in fields], table.c.id.label("sort_key")).where(
+            table.c.company_id == company_id
+        )
+        if since is not None:
+            query = query.where(table.c.created_at >= since)
+        if until is not None:
+            query = query.where(table.c.created_at < until)
+        return query
+
+    rows = build(entity.__table__)
+    if include_archived:
+        rows = union_all(rows, build(EXPORT_ARCHIVES[kind]))
+    rows = rows.subquery()
+    query = (
+        select(*[rows.c[name] for name in fields])
+        .order_by(rows.c.sort_key)
+        .execution_options(yield_per=settings.EXPORT_BATCH_SIZE)
+    )
+
+    db = SessionLocal()
+    try:
+        result = db.execute(query)
+        for batch in result.partitions():
+            if format == "csv":
+                chunk = emit(_encode_csv(batch))
+            else:
+                chunk = emit(_encode_ndjson(batch, fields))
+            if chunk:
+                yield chunk
+    finally:
+        db.close()
+
+    if compressor:
+        yield compressor.flush()
@@ -0,0 +1,295 @@
+import hashlib
+import json
+import logging
+import os
+import select
+import socket
+import tempfile
+import threading
+import time
+import uuid
+from collections import defaultdict
+from typing import Callable, Dict, List, Optional
+
+from sqlalchemy import text
+
+from config import settings
+from database import engine
+
+logger = logging.getLogger(__name__)
+
+PG_CHANNEL = "cache_invalidation"
+MAX_DATAGRAM = 8192
+
+# Largest message either transport carries whole: NOTIFY payloads must be
+# shorter than 8000 bytes, and longer datagrams are cut at MAX_DATAGRAM
+MAX_PAYLOAD_BYTES = 7999
+
+# Backoff between listener reconnect attempts
+RECONNECT_MIN_SECONDS = 1.0
+RECONNECT_MAX_SECONDS = 30.0
+
+Callback = Callable[[str], None]
+
+
+class PostgresTransport:
+    """
+    Broadcasts invalidations with LISTEN/NOTIFY on a dedicated connection.
+    """
+
+    def __init__(self):
+        self._stopped = threading.Event()
+
+    def send(self, payload: str) -> None:
+        with engine.begin() as conn:
+            conn.execute(text("SELECT pg_notify(:channel, :payload)"), {"channel": PG_CHANNEL, "payload": payload})
+
+    def listen(self, deliver: Callable[[str], None], ready: Callable[[], None] = lambda: None) -> None:
+        connection = engine.raw_connection()
+        try:
+            dbapi_connection = connection.dbapi_connection
+            dbapi_connection.autocommit = True
+            with dbapi_connection.cursor() as cursor:
+                cursor.execute(f"LISTEN {PG_CHANNEL}")
+            ready()
+
+            while not self._stopped.is_set():
+                if select.select([dbapi_connection], [], [], 1.0) == ([], [], []):
+                    continue
+                dbapi_connection.poll()
+                while dbapi_connection.notifies:
+                    deliver(dbapi_connection.notifies.pop(0).payload)
+        finally:
+            # The connection is in autocommit and LISTENing, so do not return it to the pool
+            connection.invalidate()
+
+    def close(self) -> None:
+        self._stopped.set()
+
+
+class UnixSocketTransport:
+    """
+    Broadcasts invalidations as Unix datagrams between the workers on a host.
+
+    Every listening worker binds a socket in a directory derived from the
+    database URL; senders deliver to every socket found there and remove
+    sockets whose worker has gone.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.path: Optional[str] = None
+        self._stopped = threading.Event()
+
+    def send(self, payload: str) -> None:
+        data = payload.encode("utf-8")
+        try:
+            names = os.listdir(self.directory)
+        except FileNotFoundError:
+            return
+
+        with socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM) as sender:
+            sender.setblocking(False)
+            for name in names:
+                path = os.path.join(self.directory, name)
+                if path == self.path or not name.endswith(".sock"):
+                    continue
+                try:
+                    sender.sendto(data, path)
+                except (ConnectionRefusedError, FileNotFoundError):
+                    # Worker exited without cleaning up
+                    try:
+                        os.unlink(path)
+                    except FileNotFoundError:
+                        pass
+                except BlockingIOError:
+                    logger.warning("Invalidation dropped, receiver %s is not keeping up", name)
+
+    def listen(self, deliver: Callable[[str], None], ready: Callable[[], None] = lambda: None) -> None:
+        os.makedirs(self.directory, mode=0o700, exist_ok=True)
+        self.path = os.path.join(self.directory, f"{os.getpid()}-{uuid.uuid4().hex[:8]}.sock")
+        receiver = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        try:
+            receiver.bind(self.path)
+            receiver.settimeout(1.0)
+            ready()
+            while not self._stopped.is_set():
+                try:
+                    data = receiver.recv(MAX_DATAGRAM)
+                except socket.timeout:
+                    continue
+                deliver(data.decode("utf-8"))
+        finally:
+            receiver.close()
+            try:
+                os.unlink(self.path)
+            except FileNotFoundError:
+                pass
+            self.path = None
+
+    def close(self) -> None:
+        self._stopped.set()
+
+
+def default_socket_directory() -> str:
+    """
+    Socket directory shared by all workers using the same database.
+
+    Returns:
+        Directory path
+    """
+    if settings.INVALIDATION_SOCKET_DIR:
+        return settings.INVALIDATION_SOCKET_DIR
+    database = hashlib.blake2b(settings.DATABASE_URL.encode("utf-8"), digest_size=6).hexdigest()
+    return os.path.join(tempfile.gettempdir(), f"tiling-invalidation-{database}")
+
+
+class InvalidationBus:
+    """
+    Propagates cache invalidations to every worker process.
+
+    Caches subscribe to a key namespace (e.g. "tenant") with a callback
+    taking the key. publish() runs the local callbacks at once and
+    broadcasts the message; other workers run their callbacks from a
+    listener thread when it arrives. PostgreSQL uses LISTEN/NOTIFY, other
+    databases Unix datagrams between the workers on the host.
+
+    If the listener fails (e.g. the LISTEN connection drops) it reconnects
+    with backoff. Messages sent meanwhile are lost, so once it listens
+    again the resync callbacks run, e.g. to clear a whole cache.
+    """
+
+    def __init__(self):
+        self.origin = uuid.uuid4().hex
+        self._subscribers: Dict[str, List[Callback]] = defaultdict(list)
+        self._resync_callbacks: List[Callable[[], None]] = []
+        self._transport = None
+        self._thread: Optional[threading.Thread] = None
+        self._stopped = threading.Event()
+
+    def _get_transport(self):
+        if self._transport is None:
+            if engine.dialect.name == "postgresql":
+                self._transport = PostgresTransport()
+            else:
+                self._transport = UnixSocketTransport(default_socket_directory())
+        return self._transport
+
+    def subscribe(self, namespace: str, callback: Callback) -> None:
+        """
+        Register a callback for invalidations in a namespace.
+
+        Args:
+            namespace: Key namespace, e.g. "tenant"
+            callback: Called with each invalidated key
+        """
+        self._subscribers[namespace].append(callback)
+
+    def on_resync(self, callback: Callable[[], None]) -> None:
+        """
+        Register a callback run after the listener reconnects, since
+        invalidations may have been missed while it was down.
+
+        Args:
+            callback: Called without arguments
+        """
+        self._resync_callbacks.append(callback)
+
+    def publish(self, namespace: str, *keys: str, local: bool = True) -> bool:
+        """
+        Invalidate keys in this worker and broadcast them to the others.
+
+        Args:
+            namespace: Key namespace
+            keys: Keys to invalidate
+            local: Also run this worker's callbacks
+
+        Returns:
+            bool: False if the broadcast had to be dropped, because it is
+            larger than MAX_PAYLOAD_BYTES or could not be sent
+        """
+        keys = [str(key) for key in keys if key is not None]
+        if not keys:
+            return True
+        if local:
+            self._dispatch(namespace, keys)
+        if not settings.INVALIDATION_BUS_ENABLED:
+            return True
+
+        payload = json.dumps({"origin": self.origin, "namespace": namespace, "keys": keys})
+        size = len(payload.encode("utf-8"))
+        if size > MAX_PAYLOAD_BYTES:
+            logger.warning("Not broadcasting %s message of %d bytes (limit %d)", namespace, size, MAX_PAYLOAD_BYTES)
+            return False
+        try:
+            self._get_transport().send(payload)
+        except Exception as exc:
+            # Other workers fall back to their cache TTLs
+            logger.warning("Could not broadcast invalidation of %s %s: %s", namespace, keys, exc)
+            return False
+        return True
+
+    def _dispatch(self, namespace: str, keys: List[str]) -> None:
+        for callback in self._subscribers.get(namespace, ()):
+            for key in keys:
+                try:
+                    callback(key)
+                except Exception:
+                    logger.exception("Invalidation callback failed for %s %s", namespace, key)
+
+    def _deliver(self, payload: str) -> None:
+        try:
+            message = json.loads(payload)
+        except ValueError:
+            return
+        if message.get("origin") == self.origin:
+            return
+        self._dispatch(message["namespace"], message["keys"])
+
+    def _resync(self) -> None:
+        logger.info("Invalidation listener reconnected, resyncing caches")
+        for callback in self._resync_callbacks:
+            try:
+                callback()
+            except Exception:
+                logger.exception("Invalidation resync callback failed")
+
+    def _listen(self) -> None:
+        delay = RECONNECT_MIN_SECONDS
+        reconnecting = False
+        while not self._stopped.is_set():
+            started = time.monotonic()
+            try:
+                self._get_transport().listen(self._deliver, self._resync if reconnecting else lambda: None)
+                return
+            except Exception:
+                if self._stopped.is_set():
+                    return
+                logger.exception("Invalidation listener failed, reconnecting in %.0f s", delay)
+            if time.monotonic() - started > RECONNECT_MAX_SECONDS:
+                # It had been listening for a while; start the backoff over
+                delay = RECONNECT_MIN_SECONDS
+            reconnecting = True
+            self._stopped.wait(delay)
+            delay = min(delay * 2, RECONNECT_MAX_SECONDS)
+
+    def start(self) -> None:
+        """Start receiving invalidations from other workers."""
+        if not settings.INVALIDATION_BUS_ENABLED or self._thread is not None:
+            return
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._listen, name="invalidation-bus", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the listener thread."""
+        if self._thread is None:
+            return
+        self._stopped.set()
+        self._get_transport().close()
+        self._thread.join(timeout=2)
+        self._thread = None
+        self._transport = None
+
+
+invalidation_bus = InvalidationBus()
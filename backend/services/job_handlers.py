@@ -0,0 +1,133 @@
+import os
+import uuid
+from datetime import datetime
+from typing import Any, Dict, Iterator, Tuple
+
+from config import settings
+from database import SessionLocal
+from services.archive import archive_projects
+from services.company_purge import purge_company
+from services.events import event_bus
+from services.export import stream_export
+from services.jobs import JobContext, job_handler
+from services.project_import import ProjectImporter, iter_records
+
+# Report progress every this many export chunks / import rows
+EXPORT_PROGRESS_EVERY = 50
+
+
+def upload_path(filename: str) -> str:
+    """
+    Get a fresh path for a file uploaded for a job.
+
+    Args:
+        filename: Client-supplied file name (only its extension is kept)
+
+    Returns:
+        Path inside JOB_FILES_DIR/uploads
+    """
+    directory = os.path.join(settings.JOB_FILES_DIR, "uploads")
+    os.makedirs(directory, exist_ok=True)
+    extension = os.path.splitext(filename or "")[1][:10]
+    return os.path.join(directory, f"{uuid.uuid4().hex}{extension}")
+
+
+def job_file_path(job_id: int, name: str) -> str:
+    """
+    Get the path of a file belonging to a job.
+
+    Args:
+        job_id: Job id
+        name: File name
+
+    Returns:
+        Path inside JOB_FILES_DIR
+    """
+    directory = os.path.join(settings.JOB_FILES_DIR, str(job_id))
+    os.makedirs(directory, exist_ok=True)
+    return os.path.join(directory, os.path.basename(name))
+
+
+@job_handler("export")
+def run_export(context: JobContext, payload: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Write a company export to a file for later download.
+
+    Payload:
+        kind, fields, format, gzip, since, until, include_archived
+        (see services.export.stream_export)
+    """
+    since = datetime.fromisoformat(payload["since"]) if payload.get("since") else None
+    until = datetime.fromisoformat(payload["until"]) if payload.get("until") else None
+    filename = f"{payload['kind']}.{payload.get('format', 'csv')}" + (".gz" if payload.get("gzip") else "")
+    path = job_file_path(context.job_id, filename)
+
+    size = 0
+    with open(path, "wb") as output:
+        chunks = stream_export(
+            payload["kind"], context.company_id, fields=payload.get("fields"),
+            format=payload.get("format", "csv"), compress=bool(payload.get("gzip")),
+            since=since, until=until, include_archived=payload.get("include_archived", True)
+        )
+        for index, chunk in enumerate(chunks, start=1):
+            output.write(chunk)
+            size += len(chunk)
+            if index % EXPORT_PROGRESS_EVERY == 0:
+                context.set_progress(size)
+
+    context.set_progress(size, size)
+    return {"file": filename, "bytes": size}
+
+
+@job_handler("import_projects")
+def run_project_import(context: JobContext, payload: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Import projects from an uploaded file.
+
+    Payload:
+        path (uploaded file under JOB_FILES_DIR), format, created_by
+    """
+    path = payload["path"]
+
+    def tracked(records: Iterator[Tuple[int, Dict]]) -> Iterator[Tuple[int, Dict]]:
+        for row_number, record in records:
+            if row_number % settings.IMPORT_CHUNK_SIZE == 0:
+                context.set_progress(row_number)
+            yield row_number, record
+
+    db = SessionLocal()
+    try:
+        with open(path, "rb") as stream:
+            importer = ProjectImporter(db, context.company_id, created_by=payload.get("created_by"))
+            report = importer.run(tracked(iter_records(stream, payload["format"])))
+    finally:
+        db.close()
+
+    context.set_progress(report["total"], report["total"])
+    if report["imported"]:
+        event_bus.publish(context.company_id, "projects.imported", {"imported": report["imported"]})
+    return report
+
+
+@job_handler("purge_company")
+def run_company_purge(context: JobContext, payload: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Delete a soft-deleted company's data in batches.
+
+    Payload:
+        company_id
+    """
+    deleted = purge_company(payload["company_id"], progress=context.set_progress)
+    return {"deleted": deleted}
+
+
+@job_handler("archive_projects")
+def run_project_archival(context: JobContext, payload: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Move long-closed projects into the archive tables in batches.
+
+    Payload:
+        older_than_days (default ARCHIVE_AFTER_DAYS)
+    """
+    archived = archive_projects(payload.get("older_than_days"), progress=context.set_progress)
+    return {"archived": archived}
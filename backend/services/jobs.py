@@ -0,0 +1,350 @@
+import logging
+import os
+import socket
+import threading
+import traceback
+import uuid
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Optional
+
+from sqlalchemy import func, or_, select, update
+from sqlalchemy.orm import Session
+
+from config import settings
+from database import SessionLocal, engine
+from models.job import Job, JobStatus
+
+logger = logging.getLogger(__name__)
+
+# kind -> handler(context, payload) returning a JSON-serializable result
+JOB_HANDLERS: Dict[str, Callable[["JobContext", Dict[str, Any]], Any]] = {}
+
+
+def job_handler(kind: str):
+    """
+    Register a function as the handler for a job kind.
+
+    Args:
+        kind: Job kind, e.g. "export"
+
+    Returns:
+        Decorator registering the handler
+    """
+    def decorator(func):
+        JOB_HANDLERS[kind] = func
+        return func
+    return decorator
+
+
+class JobCancelled(Exception):
+    """Raised inside a handler when its job was cancelled while running."""
+
+
+class JobContext:
+    """
+    Handle passed to job handlers for reporting progress.
+
+    Progress updates also refresh the worker's claim, and raise
+    JobCancelled once the job has been cancelled.
+    """
+
+    def __init__(self, job_id: int, company_id: Optional[int], worker_id: str):
+        self.job_id = job_id
+        self.company_id = company_id
+        self.worker_id = worker_id
+
+    def set_progress(self, progress: int, total: Optional[int] = None) -> None:
+        """
+        Record how far the job has got.
+
+        Args:
+            progress: Items processed so far
+            total: Total number of items, if known
+
+        Raises:
+            JobCancelled: If the job is no longer running on this worker
+        """
+        values = {"progress": progress, "locked_at": datetime.utcnow()}
+        if total is not None:
+            values["progress_total"] = total
+        with engine.begin() as conn:
+            result = conn.execute(
+                update(Job)
+                .where(Job.id == self.job_id, Job.status == JobStatus.RUNNING, Job.locked_by == self.worker_id)
+                .values(**values)
+            )
+        if result.rowcount == 0:
+            raise JobCancelled()
+
+
+class JobQueue:
+    """
+    Database-backed job queue.
+
+    Jobs are claimed with a single UPDATE ... RETURNING on the next runnable
+    job, picked by priority and age. On PostgreSQL the candidate row is
+    selected FOR UPDATE SKIP LOCKED so concurrent workers never block on or
+    claim the same job; SQLite serializes writers, which makes the same
+    statement atomic there.
+
+    Per-tenant concurrency is limited by skipping companies that already
+    have JOB_TENANT_CONCURRENCY running jobs. Under concurrent claims on
+    PostgreSQL the limit can be briefly exceeded by one job per worker.
+    """
+
+    @staticmethod
+    def enqueue(
+        db: Session,
+        kind: str,
+        payload: Dict[str, Any],
+        company_id: Optional[int] = None,
+        created_by: Optional[int] = None,
+        priority: int = 0,
+        max_attempts: Optional[int] = None,
+        run_after: Optional[datetime] = None
+    ) -> Job:
+        """
+        Add a job to the queue.
+
+        Args:
+            db: Database session
+            kind: Registered job kind
+            payload: JSON-serializable handler arguments
+            company_id: Tenant the job belongs to
+            created_by: User who requested the job
+            priority: Higher values run first
+            max_attempts: Attempts before the job fails (default JOB_MAX_ATTEMPTS)
+            run_after: Earliest start time
+
+        Returns:
+            Job: The queued job
+        """
+        if kind not in JOB_HANDLERS:
+            raise ValueError(f"Unknown job kind: {kind}")
+
+        job = Job(
+            kind=kind,
+            payload=payload,
+            company_id=company_id,
+            created_by=created_by,
+            priority=priority,
+            max_attempts=max_attempts or settings.JOB_MAX_ATTEMPTS,
+            run_after=run_after or datetime.utcnow(),
+            status=JobStatus.QUEUED,
+        )
+        db.add(job)
+        db.commit()
+        db.refresh(job)
+        return job
+
+    @staticmethod
+    def claim(worker_id: str) -> Optional[int]:
+        """
+        Atomically claim the next runnable job.
+
+        Args:
+            worker_id: Identifier of the claiming worker
+
+        Returns:
+            The claimed job id, or None if no job is runnable
+        """
+        now = datetime.utcnow()
+
+        busy_tenants = (
+            select(Job.company_id)
+            .where(Job.status == JobStatus.RUNNING, Job.company_id.is_not(None))
+            .group_by(Job.company_id)
+            .having(func.count() >= settings.JOB_TENANT_CONCURRENCY)
+        )
+        candidate = (
+            select(Job.id)
+            .where(
+                Job.status == JobStatus.QUEUED,
+                Job.run_after <= now,
+                or_(Job.company_id.is_(None), Job.company_id.not_in(busy_tenants)),
+            )
+            .order_by(Job.priority.desc(), Job.id)
+            .limit(1)
+        )
+        if engine.dialect.name == "postgresql":
+            candidate = candidate.with_for_update(skip_locked=True)
+
+        with engine.begin() as conn:
+            return conn.execute(
+                update(Job)
+                .where(Job.id == candidate.scalar_subquery(), Job.status == JobStatus.QUEUED)
+                .values(
+                    status=JobStatus.RUNNING,
+                    locked_by=worker_id,
+                    locked_at=now,
+                    started_at=now,
+                    attempts=Job.attempts + 1,
+                )
+                .returning(Job.id)
+            ).scalar()
+
+    @staticmethod
+    def run(job_id: int, worker_id: str) -> JobStatus:
+        """
+        Run a claimed job and record its outcome.
+        Failed attempts are retried with exponential backoff until
+        max_attempts is reached.
+
+        Args:
+            job_id: Claimed job id
+            worker_id: Worker holding the claim
+
+        Returns:
+            JobStatus: Status the job ended in
+        """
+        db = SessionLocal()
+        try:
+            job = db.query(Job).filter(Job.id == job_id).first()
+            kind, payload, company_id = job.kind, dict(job.payload or {}), job.company_id
+            attempts, max_attempts = job.attempts, job.max_attempts
+        finally:
+            db.close()
+
+        context = JobContext(job_id, company_id, worker_id)
+        values: Dict[str, Any]
+        try:
+            handler = JOB_HANDLERS.get(kind)
+            if handler is None:
+                raise ValueError(f"No handler registered for job kind '{kind}'")
+            result = handler(context, payload)
+            values = {"status": JobStatus.SUCCEEDED, "result": result, "error": None}
+        except JobCancelled:
+            return JobStatus.CANCELLED
+        except Exception as exc:
+            logger.warning("Job %s (%s) attempt %s failed: %s", job_id, kind, attempts, exc)
+            error = "".join(traceback.format_exception_only(type(exc), exc)).strip()
+            if attempts < max_attempts:
+                delay = min(
+                    settings.JOB_RETRY_BASE_SECONDS * 2 ** (attempts - 1),
+                    settings.JOB_RETRY_MAX_SECONDS
+                )
+                values = {
+                    "status": JobStatus.QUEUED,
+                    "error": error,
+                    "run_after": datetime.utcnow() + timedelta(seconds=delay),
+                }
+            else:
+                values = {"status": JobStatus.FAILED, "error": error}
+
+        if values["status"] != JobStatus.QUEUED:
+            values["finished_at"] = datetime.utcnow()
+        with engine.begin() as conn:
+            finished = conn.execute(
+                update(Job)
+                .where(Job.id == job_id, Job.status == JobStatus.RUNNING, Job.locked_by == worker_id)
+                .values(locked_by=None, locked_at=None, **values)
+            ).rowcount
+        # Cancelled (or reclaimed after a timeout) while running
+        return values["status"] if finished else JobStatus.CANCELLED
+
+    @staticmethod
+    def requeue_stale() -> int:
+        """
+        Release jobs whose worker stopped reporting for JOB_LOCK_TIMEOUT_SECONDS
+        (e.g. because it crashed), so another worker can retry them. Jobs
+        that have used up their attempts are marked FAILED instead, so a
+        non-retryable job is not re-run and a job that keeps crashing its
+        worker does not retry forever.
+
+        Returns:
+            int: Number of jobs released for retry
+        """
+        now = datetime.utcnow()
+        cutoff = now - timedelta(seconds=settings.JOB_LOCK_TIMEOUT_SECONDS)
+        stale = (Job.status == JobStatus.RUNNING, Job.locked_at < cutoff)
+        with engine.begin() as conn:
+            released = conn.execute(
+                update(Job)
+                .where(*stale, Job.attempts < Job.max_attempts)
+                .values(status=JobStatus.QUEUED, locked_by=None, locked_at=None, run_after=now)
+            ).rowcount
+            failed = conn.execute(
+                update(Job)
+                .where(*stale, Job.attempts >= Job.max_attempts)
+                .values(
+                    status=JobStatus.FAILED,
+                    error="Worker stopped responding and no attempts are left",
+                    locked_by=None,
+                    locked_at=None,
+                    finished_at=now,
+                )
+            ).rowcount
+        if failed:
+            logger.warning("Failed %s stale jobs with no attempts left", failed)
+        return released
+
+    @staticmethod
+    def cancel(db: Session, job: Job) -> bool:
+        """
+        Cancel a queued or running job. A running handler stops at its next
+        progress update.
+
+        Args:
+            db: Database session
+            job: Job to cancel
+
+        Returns:
+            bool: False if the job had already finished (job is refreshed
+            to show how)
+        """
+        # Conditional, so a job finishing meanwhile keeps its final status
+        result = db.execute(
+            update(Job)
+            .where(Job.id == job.id, Job.status.in_((JobStatus.QUEUED, JobStatus.RUNNING)))
+            .values(status=JobStatus.CANCELLED, finished_at=datetime.utcnow(), locked_by=None, locked_at=None)
+            .execution_options(synchronize_session=False)
+        )
+        db.commit()
+        db.refresh(job)
+        return result.rowcount > 0
+
+
+class JobWorker:
+    """
+    Runs queued jobs on a pool of threads until stopped.
+    """
+
+    def __init__(self, concurrency: int = 1, poll_interval: float = 1.0):
+        self.concurrency = concurrency
+        self.poll_interval = poll_interval
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+        self._stopped = threading.Event()
+
+    def _loop(self, index: int) -> None:
+        worker_id = f"{self.worker_id}/{index}"
+        while not self._stopped.is_set():
+            if index == 0:
+                released = JobQueue.requeue_stale()
+                if released:
+                    logger.warning("Released %s stale jobs", released)
+            try:
+                job_id = JobQueue.claim(worker_id)
+            except Exception:
+                logger.exception("Could not claim a job")
+                job_id = None
+            if job_id is None:
+                self._stopped.wait(self.poll_interval)
+                continue
+            status = JobQueue.run(job_id, worker_id)
+            logger.info("Job %s finished as %s", job_id, status.value)
+
+    def run(self) -> None:
+        """Process jobs until stop() is called."""
+        threads = [
+            threading.Thread(target=self._loop, args=(index,), name=f"job-worker-{index}")
+            for index in range(self.concurrency)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            while thread.is_alive():
+                thread.join(timeout=0.5)
+
+    def stop(self) -> None:
+        """Finish the running jobs and stop claiming new ones."""
+        self._stopped.set()
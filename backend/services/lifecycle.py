@@ -0,0 +1,280 @@
+import logging
+import os
+import socket
+import threading
+import time
+import uuid
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import insert, or_, select, update
+from sqlalchemy.exc import IntegrityError
+
+from config import settings
+from database import engine
+from models.invoice import Invoice, InvoiceStatus
+from models.quote import Quote, QuoteStatus
+from models.scheduler_lease import SchedulerLease
+from services.events import event_bus
+from services.metrics import (
+    lifecycle_sweep_duration_seconds,
+    lifecycle_sweep_leader,
+    lifecycle_sweep_rows_total,
+    lifecycle_sweep_runs_total,
+)
+
+logger = logging.getLogger(__name__)
+
+LEASE_NAME = "lifecycle_sweep"
+
+
+def _sweep(
+    model: Any,
+    deadline: Any,
+    from_status: Any,
+    to_status: Any,
+    number: Any,
+    event_type: str,
+    now: Optional[datetime],
+    batch_size: Optional[int]
+) -> int:
+    """
+    Move every row in from_status whose deadline has passed to to_status,
+    one batch per transaction, and publish the changed rows per company in
+    events of at most EVENT_CHUNK_SIZE items.
+
+    Each batch is a single UPDATE ... RETURNING over an id subquery served
+    by the (status, deadline) index. Being a Core UPDATE it bypasses the
+    ORM revenue tracking, which is fine as long as neither status is PAID.
+    """
+    now = now or datetime.utcnow()
+    batch_size = batch_size or settings.LIFECYCLE_SWEEP_BATCH_SIZE
+
+    candidates = (
+        select(model.id)
+        .where(model.status == from_status, deadline < now)
+        .limit(batch_size)
+    )
+    if engine.dialect.name == "postgresql":
+        # Skip rows being edited by a request; the next sweep picks them up
+        candidates = candidates.with_for_update(skip_locked=True)
+    statement = (
+        update(model)
+        .where(model.id.in_(candidates.scalar_subquery()), model.status == from_status)
+        .values(status=to_status)
+        .returning(model.id, model.company_id, number)
+    )
+
+    swept = 0
+    while True:
+        with engine.begin() as conn:
+            rows = conn.execute(statement).all()
+
+        by_company: Dict[int, List[Dict[str, Any]]] = defaultdict(list)
+        for row_id, company_id, row_number in rows:
+            by_company[company_id].append({"id": row_id, "number": row_number})
+        for company_id, changed in by_company.items():
+            # A batch can hold far more rows than one forwarded event can carry
+            event_bus.publish_chunked(company_id, event_type, {"status": to_status, "items": changed}, "items")
+
+        swept += len(rows)
+        if len(rows) < batch_size:
+            return swept
+
+
+def sweep_overdue_invoices(now: Optional[datetime] = None, batch_size: Optional[int] = None) -> int:
+    """
+    Mark sent invoices past their due date as overdue.
+
+    Args:
+        now: Reference time (default: current UTC time)
+        batch_size: Invoices per transaction (default LIFECYCLE_SWEEP_BATCH_SIZE)
+
+    Returns:
+        int: Number of invoices marked overdue
+    """
+    return _sweep(
+        Invoice, Invoice.due_date, InvoiceStatus.SENT, InvoiceStatus.OVERDUE,
+        Invoice.invoice_number, "invoices.overdue", now, batch_size
+    )
+
+
+def sweep_expired_quotes(now: Optional[datetime] = None, batch_size: Optional[int] = None) -> int:
+    """
+    Mark sent quotes past their validity as expired.
+
+    Args:
+        now: Reference time (default: current UTC time)
+        batch_size: Quotes per transaction (default LIFECYCLE_SWEEP_BATCH_SIZE)
+
+    Returns:
+        int: Number of quotes marked expired
+    """
+    return _sweep(
+        Quote, Quote.valid_until, QuoteStatus.SENT, QuoteStatus.EXPIRED,
+        Quote.quote_number, "quotes.expired", now, batch_size
+    )
+
+
+SWEEPS = {
+    "overdue_invoices": sweep_overdue_invoices,
+    "expired_quotes": sweep_expired_quotes,
+}
+
+
+def run_sweeps(now: Optional[datetime] = None) -> Dict[str, int]:
+    """
+    Run every lifecycle sweep once, recording metrics per sweep.
+    A failing sweep is logged and does not stop the others.
+
+    Args:
+        now: Reference time (default: current UTC time)
+
+    Returns:
+        Sweep name -> rows changed (sweeps that failed are left out)
+    """
+    now = now or datetime.utcnow()
+    results = {}
+    for name, sweep in SWEEPS.items():
+        start = time.perf_counter()
+        try:
+            results[name] = sweep(now)
+        except Exception:
+            logger.exception("Lifecycle sweep %s failed", name)
+            lifecycle_sweep_runs_total.inc(name, "error")
+            continue
+        finally:
+            lifecycle_sweep_duration_seconds.observe(name, value=time.perf_counter() - start)
+        lifecycle_sweep_runs_total.inc(name, "ok")
+        lifecycle_sweep_rows_total.inc(name, amount=results[name])
+    return results
+
+
+class LeaderLease:
+    """
+    Lease on a scheduler_leases row. Whoever holds an unexpired lease is
+    the leader; the holder renews it, and any worker may take it over
+    once it has expired or been released.
+    """
+
+    def __init__(self, name: str, holder: str, seconds: int):
+        self.name = name
+        self.holder = holder
+        self.seconds = seconds
+
+    def acquire(self) -> bool:
+        """
+        Take or renew the lease.
+
+        Returns:
+            bool: True if this holder is now the leader
+        """
+        now = datetime.utcnow()
+        values = {"holder": self.holder, "expires_at": now + timedelta(seconds=self.seconds)}
+        with engine.begin() as conn:
+            result = conn.execute(
+                update(SchedulerLease)
+                .where(
+                    SchedulerLease.name == self.name,
+                    or_(
+                        SchedulerLease.holder == self.holder,
+                        SchedulerLease.expires_at.is_(None),
+                        SchedulerLease.expires_at < now,
+                    )
+                )
+                .values(**values)
+            )
+            if result.rowcount:
+                return True
+            if conn.execute(select(SchedulerLease.name).where(SchedulerLease.name == self.name)).first():
+                return False
+        try:
+            with engine.begin() as conn:
+                conn.execute(insert(SchedulerLease).values(name=self.name, **values))
+            return True
+        except IntegrityError:
+            # Another worker created the row first
+            return False
+
+    def release(self) -> None:
+        """Give up the lease so another worker can take over at once."""
+        with engine.begin() as conn:
+            conn.execute(
+                update(SchedulerLease)
+                .where(SchedulerLease.name == self.name, SchedulerLease.holder == self.holder)
+                .values(holder=None, expires_at=None)
+            )
+
+
+class LifecycleScheduler:
+    """
+    Runs the lifecycle sweeps periodically in a background thread.
+
+    Every worker runs a scheduler, but only the one holding the
+    lifecycle_sweep lease sweeps; the others keep trying to take the lease
+    over, which succeeds once the leader has stopped or failed to renew it
+    for LIFECYCLE_LEASE_SECONDS.
+    """
+
+    def __init__(self):
+        self.holder = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+        self._lease = LeaderLease(LEASE_NAME, self.holder, settings.LIFECYCLE_LEASE_SECONDS)
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.is_leader = False
+
+    def _set_leader(self, is_leader: bool) -> None:
+        if is_leader != self.is_leader:
+            logger.info("Lifecycle sweeps %s by %s", "taken over" if is_leader else "handed off", self.holder)
+        self.is_leader = is_leader
+        lifecycle_sweep_leader.set(value=1 if is_leader else 0)
+
+    def tick(self) -> Optional[Dict[str, int]]:
+        """
+        Run the sweeps once if this worker is (or becomes) the leader.
+
+        Returns:
+            Rows changed per sweep, or None if another worker is the leader
+        """
+        self._set_leader(self._lease.acquire())
+        if not self.is_leader:
+            return None
+        results = run_sweeps()
+        if any(results.values()):
+            logger.info("Lifecycle sweep: %s", results)
+        return results
+
+    def _run(self) -> None:
+        while not self._stopped.is_set():
+            try:
+                self.tick()
+            except Exception:
+                logger.exception("Lifecycle scheduler tick failed")
+                self._set_leader(False)
+            self._stopped.wait(settings.LIFECYCLE_SWEEP_INTERVAL_SECONDS)
+
+    def start(self) -> None:
+        """Start the scheduler thread."""
+        if not settings.LIFECYCLE_SWEEP_ENABLED or self._thread is not None:
+            return
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._run, name="lifecycle-scheduler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the scheduler thread and release the lease if held."""
+        if self._thread is None:
+            return
+        self._stopped.set()
+        self._thread.join(timeout=5)
+        self._thread = None
+        if self.is_leader:
+            try:
+                self._lease.release()
+            except Exception:
+                logger.exception("Could not release the lifecycle sweep lease")
+            self._set_leader(False)
+
+
+lifecycle_scheduler = LifecycleScheduler()
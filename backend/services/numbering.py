@@ -0,0 +1,151 @@
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import insert, update
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import IntegrityError
+
+from config import settings
+from database import engine as default_engine
+from models.number_sequence import NumberSequence
+
+# Document kind -> setting holding its number format
+NUMBER_FORMATS = {
+    "quote": "QUOTE_NUMBER_FORMAT",
+    "invoice": "INVOICE_NUMBER_FORMAT",
+}
+
+Key = Tuple[int, str, str]
+
+
+class NumberAllocator:
+    """
+    Hands out per-company quote and invoice numbers without a database
+    round trip per number (hi/lo allocation).
+
+    Each process reserves a block of NUMBER_BLOCK_SIZE numbers with one
+    UPDATE ... RETURNING on the company's counter row, committed on its
+    own, and serves numbers from the block in memory. Blocks never overlap,
+    so numbers are unique across workers; numbers left in a block when a
+    worker exits (or whose document is never saved) are skipped, so
+    sequences can have gaps.
+
+    Each sequence has its own lock, so a reservation only holds up
+    requests for the same company, kind and scope.
+    """
+
+    def __init__(self, block_size: Optional[int] = None, engine: Optional[Engine] = None):
+        self.block_size = block_size or settings.NUMBER_BLOCK_SIZE
+        self.engine = engine or default_engine
+        self._blocks: Dict[Key, List[int]] = {}
+        self._locks: Dict[Key, threading.Lock] = {}
+        # Guards _locks only; never held across a database round trip
+        self._lock = threading.Lock()
+
+    def _key_lock(self, key: Key) -> threading.Lock:
+        """Get the lock serialising allocation from one sequence."""
+        with self._lock:
+            lock = self._locks.get(key)
+            if lock is None:
+                lock = self._locks[key] = threading.Lock()
+            return lock
+
+    def _reserve(self, key: Key, count: int) -> int:
+        """Reserve `count` numbers in the database and return the first."""
+        company_id, kind, scope = key
+        for _ in range(2):
+            with self.engine.begin() as conn:
+                end = conn.execute(
+                    update(NumberSequence)
+                    .where(
+                        NumberSequence.company_id == company_id,
+                        NumberSequence.kind == kind,
+                        NumberSequence.scope == scope,
+                    )
+                    .values(next_value=NumberSequence.next_value + count)
+                    .returning(NumberSequence.next_value)
+                ).scalar()
+            if end is not None:
+                return end - count
+            try:
+                with self.engine.begin() as conn:
+                    conn.execute(insert(NumberSequence).values(
+                        company_id=company_id, kind=kind, scope=scope, next_value=1 + count
+                    ))
+                return 1
+            except IntegrityError:
+                # Another worker created the counter first; reserve from it
+                continue
+        raise RuntimeError(f"Could not reserve {kind} numbers for company {company_id}")
+
+    def allocate_values(self, company_id: int, kind: str, scope: str = "", count: int = 1) -> List[int]:
+        """
+        Get the next sequence values for a company's documents.
+
+        Args:
+            company_id: Company ID
+            kind: "quote" or "invoice"
+            scope: Sequence scope, e.g. the year
+            count: Number of values
+
+        Returns:
+            List of unique, increasing values
+        """
+        key = (company_id, kind, scope)
+        values: List[int] = []
+        with self._key_lock(key):
+            block = self._blocks.get(key)
+            while len(values) < count:
+                if block is None or block[0] >= block[1]:
+                    # Large requests reserve everything they need in one round trip
+                    size = max(self.block_size, count - len(values))
+                    start = self._reserve(key, size)
+                    block = [start, start + size]
+                    self._blocks[key] = block
+                take = min(count - len(values), block[1] - block[0])
+                values.extend(range(block[0], block[0] + take))
+                block[0] += take
+        return values
+
+    def allocate(self, company_id: int, kind: str, count: int = 1, when: Optional[datetime] = None) -> List[str]:
+        """
+        Get formatted document numbers for a company.
+
+        Args:
+            company_id: Company ID
+            kind: "quote" or "invoice"
+            count: Number of document numbers
+            when: Date the numbers are issued on (default now), for {year}
+
+        Returns:
+            List of formatted numbers, e.g. ["INV-3-2026-000042"]
+        """
+        number_format = getattr(settings, NUMBER_FORMATS[kind])
+        # Without both, numbers collide across companies or sequence values
+        for field in ("seq", "company_id"):
+            if "{" + field not in number_format:
+                raise ValueError(f"{NUMBER_FORMATS[kind]} must contain {{{field}}}")
+        year = (when or datetime.utcnow()).year
+        # Numbers restart every year only when the year is part of the number
+        scope = str(year) if "{year" in number_format else ""
+        return [
+            number_format.format(company_id=company_id, year=year, seq=value)
+            for value in self.allocate_values(company_id, kind, scope, count)
+        ]
+
+    def next_number(self, company_id: int, kind: str) -> str:
+        """
+        Get one formatted document number.
+
+        Args:
+            company_id: Company ID
+            kind: "quote" or "invoice"
+
+        Returns:
+            The formatted number
+        """
+        return self.allocate(company_id, kind)[0]
+
+
+number_allocator = NumberAllocator()
@@ -0,0 +1,129 @@
+import cProfile
+import io
+import json
+import os
+import pstats
+import re
+import uuid
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from config import settings
+
+# Profile ids are generated by ProfileStore.new_id; anything else is rejected
+PROFILE_ID_PATTERN = re.compile(r'^[0-9]{8}T[0-9]{6}-[0-9a-f]{8}$')
+
+
+class ProfileStore:
+    """
+    Stores request profiles on local disk.
+
+    Each profile is a cProfile dump (<id>.pstats) with a JSON sidecar
+    (<id>.json) holding the route, tenant and timing metadata. Only the
+    newest max_profiles profiles are kept.
+    """
+
+    def __init__(self, directory: str, max_profiles: int):
+        self.directory = directory
+        self.max_profiles = max_profiles
+
+    @staticmethod
+    def new_id() -> str:
+        """
+        Generate a sortable profile id.
+
+        Returns:
+            Profile id
+        """
+        return f"{datetime.utcnow():%Y%m%dT%H%M%S}-{uuid.uuid4().hex[:8]}"
+
+    def _path(self, profile_id: str, extension: str) -> str:
+        return os.path.join(self.directory, f"{profile_id}.{extension}")
+
+    def save(self, profile_id: str, profiler: cProfile.Profile, metadata: Dict[str, Any]) -> None:
+        """
+        Write a finished profile and its metadata, then prune old profiles.
+
+        Args:
+            profile_id: Id from new_id()
+            profiler: Disabled profiler holding the request's samples
+            metadata: Route, tenant and timing information
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        profiler.dump_stats(self._path(profile_id, "pstats"))
+        with open(self._path(profile_id, "json"), "w", encoding="utf-8") as handle:
+            json.dump({"id": profile_id, **metadata}, handle, default=str)
+        self._prune()
+
+    def _prune(self) -> None:
+        ids = self._ids()
+        for profile_id in ids[self.max_profiles:]:
+            for extension in ("json", "pstats"):
+                try:
+                    os.remove(self._path(profile_id, extension))
+                except FileNotFoundError:
+                    pass
+
+    def _ids(self) -> List[str]:
+        """Saved profile ids, newest first."""
+        try:
+            names = os.listdir(self.directory)
+        except FileNotFoundError:
+            return []
+        ids = [name[:-len(".json")] for name in names if name.endswith(".json")]
+        return sorted((i for i in ids if PROFILE_ID_PATTERN.match(i)), reverse=True)
+
+    def list(self, limit: int = 50) -> List[Dict[str, Any]]:
+        """
+        Get metadata of the most recent profiles.
+
+        Args:
+            limit: Maximum number of profiles to return
+
+        Returns:
+            Metadata dictionaries, newest first
+        """
+        profiles = []
+        for profile_id in self._ids()[:limit]:
+            try:
+                with open(self._path(profile_id, "json"), encoding="utf-8") as handle:
+                    profiles.append(json.load(handle))
+            except (FileNotFoundError, ValueError):
+                continue
+        return profiles
+
+    def stats_path(self, profile_id: str) -> Optional[str]:
+        """
+        Get the pstats file of a profile.
+
+        Args:
+            profile_id: Profile id
+
+        Returns:
+            File path, or None if the id is invalid or the profile is gone
+        """
+        if not PROFILE_ID_PATTERN.match(profile_id):
+            return None
+        path = self._path(profile_id, "pstats")
+        return path if os.path.exists(path) else None
+
+    def render_text(self, profile_id: str, limit: int = 50) -> Optional[str]:
+        """
+        Render a profile as a pstats report sorted by cumulative time.
+
+        Args:
+            profile_id: Profile id
+            limit: Number of functions to include
+
+        Returns:
+            Report text, or None if the profile does not exist
+        """
+        path = self.stats_path(profile_id)
+        if path is None:
+            return None
+        output = io.StringIO()
+        pstats.Stats(path, stream=output).strip_dirs().sort_stats("cumulative").print_stats(limit)
+        return output.getvalue()
+
+
+profile_store = ProfileStore(settings.PROFILE_DIR, settings.PROFILE_MAX_FILES)
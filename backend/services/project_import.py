@@ -0,0 +1,197 @@
+import csv
+import io
+from datetime import datetime
+from typing import IO, Dict, Iterator, List, Optional, Tuple
+
+import orjson
+from pydantic import BaseModel, Field, ValidationError
+from sqlalchemy import insert
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from config import settings
+from models.project import Project, ProjectStatus
+
+# Maximum number of row errors kept in an import report
+MAX_REPORTED_ERRORS = 1000
+
+SUPPORTED_FORMATS = ("csv", "ndjson")
+
+
+class ProjectImportRow(BaseModel):
+    """One project record from an import file."""
+    name: str = Field(..., min_length=1, max_length=255)
+    description: Optional[str] = None
+    client_name: str = Field(..., min_length=1, max_length=255)
+    client_email: Optional[str] = None
+    client_phone: Optional[str] = None
+    client_address: Optional[str] = None
+    room_length: Optional[float] = Field(None, gt=0)
+    room_width: Optional[float] = Field(None, gt=0)
+    tile_length: Optional[float] = Field(None, gt=0)
+    tile_width: Optional[float] = Field(None, gt=0)
+    tile_price_per_unit: Optional[float] = Field(None, ge=0)
+    wastage_percentage: float = Field(10.0, ge=0, le=100)
+    status: ProjectStatus = ProjectStatus.INQUIRY
+    budget: Optional[float] = Field(None, ge=0)
+    actual_cost: Optional[float] = Field(None, ge=0)
+    created_at: Optional[datetime] = None
+    completed_at: Optional[datetime] = None
+
+
+def detect_format(filename: Optional[str], content_type: Optional[str] = None) -> Optional[str]:
+    """
+    Guess the import format from a file name or content type.
+
+    Args:
+        filename: Uploaded file name
+        content_type: Uploaded file content type
+
+    Returns:
+        "csv", "ndjson" or None if it cannot be determined
+    """
+    name = (filename or "").lower()
+    content_type = (content_type or "").lower()
+
+    if name.endswith((".ndjson", ".jsonl")) or "ndjson" in content_type:
+        return "ndjson"
+    if name.endswith(".csv") or "csv" in content_type:
+        return "csv"
+    return None
+
+
+def iter_records(stream: IO[bytes], format: str) -> Iterator[Tuple[int, Dict]]:
+    """
+    Stream records from a binary CSV or NDJSON file.
+
+    Args:
+        stream: Binary file object
+        format: "csv" or "ndjson"
+
+    Yields:
+        (row_number, record) tuples. Row numbers are 1-based data rows.
+        Records that cannot be parsed are yielded as {"__error__": message}.
+    """
+    if format not in SUPPORTED_FORMATS:
+        raise ValueError(f"Unsupported import format: {format}")
+
+    text = io.TextIOWrapper(stream, encoding="utf-8-sig", newline="")
+
+    if format == "csv":
+        reader = csv.DictReader(text)
+        for row_number, row in enumerate(reader, start=1):
+            # Empty CSV cells mean "not set"
+            yield row_number, {key: value for key, value in row.items() if key and value not in ("", None)}
+        return
+
+    row_number = 0
+    for line in text:
+        if not line.strip():
+            continue
+        row_number += 1
+        try:
+            record = orjson.loads(line)
+        except orjson.JSONDecodeError as e:
+            yield row_number, {"__error__": f"Invalid JSON: {e}"}
+            continue
+        if not isinstance(record, dict):
+            yield row_number, {"__error__": "Each line must be a JSON object"}
+            continue
+        yield row_number, record
+
+
+class ProjectImporter:
+    """
+    Bulk importer for historic projects.
+    Validates records in chunks and inserts each chunk with one
+    executemany-style INSERT inside its own transaction.
+    """
+
+    def __init__(self, db: Session, company_id: int, created_by: Optional[int] = None, chunk_size: Optional[int] = None):
+        self.db = db
+        self.company_id = company_id
+        self.created_by = created_by
+        self.chunk_size = chunk_size or settings.IMPORT_CHUNK_SIZE
+        self.total = 0
+        self.imported = 0
+        self.failed = 0
+        self.errors: List[Dict] = []
+
+    def run(self, records: Iterator[Tuple[int, Dict]]) -> Dict:
+        """
+        Import all records and return the report.
+
+        Args:
+            records: (row_number, record) tuples, e.g. from iter_records()
+
+        Returns:
+            Dictionary with total, imported and failed counts plus row errors
+        """
+        chunk: List[Tuple[int, Dict]] = []
+        for item in records:
+            chunk.append(item)
+            if len(chunk) >= self.chunk_size:
+                self._import_chunk(chunk)
+                chunk = []
+        if chunk:
+            self._import_chunk(chunk)
+
+        return {
+            "total": self.total,
+            "imported": self.imported,
+            "failed": self.failed,
+            "errors": self.errors,
+            "errors_truncated": self.failed > len(self.errors),
+        }
+
+    def _record_error(self, row_number: int, errors: List[str]) -> None:
+        self.failed += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({"row": row_number, "errors": errors})
+
+    def _import_chunk(self, chunk: List[Tuple[int, Dict]]) -> None:
+        self.total += len(chunk)
+
+        valid_rows: List[int] = []
+        values: List[Dict] = []
+        for row_number, record in chunk:
+            if "__error__" in record:
+                self._record_error(row_number, [record["__error__"]])
+                continue
+            try:
+                row = ProjectImportRow.model_validate(record)
+            except ValidationError as e:
+                self._record_error(row_number, [
+                    f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}"
+                    for error in e.errors()
+                ])
+                continue
+            valid_rows.append(row_number)
+            values.append(row.model_dump())
+
+        if not values:
+            return
+
+        # Derive room_area for the whole chunk in one pass
+        now = datetime.utcnow()
+        for value in values:
+            length = value.get("room_length")
+            width = value.get("room_width")
+            value["room_area"] = length * width if length and width else None
+            value["company_id"] = self.company_id
+            value["created_by"] = self.created_by
+            if value["created_at"] is None:
+                value["created_at"] = now
+            value["updated_at"] = now
+
+        try:
+            self.db.execute(insert(Project), values)
+            self.db.commit()
+        except SQLAlchemyError as e:
+            self.db.rollback()
+            message = f"Chunk insert failed: {e.__class__.__name__}"
+            for row_number in valid_rows:
+                self._record_error(row_number, [message])
+            return
+
+        self.imported += len(values)
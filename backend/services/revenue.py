@@ -0,0 +1,307 @@
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import Date, cast, delete, event, func, insert, inspect, select, union_all, update
+from sqlalchemy.engine import Connection
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from database import engine
+from models.archive import invoices_archive
+from models.invoice import Invoice, InvoiceStatus
+from models.project import Project
+from models.revenue import RevenueDaily
+
+BUCKETS = ("day", "week", "month")
+
+# Longest range a single time-series request may cover
+MAX_RANGE_DAYS = 3660
+
+# Invoice attributes that decide whether and where an invoice counts as revenue
+TRACKED_ATTRIBUTES = ("status", "company_id", "total_amount", "paid_date", "created_at")
+
+Key = Tuple[int, date]
+
+
+def _contribution(values: Dict[str, Any]) -> Optional[Tuple[Key, Decimal]]:
+    """Get the (company, day) and amount an invoice in this state adds to the rollup."""
+    if values["status"] != InvoiceStatus.PAID or values["company_id"] is None:
+        return None
+    paid_at = values["paid_date"] or values["created_at"] or datetime.utcnow()
+    return (values["company_id"], paid_at.date()), Decimal(values["total_amount"] or 0)
+
+
+def _current_values(invoice: Invoice) -> Dict[str, Any]:
+    return {name: getattr(invoice, name) for name in TRACKED_ATTRIBUTES}
+
+
+def _previous_values(invoice: Invoice) -> Dict[str, Any]:
+    state = inspect(invoice)
+    values = {}
+    for name in TRACKED_ATTRIBUTES:
+        history = state.attrs[name].load_history()
+        if history.deleted:
+            values[name] = history.deleted[0]
+        elif history.unchanged:
+            values[name] = history.unchanged[0]
+        else:
+            values[name] = None
+    return values
+
+
+def _stamp_paid_date(session: Session, flush_context, instances) -> None:
+    # Invoices marked paid without a payment date are booked on the day they were marked
+    for invoice in list(session.new) + list(session.dirty):
+        if isinstance(invoice, Invoice) and invoice.status == InvoiceStatus.PAID and invoice.paid_date is None:
+            invoice.paid_date = datetime.utcnow()
+
+
+def _track_invoice_changes(session: Session, flush_context) -> None:
+    # Runs inside the flush transaction, while new/dirty/deleted and attribute
+    # history still describe the changes just written
+    deltas: Dict[Key, List] = defaultdict(lambda: [Decimal(0), 0])
+
+    for invoice in session.new:
+        if isinstance(invoice, Invoice):
+            added = _contribution(_current_values(invoice))
+            if added:
+                deltas[added[0]][0] += added[1]
+                deltas[added[0]][1] += 1
+
+    for invoice in session.dirty:
+        if isinstance(invoice, Invoice) and session.is_modified(invoice):
+            removed = _contribution(_previous_values(invoice))
+            added = _contribution(_current_values(invoice))
+            if removed == added:
+                continue
+            if removed:
+                deltas[removed[0]][0] -= removed[1]
+                deltas[removed[0]][1] -= 1
+            if added:
+                deltas[added[0]][0] += added[1]
+                deltas[added[0]][1] += 1
+
+    for invoice in session.deleted:
+        if isinstance(invoice, Invoice):
+            removed = _contribution(_previous_values(invoice))
+            if removed:
+                deltas[removed[0]][0] -= removed[1]
+                deltas[removed[0]][1] -= 1
+
+    if deltas:
+        connection = session.connection()
+        for (company_id, day), (amount, count) in deltas.items():
+            if amount or count:
+                apply_revenue_delta(connection, company_id, day, amount, count)
+
+
+def _untrack_cascaded_invoices(mapper, connection: Connection, project: Project) -> None:
+    # Project.invoices uses passive_deletes, so invoices not loaded in the
+    # session are removed by ON DELETE CASCADE and never reach the flush
+    # hooks. Take their revenue out in the same transaction, just before the
+    # project row goes; invoices deleted through the ORM are already gone.
+    rows = connection.execute(
+        select(*[getattr(Invoice, name) for name in TRACKED_ATTRIBUTES])
+        .where(Invoice.project_id == project.id, Invoice.status == InvoiceStatus.PAID)
+    ).mappings()
+    deltas: Dict[Key, List] = defaultdict(lambda: [Decimal(0), 0])
+    for row in rows:
+        removed = _contribution(row)
+        if removed:
+            deltas[removed[0]][0] -= removed[1]
+            deltas[removed[0]][1] -= 1
+    for (company_id, day), (amount, count) in deltas.items():
+        apply_revenue_delta(connection, company_id, day, amount, count)
+
+
+def apply_revenue_delta(conn: Connection, company_id: int, day: date, amount: Decimal, count: int) -> None:
+    """
+    Add to a company's revenue for one day, creating the row if needed.
+
+    Args:
+        conn: Connection in the transaction that changed the invoices
+        company_id: Company ID
+        day: Day the revenue is booked on
+        amount: Amount to add (negative to remove)
+        count: Number of paid invoices to add (negative to remove)
+    """
+    if conn.dialect.name in ("postgresql", "sqlite"):
+        if conn.dialect.name == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert as dialect_insert
+        else:
+            from sqlalchemy.dialects.sqlite import insert as dialect_insert
+        statement = dialect_insert(RevenueDaily).values(
+            company_id=company_id, day=day, amount=amount, invoice_count=count
+        )
+        conn.execute(statement.on_conflict_do_update(
+            index_elements=[RevenueDaily.company_id, RevenueDaily.day],
+            set_={
+                "amount": RevenueDaily.amount + statement.excluded.amount,
+                "invoice_count": RevenueDaily.invoice_count + statement.excluded.invoice_count,
+            }
+        ))
+        return
+
+    updated = conn.execute(
+        update(RevenueDaily)
+        .where(RevenueDaily.company_id == company_id, RevenueDaily.day == day)
+        .values(amount=RevenueDaily.amount + amount, invoice_count=RevenueDaily.invoice_count + count)
+    ).rowcount
+    if not updated:
+        conn.execute(insert(RevenueDaily).values(company_id=company_id, day=day, amount=amount, invoice_count=count))
+
+
+def install_revenue_tracking() -> None:
+    """
+    Keep revenue_daily up to date as invoices are paid, un-paid, changed
+    or deleted through the ORM, including invoices the database deletes
+    along with a project deleted through the ORM.
+
+    Core statements (update(Invoice), delete(Invoice), raw SQL) do not go
+    through the session and bypass the tracking: a Core writer that moves
+    invoices into or out of PAID, or changes a paid invoice's amount,
+    company or paid date, must call apply_revenue_delta() in its own
+    transaction or be followed by rebuild_revenue().
+    """
+    if event.contains(Session, "after_flush", _track_invoice_changes):
+        return
+    # Load old values on change so history always has the previous state
+    for name in TRACKED_ATTRIBUTES:
+        event.listen(getattr(Invoice, name), "set", lambda *args: None, active_history=True)
+    event.listen(Session, "before_flush", _stamp_paid_date)
+    event.listen(Session, "after_flush", _track_invoice_changes)
+    event.listen(Project, "before_delete", _untrack_cascaded_invoices)
+
+
+def _paid_day(column):
+    """SQL expression for the calendar day of a timestamp column."""
+    if engine.dialect.name == "sqlite":
+        return func.date(column)
+    return cast(column, Date)
+
+
+def rebuild_revenue(company_id: Optional[int] = None) -> int:
+    """
+    Recompute the revenue rollup from live and archived paid invoices,
+    in one transaction.
+
+    Args:
+        company_id: Only rebuild this company (default: all companies)
+
+    Returns:
+        int: Number of (company, day) rows written
+    """
+    sources = []
+    for table in (Invoice.__table__, invoices_archive):
+        source = select(
+            table.c.company_id,
+            _paid_day(func.coalesce(table.c.paid_date, table.c.created_at)).label("day"),
+            table.c.total_amount,
+        ).where(table.c.status == InvoiceStatus.PAID)
+        if company_id is not None:
+            source = source.where(table.c.company_id == company_id)
+        sources.append(source)
+    paid = union_all(*sources).subquery()
+
+    with engine.begin() as conn:
+        clear = delete(RevenueDaily)
+        if company_id is not None:
+            clear = clear.where(RevenueDaily.company_id == company_id)
+        conn.execute(clear)
+        return conn.execute(insert(RevenueDaily).from_select(
+            ["company_id", "day", "amount", "invoice_count"],
+            select(paid.c.company_id, paid.c.day, func.sum(paid.c.total_amount), func.count())
+            .group_by(paid.c.company_id, paid.c.day)
+        )).rowcount
+
+
+def backfill_revenue() -> int:
+    """
+    Fill the rollup from paid invoices if it is empty, e.g. the first time
+    the application starts after revenue_daily was added. Does nothing once
+    any row exists.
+
+    Returns:
+        int: Number of (company, day) rows written
+    """
+    with engine.connect() as conn:
+        if conn.execute(select(RevenueDaily.company_id).limit(1)).first():
+            return 0
+    try:
+        return rebuild_revenue()
+    except IntegrityError:
+        # Another worker starting at the same time filled it first
+        return 0
+
+
+def bucket_start(day: date, bucket: str) -> date:
+    """
+    Get the first day of the bucket containing a day.
+
+    Args:
+        day: Any day
+        bucket: "day", "week" (starting Monday) or "month"
+
+    Returns:
+        date: Start of the bucket
+    """
+    if bucket == "week":
+        return day - timedelta(days=day.weekday())
+    if bucket == "month":
+        return day.replace(day=1)
+    return day
+
+
+def _next_bucket(start: date, bucket: str) -> date:
+    if bucket == "week":
+        return start + timedelta(days=7)
+    if bucket == "month":
+        return (start.replace(day=28) + timedelta(days=4)).replace(day=1)
+    return start + timedelta(days=1)
+
+
+def revenue_series(db: Session, company_id: int, start: date, end: date, bucket: str) -> Dict[str, Any]:
+    """
+    Build a company's revenue time series from the daily rollup.
+
+    Args:
+        db: Database session
+        company_id: Company ID
+        start: First day (inclusive)
+        end: Last day (inclusive)
+        bucket: "day", "week" or "month"
+
+    Returns:
+        Buckets from start to end (empty ones included) and the range total
+    """
+    rows = db.query(RevenueDaily.day, RevenueDaily.amount, RevenueDaily.invoice_count).filter(
+        RevenueDaily.company_id == company_id,
+        RevenueDaily.day >= start,
+        RevenueDaily.day <= end
+    ).all()
+
+    totals: Dict[date, List] = defaultdict(lambda: [Decimal(0), 0])
+    for day, amount, count in rows:
+        bucket_total = totals[bucket_start(day, bucket)]
+        bucket_total[0] += amount or 0
+        bucket_total[1] += count or 0
+
+    series = []
+    period = bucket_start(start, bucket)
+    while period <= end:
+        amount, count = totals.get(period, (Decimal(0), 0))
+        series.append({"period": period, "amount": float(amount), "invoices": count})
+        period = _next_bucket(period, bucket)
+
+    return {
+        "bucket": bucket,
+        "start": start,
+        "end": end,
+        "total": float(sum(amount for amount, _ in totals.values())),
+        "series": series,
+    }
+
+
+install_revenue_tracking()
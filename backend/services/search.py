@@ -0,0 +1,189 @@
+import re
+from typing import Any, List, Sequence
+
+from sqlalchemy import column, table, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from models.project import Project
+
+# Columns indexed for search, in bm25 weight order
+SEARCH_COLUMNS = "name, client_name, client_address, description"
+
+# SQLite (dev profile): external-content FTS5 table kept in sync by triggers.
+# company_id is indexed as a token so the tenant is constrained inside MATCH.
+SQLITE_INDEX_DDL = [
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS projects_fts USING fts5(
+        {SEARCH_COLUMNS}, company_id,
+        content='projects', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS projects_fts_ai AFTER INSERT ON projects BEGIN
+        INSERT INTO projects_fts(rowid, {SEARCH_COLUMNS}, company_id)
+        VALUES (new.id, new.name, new.client_name, new.client_address, new.description, new.company_id);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS projects_fts_ad AFTER DELETE ON projects BEGIN
+        INSERT INTO projects_fts(projects_fts, rowid, {SEARCH_COLUMNS}, company_id)
+        VALUES ('delete', old.id, old.name, old.client_name, old.client_address, old.description, old.company_id);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS projects_fts_au
+    AFTER UPDATE OF {SEARCH_COLUMNS}, company_id ON projects BEGIN
+        INSERT INTO projects_fts(projects_fts, rowid, {SEARCH_COLUMNS}, company_id)
+        VALUES ('delete', old.id, old.name, old.client_name, old.client_address, old.description, old.company_id);
+        INSERT INTO projects_fts(rowid, {SEARCH_COLUMNS}, company_id)
+        VALUES (new.id, new.name, new.client_name, new.client_address, new.description, new.company_id);
+    END
+    """,
+]
+
+# Drops an index created before it was tenant-scoped, so it can be rebuilt
+SQLITE_DROP_DDL = [
+    "DROP TRIGGER IF EXISTS projects_fts_ai",
+    "DROP TRIGGER IF EXISTS projects_fts_ad",
+    "DROP TRIGGER IF EXISTS projects_fts_au",
+    "DROP TABLE IF EXISTS projects_fts",
+]
+
+# Postgres (production): weighted tsvector expression with a GIN index.
+# The index is on the expression itself, so it is always in sync with the row.
+PG_SEARCH_VECTOR = (
+    "setweight(to_tsvector('simple', coalesce(projects.name, '')), 'A') || "
+    "setweight(to_tsvector('simple', coalesce(projects.client_name, '')), 'A') || "
+    "setweight(to_tsvector('simple', coalesce(projects.client_address, '')), 'B') || "
+    "setweight(to_tsvector('simple', coalesce(projects.description, '')), 'C')"
+)
+
+# The composite (company_id, vector) GIN index, via btree_gin, keeps a
+# search within the tenant's entries instead of scanning every company's
+POSTGRES_INDEX_DDL = [
+    "CREATE EXTENSION IF NOT EXISTS btree_gin",
+    f"CREATE INDEX IF NOT EXISTS ix_projects_search_tenant ON projects USING GIN (company_id, ({PG_SEARCH_VECTOR}))",
+    "DROP INDEX IF EXISTS ix_projects_search",
+]
+
+projects_fts = table("projects_fts", column("rowid"))
+
+_TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+
+def search_terms(query: str) -> List[str]:
+    """
+    Split a user query into plain word tokens.
+    Operators and punctuation are dropped so input can never break the
+    FTS5/tsquery syntax.
+
+    Args:
+        query: Raw search text
+
+    Returns:
+        List of lower-cased tokens
+    """
+    return [token.lower() for token in _TOKEN_PATTERN.findall(query)]
+
+
+def ensure_search_index(engine: Engine) -> None:
+    """
+    Create the project search index if it does not exist yet.
+    A newly created SQLite index is populated from existing projects; one
+    created before the index was tenant-scoped is dropped and rebuilt.
+
+    Args:
+        engine: SQLAlchemy engine
+    """
+    dialect = engine.dialect.name
+
+    with engine.begin() as conn:
+        if dialect == "sqlite":
+            existing = conn.execute(text(
+                "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'projects_fts'"
+            )).scalar()
+            if existing is not None and "company_id" not in existing:
+                for statement in SQLITE_DROP_DDL:
+                    conn.execute(text(statement))
+                existing = None
+            for statement in SQLITE_INDEX_DDL:
+                conn.execute(text(statement))
+            if existing is None:
+                conn.execute(text("INSERT INTO projects_fts(projects_fts) VALUES ('rebuild')"))
+        elif dialect == "postgresql":
+            for statement in POSTGRES_INDEX_DDL:
+                conn.execute(text(statement))
+
+
+class ProjectSearch:
+    """
+    Service class for ranked, tenant-scoped project search.
+    Uses SQLite FTS5 in development and a Postgres tsvector/GIN index in production.
+    """
+
+    @staticmethod
+    def search(
+        db: Session,
+        company_id: int,
+        query: str,
+        fields: Sequence[str],
+        limit: int = 20,
+        offset: int = 0
+    ) -> List[Any]:
+        """
+        Search a company's projects by name, client, address and description.
+        Every term must match; the last term also matches as a prefix.
+
+        Args:
+            db: Database session
+            company_id: Company whose projects are searched
+            query: Raw search text
+            fields: Project columns to return for each hit
+            limit: Maximum number of results
+            offset: Number of results to skip
+
+        Returns:
+            List of rows ordered by relevance
+        """
+        terms = search_terms(query)
+        if not terms:
+            return []
+
+        columns = [getattr(Project, name) for name in fields]
+        dialect = db.get_bind().dialect.name
+
+        if dialect == "sqlite":
+            # Terms only match the text columns; the tenant is part of the MATCH
+            phrases = " ".join(f'"{term}"' for term in terms[:-1]) + f' "{terms[-1]}"*'
+            match = f'company_id : "{int(company_id)}" AND {{{SEARCH_COLUMNS.replace(",", "")}}} : ({phrases.strip()})'
+            rank = text("bm25(projects_fts, 10.0, 10.0, 4.0, 1.0, 0.0)")
+            statement = db.query(*columns).join(
+                projects_fts, projects_fts.c.rowid == Project.id
+            ).filter(
+                text("projects_fts MATCH :match"),
+                Project.company_id == company_id
+            ).order_by(rank).params(match=match)
+        elif dialect == "postgresql":
+            tsquery = " & ".join(terms[:-1] + [f"{terms[-1]}:*"])
+            statement = db.query(*columns).filter(
+                text(f"({PG_SEARCH_VECTOR}) @@ to_tsquery('simple', :tsquery)"),
+                Project.company_id == company_id
+            ).order_by(
+                text(f"ts_rank({PG_SEARCH_VECTOR}, to_tsquery('simple', :tsquery)) DESC")
+            ).params(tsquery=tsquery)
+        else:
+            # Fallback for other databases: unranked substring match
+            statement = db.query(*columns).filter(Project.company_id == company_id)
+            for term in terms:
+                pattern = f"%{term}%"
+                statement = statement.filter(
+                    Project.name.ilike(pattern)
+                    | Project.client_name.ilike(pattern)
+                    | Project.client_address.ilike(pattern)
+                    | Project.description.ilike(pattern)
+                )
+            statement = statement.order_by(Project.created_at.desc())
+
+        return statement.offset(offset).limit(limit).all()
@@ -0,0 +1,163 @@
+from decimal import Decimal
+from typing import Any, Collection, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import orjson
+from fastapi import HTTPException, status
+from fastapi.responses import JSONResponse
+
+
+def _default(obj: Any) -> Any:
+    """
+    Fallback encoder for types orjson does not handle natively.
+
+    Numeric columns come back from the database as Decimal; the response
+    models declare them as float, so they are emitted the same way.
+    """
+    if isinstance(obj, Decimal):
+        return float(obj)
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+def dumps(content: Any) -> bytes:
+    """
+    Serialize content to JSON bytes with orjson.
+
+    Args:
+        content: JSON-compatible content (Decimal values are emitted as floats)
+
+    Returns:
+        Encoded JSON
+    """
+    return orjson.dumps(content, default=_default)
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSON response rendered with orjson.
+
+    Used by list endpoints that return plain column rows, so the payload
+    skips Pydantic validation and the standard library JSON encoder.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def response_columns(entity: Any, fields: Sequence[str]) -> List[Any]:
+    """
+    Get the mapped columns needed to build a response.
+
+    Args:
+        entity: SQLAlchemy mapped class (e.g. Project)
+        fields: Response field names, each matching a column attribute
+
+    Returns:
+        List of column attributes in field order
+    """
+    return [getattr(entity, name) for name in fields]
+
+
+def readable_fields(
+    allowed: Sequence[str],
+    role: Any = None,
+    permissions: Optional[Dict[str, Collection[Any]]] = None
+) -> Tuple[str, ...]:
+    """
+    Drop the fields a role may not read.
+
+    Args:
+        allowed: Field names, in output order
+        role: Role of the current user
+        permissions: Optional mapping of field name to roles allowed to read it
+
+    Returns:
+        Tuple of the readable field names, in the given order
+    """
+    if not permissions:
+        return tuple(allowed)
+    return tuple(name for name in allowed if name not in permissions or role in permissions[name])
+
+
+def parse_fields(
+    fields: Optional[str],
+    allowed: Sequence[str],
+    role: Any = None,
+    permissions: Optional[Dict[str, Collection[Any]]] = None
+) -> Tuple[str, ...]:
+    """
+    Parse a sparse fieldset (``?fields=id,name,status``) for a response.
+
+    The ``id`` field is always included. Omitting ``fields`` selects every
+    field the role may read; explicitly requesting a field the role may not
+    read is refused.
+
+    Args:
+        fields: Comma-separated field names from the query string, or None
+        allowed: Field names of the response model, in output order
+        role: Role of the current user
+        permissions: Optional mapping of field name to roles allowed to read it
+
+    Returns:
+        Tuple of selected field names in response model order
+
+    Raises:
+        HTTPException: If a field is unknown or not readable by the role
+    """
+    if fields is None:
+        return readable_fields(allowed, role, permissions)
+
+    requested = {name.strip() for name in fields.split(",") if name.strip()}
+    unknown = requested.difference(allowed)
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown fields: {', '.join(sorted(unknown))}"
+        )
+
+    if permissions:
+        denied = [name for name in requested if name in permissions and role not in permissions[name]]
+        if denied:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail=f"Access denied to fields: {', '.join(sorted(denied))}"
+            )
+
+    requested.add("id")
+    return tuple(name for name in allowed if name in requested)
+
+
+def reject_nulls(data: Any, fields: Iterable[str]) -> None:
+    """
+    Refuse a partial update that explicitly sets required fields to null.
+
+    Update models make every field optional so it can be left out, which
+    also lets ``{"field": null}`` through; for NOT NULL columns that would
+    fail in the database or store a NULL the application can't handle.
+
+    Args:
+        data: Parsed request body (a Pydantic model)
+        fields: Names of fields that may be omitted but not null
+
+    Raises:
+        HTTPException: If any of the fields was given as null
+    """
+    nulls = [name for name in fields if name in data.model_fields_set and getattr(data, name) is None]
+    if nulls:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Fields may not be null: {', '.join(sorted(nulls))}"
+        )
+
+
+def rows_to_dicts(rows: Iterable[Sequence[Any]], fields: Sequence[str]) -> List[dict]:
+    """
+    Convert column rows into plain dictionaries.
+
+    Args:
+        rows: Rows returned by a column-projected query
+        fields: Field names, in the same order as the selected columns
+
+    Returns:
+        List of dictionaries ready for FastJSONResponse
+    """
+    return [dict(zip(fields, row)) for row in rows]
@@ -0,0 +1,113 @@
+import asyncio
+import time
+from collections import defaultdict
+from typing import Any, Callable, Dict, Hashable, Tuple
+
+from starlette.concurrency import run_in_threadpool
+
+from config import settings
+from services.metrics import (
+    single_flight_cache_hits_total,
+    single_flight_coalesced_total,
+    single_flight_executions_total,
+)
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent identical computations into one.
+
+    Callers pass a key of the form (endpoint, tenant, params...). While a
+    computation for a key is in flight, further callers with the same key
+    wait for its result instead of starting their own. Results can also be
+    kept in a short micro-cache.
+
+    The computation runs as its own task in the threadpool, so a caller
+    that disconnects does not cancel it for the others. Computations must
+    therefore open their own database session.
+    """
+
+    def __init__(self, cache_ttl: float = 0.0):
+        self.cache_ttl = cache_ttl
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+        self._cache: Dict[Hashable, Tuple[float, Any]] = {}
+        # Counters per endpoint (first element of the key)
+        self.executions: Dict[str, int] = defaultdict(int)
+        self.coalesced: Dict[str, int] = defaultdict(int)
+        self.cache_hits: Dict[str, int] = defaultdict(int)
+        self.waiting: Dict[str, int] = defaultdict(int)
+
+    async def do(self, key: Tuple[Hashable, ...], func: Callable[..., Any], *args: Any) -> Any:
+        """
+        Run func(*args) once per key across concurrent callers.
+
+        Args:
+            key: Tuple whose first element names the endpoint
+            func: Blocking function computing the result
+            args: Arguments passed to func
+
+        Returns:
+            The (shared) result of func
+        """
+        endpoint = str(key[0])
+
+        if self.cache_ttl > 0:
+            entry = self._cache.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                self.cache_hits[endpoint] += 1
+                single_flight_cache_hits_total.inc(endpoint)
+                return entry[1]
+
+        task = self._inflight.get(key)
+        if task is None:
+            self.executions[endpoint] += 1
+            single_flight_executions_total.inc(endpoint)
+            task = asyncio.ensure_future(run_in_threadpool(func, *args))
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._finish(key, done))
+        else:
+            self.coalesced[endpoint] += 1
+            single_flight_coalesced_total.inc(endpoint)
+
+        self.waiting[endpoint] += 1
+        try:
+            return await asyncio.shield(task)
+        finally:
+            self.waiting[endpoint] -= 1
+
+    def _finish(self, key: Tuple[Hashable, ...], task: asyncio.Future) -> None:
+        self._inflight.pop(key, None)
+        if task.cancelled() or task.exception() is not None:
+            return
+        if self.cache_ttl > 0:
+            self._cache[key] = (time.monotonic() + self.cache_ttl, task.result())
+
+    def invalidate(self, key: Tuple[Hashable, ...]) -> None:
+        """
+        Drop a micro-cached result.
+
+        Args:
+            key: Key of the cached computation
+        """
+        self._cache.pop(key, None)
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """
+        Get coalescing counters per endpoint.
+
+        Returns:
+            Mapping of endpoint to executions, coalesced, cache_hits and waiting counts
+        """
+        endpoints = set(self.executions) | set(self.coalesced) | set(self.cache_hits)
+        return {
+            endpoint: {
+                "executions": self.executions[endpoint],
+                "coalesced": self.coalesced[endpoint],
+                "cache_hits": self.cache_hits[endpoint],
+                "waiting": self.waiting[endpoint],
+            }
+            for endpoint in sorted(endpoints)
+        }
+
+
+dashboard_flight = SingleFlight(cache_ttl=settings.DASHBOARD_CACHE_SECONDS)
@@ -0,0 +1,180 @@
+import hashlib
+import logging
+import re
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Deque, Dict, List, Optional
+
+from sqlalchemy.engine import Engine
+
+from config import settings
+from services.metrics import current_request_stats, route_template
+
+logger = logging.getLogger(__name__)
+
+# Execution option saying whether a connection's slow statements are
+# recorded (default True); set it to False to keep them out of the log
+RECORD_OPTION = "slow_query_log"
+
+STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+NUMBER_LITERAL = re.compile(r"(?<![\w.])-?\d+(?:\.\d+)?\b")
+NAMED_PARAMETER = re.compile(r"%\(\w+\)s|(?<!:):[A-Za-z_]\w*|\$\d+")
+PLACEHOLDER_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_statement(statement: str) -> str:
+    """
+    Reduce a SQL statement to its shape: literals and bound parameters become
+    "?", IN lists of any length collapse to "(?+)", whitespace is folded.
+
+    Args:
+        statement: SQL as sent to the driver
+
+    Returns:
+        Normalized statement
+    """
+    normalized = STRING_LITERAL.sub("?", statement)
+    normalized = NAMED_PARAMETER.sub("?", normalized)
+    normalized = NUMBER_LITERAL.sub("?", normalized)
+    normalized = PLACEHOLDER_LIST.sub("(?+)", normalized)
+    return WHITESPACE.sub(" ", normalized).strip()
+
+
+def _digest(value: str) -> str:
+    return hashlib.blake2b(value.encode("utf-8"), digest_size=8).hexdigest()
+
+
+class SlowQueryLog:
+    """
+    Bounded in-memory log of statements slower than a threshold.
+
+    Each entry keeps the normalized statement, its fingerprint, a fingerprint
+    of the parameters (never the values themselves), the duration and the
+    route that ran it. The first time a SELECT fingerprint is seen its plan
+    is captured with EXPLAIN (EXPLAIN QUERY PLAN on SQLite) on a background
+    thread, using the parameters of that occurrence.
+    """
+
+    def __init__(self, capacity: int, threshold_ms: float):
+        self.threshold = threshold_ms / 1000
+        self._entries: Deque[Dict[str, Any]] = deque(maxlen=capacity)
+        self._plans: Dict[str, Optional[List[str]]] = {}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="explain")
+
+    def record(
+        self,
+        engine: Engine,
+        statement: str,
+        parameters: Any,
+        duration: float,
+        executemany: bool = False
+    ) -> None:
+        """
+        Log a slow statement and schedule EXPLAIN for new SELECT shapes.
+
+        Args:
+            engine: Engine that executed the statement
+            statement: SQL as sent to the driver
+            parameters: Driver parameters of this execution
+            duration: Execution time in seconds
+            executemany: Whether the statement ran with a parameter list
+        """
+        normalized = normalize_statement(statement)
+        fingerprint = _digest(normalized)
+        stats = current_request_stats.get()
+        route = route_template(stats.scope) if stats is not None and stats.scope is not None else None
+
+        entry = {
+            "fingerprint": fingerprint,
+            "statement": normalized,
+            "parameters_fingerprint": _digest(repr(parameters)),
+            "duration_ms": round(duration * 1000, 3),
+            "route": route,
+            "recorded_at": datetime.utcnow(),
+        }
+
+        explain = False
+        with self._lock:
+            self._entries.append(entry)
+            if fingerprint not in self._plans and not executemany and normalized[:6].upper() == "SELECT":
+                self._plans[fingerprint] = None
+                explain = True
+
+        if explain:
+            self._executor.submit(self._explain, engine, fingerprint, statement, parameters)
+
+    def _explain(self, engine: Engine, fingerprint: str, statement: str, parameters: Any) -> None:
+        sqlite = engine.dialect.name == "sqlite"
+        prefix = "EXPLAIN QUERY PLAN " if sqlite else "EXPLAIN "
+        try:
+            with engine.connect() as conn:
+                conn.execution_options(**{RECORD_OPTION: False})
+                result = conn.exec_driver_sql(prefix + statement, parameters)
+                # SQLite rows are (id, parent, notused, detail); PostgreSQL rows are plan lines
+                plan = [str(row[-1]) if sqlite else str(row[0]) for row in result]
+        except Exception as exc:
+            logger.warning("EXPLAIN failed for slow query %s: %s", fingerprint, exc)
+            plan = [f"EXPLAIN failed: {exc}"]
+        with self._lock:
+            self._plans[fingerprint] = plan
+
+    def aggregate(self, limit: int = 50) -> List[Dict[str, Any]]:
+        """
+        Group logged statements by fingerprint.
+
+        Args:
+            limit: Maximum number of fingerprints to return
+
+        Returns:
+            Per-fingerprint statistics, slowest total time first
+        """
+        with self._lock:
+            entries = list(self._entries)
+            plans = dict(self._plans)
+
+        groups: Dict[str, Dict[str, Any]] = {}
+        for entry in entries:
+            group = groups.get(entry["fingerprint"])
+            if group is None:
+                group = groups[entry["fingerprint"]] = {
+                    "fingerprint": entry["fingerprint"],
+                    "statement": entry["statement"],
+                    "count": 0,
+                    "total_ms": 0.0,
+                    "max_ms": 0.0,
+                    "routes": set(),
+                    "parameter_sets": set(),
+                    "last_seen": entry["recorded_at"],
+                }
+            group["count"] += 1
+            group["total_ms"] += entry["duration_ms"]
+            group["max_ms"] = max(group["max_ms"], entry["duration_ms"])
+            group["last_seen"] = max(group["last_seen"], entry["recorded_at"])
+            group["parameter_sets"].add(entry["parameters_fingerprint"])
+            if entry["route"]:
+                group["routes"].add(entry["route"])
+
+        results = sorted(groups.values(), key=lambda group: group["total_ms"], reverse=True)[:limit]
+        for group in results:
+            group["total_ms"] = round(group["total_ms"], 3)
+            group["avg_ms"] = round(group["total_ms"] / group["count"], 3)
+            group["routes"] = sorted(group["routes"])
+            group["parameter_sets"] = len(group["parameter_sets"])
+            group["plan"] = plans.get(group["fingerprint"])
+        return results
+
+    def clear(self) -> None:
+        """Drop all logged statements and captured plans."""
+        with self._lock:
+            self._entries.clear()
+            self._plans.clear()
+
+
+slow_query_log = SlowQueryLog(
+    capacity=settings.SLOW_QUERY_LOG_SIZE,
+    threshold_ms=settings.SLOW_QUERY_THRESHOLD_MS
+)
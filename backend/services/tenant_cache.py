@@ -0,0 +1,187 @@
+import time
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+
+from pydantic import BaseModel
+
+from config import settings
+from database import SessionLocal
+from services.invalidation import invalidation_bus
+from models.company import Company, CompanyStatus, SubscriptionPlan
+
+
+class CompanySnapshot(BaseModel):
+    """
+    Read-only copy of the company fields needed to serve tenant routes.
+    Detached from any session, so it can be shared between requests.
+    """
+    id: int
+    name: str
+    slug: str
+    email: str
+    logo_url: Optional[str]
+    primary_color: Optional[str]
+    secondary_color: Optional[str]
+    status: Optional[CompanyStatus]
+    subscription_plan: Optional[SubscriptionPlan]
+    updated_at: Optional[datetime]
+
+    class Config:
+        from_attributes = True
+        frozen = True
+
+
+SNAPSHOT_FIELDS = tuple(CompanySnapshot.model_fields)
+
+# Most unknown slugs remembered at once; a flood of random slugs starts over
+MAX_MISSES = 10000
+
+
+class TenantCache:
+    """
+    Process-local slug -> CompanySnapshot cache.
+    Entries expire after a TTL and are invalidated explicitly when a
+    company is created, updated or deleted. Unknown slugs are remembered
+    for a shorter TTL, so requests with made-up slugs don't each cost a
+    database query.
+    """
+
+    def __init__(self, ttl_seconds: float, miss_ttl_seconds: float = 0):
+        self.ttl_seconds = ttl_seconds
+        self.miss_ttl_seconds = miss_ttl_seconds
+        self._entries: Dict[str, Tuple[float, CompanySnapshot]] = {}
+        self._misses: Dict[str, float] = {}
+
+    def get(self, slug: str) -> Optional[CompanySnapshot]:
+        """
+        Get a cached snapshot without touching the database.
+
+        Args:
+            slug: Company slug
+
+        Returns:
+            The cached snapshot, or None if missing or expired
+        """
+        entry = self._entries.get(slug)
+        if entry is None:
+            return None
+        expires_at, snapshot = entry
+        if expires_at < time.monotonic():
+            self._entries.pop(slug, None)
+            return None
+        return snapshot
+
+    def is_unknown(self, slug: str) -> bool:
+        """
+        Check whether a slug recently failed to resolve.
+
+        Args:
+            slug: Company slug
+
+        Returns:
+            bool: True if no company had this slug within the miss TTL
+        """
+        expires_at = self._misses.get(slug)
+        if expires_at is None:
+            return False
+        if expires_at < time.monotonic():
+            self._misses.pop(slug, None)
+            return False
+        return True
+
+    def resolve(self, slug: str) -> Optional[CompanySnapshot]:
+        """
+        Resolve a company slug, loading it from the database on a cache miss.
+        Unknown slugs are remembered for miss_ttl_seconds; creating a
+        company invalidates its slug, so it resolves at once anyway.
+        Companies being purged do not resolve.
+
+        Args:
+            slug: Company slug
+
+        Returns:
+            The company snapshot, or None if no company has this slug
+        """
+        snapshot = self.get(slug)
+        if snapshot is not None:
+            return snapshot
+        if self.is_unknown(slug):
+            return None
+
+        db = SessionLocal()
+        try:
+            row = db.query(
+                *[getattr(Company, name) for name in SNAPSHOT_FIELDS]
+            ).filter(Company.slug == slug, Company.deleted_at.is_(None)).first()
+        finally:
+            db.close()
+
+        if row is None:
+            if self.miss_ttl_seconds > 0:
+                if len(self._misses) >= MAX_MISSES:
+                    self._misses.clear()
+                self._misses[slug] = time.monotonic() + self.miss_ttl_seconds
+            return None
+
+        snapshot = CompanySnapshot(**dict(zip(SNAPSHOT_FIELDS, row)))
+        self.put(snapshot)
+        return snapshot
+
+    def warm(self, limit: int = 500) -> int:
+        """
+        Load the most recently updated non-suspended companies into the cache.
+
+        Args:
+            limit: Maximum number of companies to load
+
+        Returns:
+            int: Number of snapshots cached
+        """
+        db = SessionLocal()
+        try:
+            rows = db.query(
+                *[getattr(Company, name) for name in SNAPSHOT_FIELDS]
+            ).filter(
+                Company.status != CompanyStatus.SUSPENDED,
+                Company.deleted_at.is_(None)
+            ).order_by(Company.updated_at.desc()).limit(limit).all()
+        finally:
+            db.close()
+
+        for row in rows:
+            self.put(CompanySnapshot(**dict(zip(SNAPSHOT_FIELDS, row))))
+        return len(rows)
+
+    def put(self, snapshot: CompanySnapshot) -> None:
+        """
+        Store a snapshot, e.g. to pre-warm the cache.
+
+        Args:
+            snapshot: Company snapshot to cache under its slug
+        """
+        self._entries[snapshot.slug] = (time.monotonic() + self.ttl_seconds, snapshot)
+        self._misses.pop(snapshot.slug, None)
+
+    def invalidate(self, *slugs: str) -> None:
+        """
+        Drop cached snapshots for the given slugs.
+
+        Args:
+            slugs: Company slugs to invalidate
+        """
+        for slug in slugs:
+            self._entries.pop(slug, None)
+            self._misses.pop(slug, None)
+
+    def clear(self) -> None:
+        """Drop all cached snapshots and unknown slugs."""
+        self._entries.clear()
+        self._misses.clear()
+
+
+tenant_cache = TenantCache(
+    ttl_seconds=settings.TENANT_CACHE_TTL_SECONDS,
+    miss_ttl_seconds=settings.TENANT_MISS_TTL_SECONDS
+)
+invalidation_bus.subscribe("tenant", tenant_cache.invalidate)
+invalidation_bus.on_resync(tenant_cache.clear)
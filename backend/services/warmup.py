@@ -0,0 +1,46 @@
+import asyncio
+import time
+
+from starlette.concurrency import run_in_threadpool
+
+from config import settings
+from database import engine
+from services.auth_service import get_pwd_context
+from services.tenant_cache import tenant_cache
+
+
+def prewarm() -> None:
+    """
+    Pay the first-request costs up front: open pooled database connections,
+    load company snapshots into the tenant cache and import the password
+    hashing and JWT libraries.
+    """
+    start = time.perf_counter()
+
+    connections = [engine.connect() for _ in range(settings.PREWARM_CONNECTIONS)]
+    for connection in connections:
+        connection.close()
+
+    companies = tenant_cache.warm()
+    get_pwd_context()
+    from jose import jwt  # noqa: F401
+
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    print(f"Pre-warm finished in {elapsed_ms:.0f} ms ({companies} companies cached)")
+
+
+def start_prewarm() -> asyncio.Task:
+    """
+    Run prewarm() in the threadpool without blocking startup, so the server
+    starts accepting connections while the pools and caches fill.
+
+    Returns:
+        The background task
+    """
+    async def run():
+        try:
+            await run_in_threadpool(prewarm)
+        except Exception as exc:
+            print(f"Pre-warm failed: {exc}")
+
+    return asyncio.create_task(run())
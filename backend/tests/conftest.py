@@ -0,0 +1,82 @@
+import json
+import os
+import sys
+import tempfile
+
+# Point the application at a throwaway SQLite database before it is imported
+_database = os.path.join(tempfile.mkdtemp(), "test.db")
+os.environ["DATABASE_URL"] = f"sqlite:///{_database}"
+os.environ["DEBUG"] = "False"
+os.environ["LIFECYCLE_SWEEP_ENABLED"] = "False"
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+from fastapi.testclient import TestClient
+
+from config import settings
+from database import SessionLocal, init_db
+from models.company import Company
+from models.user import User, UserRole
+from services.auth_service import AuthService
+from services.events import EVENTS_NAMESPACE
+from services.invalidation import invalidation_bus
+
+
+@pytest.fixture(scope="session")
+def client():
+    init_db(fast_start=False)
+    return TestClient(__import__("main").app)
+
+
+@pytest.fixture
+def db(client):
+    session = SessionLocal()
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def company(db):
+    """A fresh company and the auth headers of its owner."""
+    count = db.query(Company).count() + 1
+    company = Company(name=f"Company {count}", slug=f"company-{count}", email=f"c{count}@example.com")
+    db.add(company)
+    db.commit()
+    owner = User(
+        email=f"owner{count}@example.com",
+        password_hash=AuthService.get_password_hash("secret"),
+        first_name="Owner",
+        last_name=str(count),
+        role=UserRole.OWNER,
+        company_id=company.id,
+    )
+    db.add(owner)
+    db.commit()
+    token = AuthService.create_access_token({"sub": str(owner.id)})
+    return company, {"Authorization": f"Bearer {token}"}
+
+
+class ForwardedEvents:
+    """Records what this worker broadcasts and replays it into another bus."""
+
+    def __init__(self):
+        self.sent = []
+
+    def send(self, payload):
+        self.sent.append(payload)
+
+    def deliver(self, bus):
+        for payload in self.sent:
+            message = json.loads(payload)
+            if message["namespace"] == EVENTS_NAMESPACE:
+                for key in message["keys"]:
+                    bus._receive(key)
+
+
+@pytest.fixture
+def forwarded(client, monkeypatch):
+    """Events forwarded to other workers, captured instead of broadcast."""
+    transport = ForwardedEvents()
+    monkeypatch.setattr(settings, "INVALIDATION_BUS_ENABLED", True)
+    monkeypatch.setattr(invalidation_bus, "_get_transport", lambda: transport)
+    return transport
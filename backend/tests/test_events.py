@@ -0,0 +1,29 @@
+import json
+
+from services.events import EventBus
+
+
+def test_events_too_large_to_forward_reset_other_workers(forwarded, company):
+    company, _ = company
+    publisher, other = EventBus(10, 10), EventBus(10, 10)
+
+    publisher.publish(company.id, "projects.bulk_updated", {"ids": list(range(100000, 103000))})
+    forwarded.deliver(other)
+
+    [event] = other._buffers[company.id]
+    assert event.type == "reset"
+    assert event.id == publisher._buffers[company.id][0].id
+    assert other.replay(company.id, event.id - 1) == [event]
+
+
+def test_publish_chunked_splits_large_lists(forwarded, company):
+    company, _ = company
+    publisher, other = EventBus(10, 10), EventBus(10, 10)
+
+    ids = list(range(100000, 100250))
+    publisher.publish_chunked(company.id, "invoices.generated", {"ids": ids}, "ids")
+    forwarded.deliver(other)
+
+    events = list(other._buffers[company.id])
+    assert [event.type for event in events] == ["invoices.generated"] * 3
+    assert [id for event in events for id in json.loads(event.data)["ids"]] == ids
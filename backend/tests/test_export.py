@@ -0,0 +1,35 @@
+import csv
+import io
+from datetime import datetime, timedelta
+
+from models.invoice import Invoice, InvoiceStatus
+from models.project import Project, ProjectStatus
+from services.archive import archive_batch
+
+
+def exported_invoice_numbers(client, headers, slug, **params):
+    response = client.get(f"/api/companies/{slug}/export/invoices", params=params, headers=headers)
+    assert response.status_code == 200
+    return [row["invoice_number"] for row in csv.DictReader(io.StringIO(response.text))]
+
+
+def test_invoice_export_includes_archived_invoices(client, db, company):
+    company, headers = company
+    old = datetime.utcnow() - timedelta(days=3650)
+    closed = Project(company_id=company.id, name="Old", client_name="Ann", status=ProjectStatus.COMPLETED, updated_at=old)
+    live = Project(company_id=company.id, name="New", client_name="Bob")
+    db.add_all([closed, live])
+    db.flush()
+    db.add_all([
+        Invoice(
+            company_id=company.id, project_id=project.id, invoice_number=f"EXP-{company.id}-{project.id}",
+            client_name="Ann", client_email="ann@example.com", amount=1, total_amount=1, status=InvoiceStatus.PAID,
+        )
+        for project in (closed, live)
+    ])
+    db.commit()
+    everything = [f"EXP-{company.id}-{closed.id}", f"EXP-{company.id}-{live.id}"]
+    assert archive_batch(old + timedelta(days=1), 100) == 1
+
+    assert exported_invoice_numbers(client, headers, company.slug) == everything
+    assert exported_invoice_numbers(client, headers, company.slug, include_archived="false") == everything[1:]
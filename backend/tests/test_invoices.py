@@ -0,0 +1,42 @@
+import pytest
+
+
+def create_invoice(client, headers, company_id, **values):
+    response = client.post("/api/invoices/", json={
+        "client_name": "Ann", "client_email": "ann@example.com", "amount": 100, "company_id": company_id, **values
+    }, headers=headers)
+    assert response.status_code == 201, response.text
+    return response.json()
+
+
+@pytest.mark.parametrize("field", ["status", "client_name", "client_email", "amount"])
+def test_update_rejects_null_for_required_fields(client, company, field):
+    company, headers = company
+    invoice = create_invoice(client, headers, company.id)
+
+    response = client.put(f"/api/invoices/{invoice['id']}", json={field: None}, headers=headers)
+    assert response.status_code == 422
+
+    response = client.put(f"/api/invoices/{invoice['id']}", json={"status": "sent"}, headers=headers)
+    assert response.status_code == 200
+    assert response.json()["status"] == "sent"
+
+
+def test_projects_without_wastage_are_priced_with_the_default(client, db, company):
+    from models.project import Project
+
+    company, headers = company
+    project = client.post("/api/projects/", json={
+        "name": "Hall", "client_name": "Ann", "client_email": "ann@example.com",
+        "room_length": 4, "room_width": 2.5, "tile_length": 0.5, "tile_width": 0.5, "tile_price_per_unit": 3,
+    }, headers=headers).json()
+    db.query(Project).filter(Project.id == project["id"]).update({"wastage_percentage": None})
+    db.commit()
+
+    response = client.post("/api/invoices/batch", json={"project_ids": [project["id"]]}, headers=headers)
+    assert response.status_code == 200, response.text
+    assert [result["outcome"] for result in response.json()["results"]] == ["created"]
+
+    invoice = create_invoice(client, headers, company.id, project_id=project["id"], amount=None)
+    # 40 tiles plus 10% wastage at 3.00 each
+    assert invoice["amount"] == 132.0
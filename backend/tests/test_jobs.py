@@ -0,0 +1,30 @@
+from database import SessionLocal
+from models.job import Job, JobStatus
+from services.jobs import JobQueue
+
+
+def test_cancel_does_not_overwrite_a_job_that_just_finished(db, company):
+    company, _ = company
+    job = Job(kind="export", payload={}, company_id=company.id, status=JobStatus.RUNNING)
+    db.add(job)
+    db.commit()
+
+    # The worker finishes the job after the request loaded it
+    other = SessionLocal()
+    other.query(Job).filter(Job.id == job.id).update({"status": JobStatus.SUCCEEDED})
+    other.commit()
+    other.close()
+
+    assert JobQueue.cancel(db, job) is False
+    assert job.status == JobStatus.SUCCEEDED
+
+
+def test_cancel_queued_job(db, company):
+    company, _ = company
+    job = Job(kind="export", payload={}, company_id=company.id)
+    db.add(job)
+    db.commit()
+
+    assert JobQueue.cancel(db, job) is True
+    assert job.status == JobStatus.CANCELLED
+    assert job.finished_at is not None
@@ -0,0 +1,27 @@
+import json
+from datetime import datetime, timedelta
+
+from models.invoice import Invoice, InvoiceStatus
+from services.events import EventBus
+from services.lifecycle import sweep_overdue_invoices
+
+
+def test_sweep_events_reach_other_workers(forwarded, db, company):
+    company, _ = company
+    past = datetime.utcnow() - timedelta(days=1)
+    db.add_all([
+        Invoice(
+            company_id=company.id, invoice_number=f"INV-{company.id}-2026-{n:06d}", client_name="Ann",
+            client_email="ann@example.com", amount=1, total_amount=1, status=InvoiceStatus.SENT, due_date=past,
+        )
+        for n in range(250)
+    ])
+    db.commit()
+    other = EventBus(10, 10)
+
+    assert sweep_overdue_invoices(batch_size=1000) == 250
+    forwarded.deliver(other)
+
+    events = list(other._buffers[company.id])
+    assert {event.type for event in events} == {"invoices.overdue"}
+    assert sum(len(json.loads(event.data)["items"]) for event in events) == 250
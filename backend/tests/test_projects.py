@@ -0,0 +1,14 @@
+import pytest
+
+
+@pytest.mark.parametrize("field", ["name", "client_name", "status", "wastage_percentage"])
+def test_patch_rejects_null_for_required_fields(client, company, field):
+    company, headers = company
+    project = client.post("/api/projects/", json={"name": "Bath", "client_name": "Ann"}, headers=headers).json()
+
+    response = client.patch(f"/api/projects/{project['id']}", json={field: None}, headers=headers)
+    assert response.status_code == 422
+
+    response = client.get(f"/api/projects/{project['id']}", headers=headers).json()
+    assert response[field] == project[field]
+    assert response["version"] == project["version"]
@@ -0,0 +1,41 @@
+import pytest
+
+
+def create_quote(client, headers, company_id, **values):
+    response = client.post("/api/quotes/", json={
+        "client_name": "Ann", "client_email": "ann@example.com", "amount": 100, "tax_rate": 20,
+        "discount_amount": 5, "company_id": company_id, **values
+    }, headers=headers)
+    assert response.status_code == 201, response.text
+    return response.json()
+
+
+def test_update_recomputes_totals(client, company):
+    company, headers = company
+    quote = create_quote(client, headers, company.id)
+    assert (quote["tax_amount"], quote["total_amount"]) == (20.0, 115.0)
+
+    quote = client.put(f"/api/quotes/{quote['id']}", json={"amount": 200}, headers=headers).json()
+    assert (quote["tax_amount"], quote["discount_amount"], quote["total_amount"]) == (40.0, 5.0, 235.0)
+
+    quote = client.put(f"/api/quotes/{quote['id']}", json={"tax_rate": 10, "total_amount": 1}, headers=headers).json()
+    assert (quote["tax_amount"], quote["total_amount"]) == (20.0, 215.0)
+
+
+@pytest.mark.parametrize("final", ["accepted", "rejected", "expired"])
+def test_final_statuses_cannot_change(client, company, final):
+    company, headers = company
+    quote = create_quote(client, headers, company.id)
+    assert client.put(f"/api/quotes/{quote['id']}", json={"status": "sent"}, headers=headers).status_code == 200
+    assert client.put(f"/api/quotes/{quote['id']}", json={"status": final}, headers=headers).status_code == 200
+
+    response = client.put(f"/api/quotes/{quote['id']}", json={"status": "sent"}, headers=headers)
+    assert response.status_code == 409
+
+
+def test_update_rejects_null_status(client, company):
+    company, headers = company
+    quote = create_quote(client, headers, company.id)
+
+    response = client.put(f"/api/quotes/{quote['id']}", json={"status": None}, headers=headers)
+    assert response.status_code == 422
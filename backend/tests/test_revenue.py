@@ -0,0 +1,27 @@
+from models.revenue import RevenueDaily
+
+
+def revenue_rows(db, company_id):
+    db.expire_all()
+    return [
+        (row.amount, row.invoice_count)
+        for row in db.query(RevenueDaily).filter(RevenueDaily.company_id == company_id)
+    ]
+
+
+def test_deleting_project_removes_its_paid_invoices_from_revenue(client, db, company):
+    company, headers = company
+    project = client.post("/api/projects/", json={"name": "Kitchen", "client_name": "Ann"}, headers=headers).json()
+    invoice = client.post("/api/invoices/", json={
+        "project_id": project["id"], "client_email": "ann@example.com", "amount": 3.5
+    }, headers=headers).json()
+    assert client.put(f"/api/invoices/{invoice['id']}", json={"status": "sent"}, headers=headers).status_code == 200
+    assert client.put(f"/api/invoices/{invoice['id']}", json={"status": "paid"}, headers=headers).status_code == 200
+    assert [float(amount) for amount, _ in revenue_rows(db, company.id)] == [3.5]
+
+    assert client.delete(f"/api/projects/{project['id']}", headers=headers).status_code == 204
+
+    assert all(amount == 0 and count == 0 for amount, count in revenue_rows(db, company.id))
+    dashboard = client.get(f"/api/companies/{company.slug}/dashboard", headers=headers).json()
+    assert dashboard["invoices"]["total"] == 0
+    assert dashboard["revenue"]["total"] == 0
@@ -0,0 +1,36 @@
+from sqlalchemy import event
+
+from database import engine
+from models.company import Company
+from services.tenant_cache import tenant_cache
+
+
+def company_lookups(client, path, times):
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if "FROM companies" in statement:
+            statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        for _ in range(times):
+            assert client.get(path).status_code in (401, 403, 404)
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+    return len(statements)
+
+
+def test_unknown_slugs_are_looked_up_once(client):
+    assert company_lookups(client, "/api/companies/no-such-company/dashboard", 5) == 1
+
+
+def test_created_company_resolves_despite_earlier_miss(db):
+    assert tenant_cache.resolve("opening-soon") is None
+
+    db.add(Company(name="Opening Soon", slug="opening-soon", email="open@example.com"))
+    db.commit()
+    assert tenant_cache.resolve("opening-soon") is None
+
+    tenant_cache.invalidate("opening-soon")
+    assert tenant_cache.resolve("opening-soon").name == "Opening Soon"
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Background job worker.
+
+Claims queued jobs (exports, bulk imports, ...) from the database and runs
+them. Start as many workers as needed; they coordinate through the jobs
+table and need no broker.
+
+Usage:
+    python worker.py [--concurrency N] [--poll-interval SECONDS]
+"""
+
+import argparse
+import logging
+import signal
+import sys
+
+from database import init_db
+from services import job_handlers  # noqa: F401 - registers the job handlers
+from services import revenue  # noqa: F401 - keeps the revenue rollup up to date
+from services.jobs import JOB_HANDLERS, JobWorker
+
+
+def main():
+    """
+    Parse arguments and run the worker until interrupted.
+    """
+    parser = argparse.ArgumentParser(description="Run background jobs from the database queue.")
+    parser.add_argument("--concurrency", type=int, default=2, help="Jobs run in parallel (default: 2)")
+    parser.add_argument("--poll-interval", type=float, default=1.0, help="Seconds between polls when idle")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+
+    init_db()
+
+    worker = JobWorker(concurrency=args.concurrency, poll_interval=args.poll_interval)
+
+    def shutdown(signum, frame):
+        print("Stopping after the running jobs finish...")
+        worker.stop()
+
+    signal.signal(signal.SIGINT, shutdown)
+    signal.signal(signal.SIGTERM, shutdown)
+
+    print(f"Worker {worker.worker_id} running {', '.join(sorted(JOB_HANDLERS))} jobs")
+    worker.run()
+    sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()